@@ -1,101 +1,153 @@
-import requests
-from bs4 import BeautifulSoup
 import csv
-import pandas as pd
-import os
 from urllib.parse import urljoin
-import re
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Scraper import fetch  # session HTTP partagée (keep-alive, retry)
+from Scraper import parsing, sites  # parsing HTML + schémas d'extraction
+from Scraper import telemetry  # mesures par étape (SCRAPER_TELEMETRY=1)
+from Scraper.frontier import Frontier, crawl  # crawl du site entier sans doublon
+from Scraper.pipeline import ParsePipeline  # parsing dans un pool de processus (--pipeline)
+from Scraper.records import Book, to_frame  # enregistrements compacts (__slots__)
+from Scraper.scheduler import MAX_CONCURRENCY  # plafond par hôte de l'ordonnanceur
 
 url="http://books.toscrape.com/"
-response = requests.get(url)
-response
-page_content = response.text
-page_content
-
-doc=BeautifulSoup(page_content, 'html.parser')
-doc
-
-def get_book_titles(doc, base_url):
-    book_title_tags= doc.find_all('h3')
-    book_titles=[]
-    for tag in book_title_tags:
-       a_tag = tag.find('a')
-       title = a_tag['title'].strip()  # titre complet
-       url = urljoin(base_url, a_tag['href'])  # URL complète
-       book_titles.append({'title': title, 'url': url})
-    return book_titles
-get_book_titles(doc, url)
-
-def get_book_prices(doc):
-    book_price_tags= doc.find_all('p', class_='price_color')
-    book_prices=[]
-    for tag in book_price_tags:
-        price_text = tag.text
-        price = float(price_text.replace('£', '').replace('Â', ''))
-        book_prices.append(price)
-    return book_prices
-get_book_prices(doc)    
-
-#books_data = get_book_titles(doc, url)
-
-# 3Notes sur 5
-def get_book_ratings(doc):
-    star_map = {'One':1, 'Two':2, 'Three':3, 'Four':4, 'Five':5}
-    ratings = []
-    for tag in doc.find_all('p', class_='star-rating'):
-        rating_class = tag['class'][1]
-        rating = star_map.get(rating_class, 0)
-        ratings.append(rating)
-    return ratings
-#récupération des infos de la page détail
-def get_book_details(book):
-    resp = requests.get(book['url'])
-    detail_doc = BeautifulSoup(resp.text, 'html.parser')
 
-    # Catégorie principale et secondaire
-    breadcrumb = detail_doc.find('ul', class_='breadcrumb').find_all('li')
-    main_category = breadcrumb[2].text.strip() if len(breadcrumb)>2 else ""
-    sub_category = breadcrumb[3].text.strip() if len(breadcrumb)>3 else ""
+BOOK_COLUMNS = ['title', 'url', 'price', 'rating', 'main_category', 'sub_category', 'description', 'stock', 'img_url']
+
+# Concurrence pour les pages détail
+MAX_WORKERS = 16
 
-    # Description
-    desc_tag = detail_doc.find('meta', attrs={'name':'description'})
-    description = desc_tag['content'].strip() if desc_tag else ""
+# Titre, URL, prix et note de chaque livre en une passe sur la page liste
+def get_books(doc, base_url):
+    books = []
+    for pod in sites.BOOK_POD.extract_all(doc, sites.BOOK_POD_CSS):
+        books.append(Book(
+            title=pod['title'],
+            url=urljoin(base_url, pod['href']),  # URL complète
+            price=pod['price'],
+            rating=pod['rating'],
+        ))
+    telemetry.count("items", len(books))
+    return books
+
+#récupération des infos de la page détail
+def get_book_details(book):
+    resp = fetch.get(book['url'])
+    return parse_book_details(parsing.parse(resp.text), book['url'])
 
-    # Stock disponible
-    stock_text = detail_doc.find('p', class_='instock availability').text.strip()
-    stock_match = re.search(r'\d+', stock_text)
-    stock = int(stock_match.group()) if stock_match else 0
+def parse_book_details(doc, page_url):
+    detail = sites.BOOK_DETAIL.extract(doc)
 
-    # Image HD
-    img_tag = detail_doc.find('div', class_='item active').find('img')
-    img_url = urljoin(book['url'], img_tag['src']) if img_tag else ""
+    # Catégorie principale et secondaire
+    breadcrumb = detail['breadcrumb']
+    main_category = breadcrumb[2] if len(breadcrumb)>2 else ""
+    sub_category = breadcrumb[3] if len(breadcrumb)>3 else ""
 
     return {
         'main_category': main_category,
         'sub_category': sub_category,
-        'description': description,
-        'stock': stock,
-        'img_url': img_url
+        'description': detail['description'],
+        'stock': sites.parse_stock(detail['stock_text']),
+        'img_url': urljoin(page_url, detail['img_src']) if detail['img_src'] else ""
     }
 
-# ----- Extraction -----
-books = get_book_titles(doc, url)
-prices = get_book_prices(doc)
-ratings = get_book_ratings(doc)
-
-# Ajouter prix et notes aux livres
-for i, book in enumerate(books):
-    book['price'] = prices[i]
-    book['rating'] = ratings[i]
-    details = get_book_details(book)
-    book.update(details)
-
-# Convertir en DataFrame
-df = pd.DataFrame(books)
-df.to_csv('books_full_info.csv', index=False)
-print(df.head())
-
-
-
-
-df.to_csv('books_scraped1.csv', index=False)
\ No newline at end of file
+# Parsing d'une page détail dans un processus du pipeline (fonction picklable)
+def parse_book_page(page_url, html):
+    return [parse_book_details(parsing.parse(html), page_url)]
+
+# Récupération concurrente des pages détail
+def get_all_book_details(books, max_workers=MAX_WORKERS, pipeline=None):
+    """Télécharge les pages détail en parallèle et fusionne les infos dans chaque livre (ordre conservé)
+
+    pipeline : ParsePipeline(parse_book_page, ...) pour parser dans des processus
+    pendant que les threads téléchargent. La concurrence par hôte est réglée par
+    l'ordonnanceur de fetch (enable_scheduler).
+    """
+    if pipeline is not None:
+        for book, (_, records) in zip(books, pipeline.run(book['url'] for book in books)):
+            if records:
+                book.update(records[0])
+        return books
+
+    if max_workers <= 1:
+        results = [get_book_details(book) for book in books]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # map() renvoie les résultats dans l'ordre de la liste
+            results = list(executor.map(get_book_details, books))
+
+    for book, details in zip(books, results):
+        book.update(details)
+    return books
+
+# Crawl du site entier : chaque page (catégorie, catalogue, détail) une seule fois
+def crawl_site(start_url=url, workers=MAX_WORKERS, max_pages=None):
+    """Livres complets (liste + détail) de tout le site, via la frontière dédupliquée"""
+    frontier = Frontier(priorities=sites.BOOKS_PRIORITIES)
+    frontier.push(start_url, 'home')
+    books = []
+    for kind, page_url, doc, meta in crawl(frontier, sites.BOOKS_RULES, workers=workers, max_pages=max_pages):
+        if kind != 'detail':
+            continue
+        book = Book(title=meta.get('title', ''), url=page_url, price=meta.get('price'), rating=meta.get('rating'))
+        book.update(parse_book_details(doc, page_url))
+        books.append(book)
+        telemetry.count("items")
+    print(f"{len(books)} livres, {frontier.duplicates} liens déjà vus ignorés, "
+          f"{frontier.failures} pages en échec.")
+    return books
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scraper books.toscrape.com (liste + pages détail)")
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS, help="Nombre de requêtes détail en parallèle (1 = séquentiel)")
+    parser.add_argument('--per-host', type=int, default=MAX_CONCURRENCY, help="Connexions simultanées max par hôte")
+    parser.add_argument('--no-cache', action='store_true', help="Désactive le cache HTTP sur disque")
+    parser.add_argument('--cache-ttl', type=float, default=24, help="Durée (heures) avant revalidation d'une page en cache")
+    parser.add_argument('--rate', type=float, default=None,
+                        help="Requêtes/s max par hôte (défaut : crawl-delay de robots.txt, sinon illimité)")
+    parser.add_argument('--site', action='store_true',
+                        help="Crawl du site entier (catégories, catalogue, détails) au lieu de la première page")
+    parser.add_argument('--max-pages', type=int, default=None, help="Limite de pages pour --site")
+    parser.add_argument('--pipeline', action='store_true',
+                        help="Parse les pages détail dans un pool de processus (threads = téléchargement)")
+    parser.add_argument('--parse-workers', type=int, default=None, help="Processus de parsing (défaut : nb de cœurs)")
+    parser.add_argument('--queue-size', type=int, default=64, help="Pages HTML en attente de parsing, au plus")
+    parser.add_argument('--batch-size', type=int, default=16, help="Pages max envoyées ensemble à un processus")
+    args = parser.parse_args(argv)
+    if not args.no_cache:
+        fetch.enable_cache(ttl=args.cache_ttl * 3600)
+    # une connexion keep-alive par worker
+    fetch.configure(pool_maxsize=max(args.workers, fetch.POOL_MAXSIZE))
+    # concurrence par hôte adaptative (AIMD), plafonnée à --per-host
+    fetch.enable_scheduler(rate=args.rate, max_concurrency=args.per_host)
+
+    # ----- Extraction -----
+    if args.site:
+        books = crawl_site(url, workers=args.workers, max_pages=args.max_pages)
+    else:
+        response = fetch.get(url)
+        doc = parsing.parse(response.text)
+        books = get_books(doc, url)
+        pipeline = None
+        if args.pipeline:
+            pipeline = ParsePipeline(parse_book_page, fetch_workers=args.workers,
+                                     parse_workers=args.parse_workers, queue_size=args.queue_size,
+                                     batch_size=args.batch_size)
+        get_all_book_details(books, max_workers=args.workers, pipeline=pipeline)
+        if pipeline is not None:
+            pipeline.print_metrics()
+
+    # Convertir en DataFrame
+    with telemetry.stage("export"):
+        df = to_frame(books, BOOK_COLUMNS)
+        df.to_csv('books_full_info.csv', index=False)
+        print(df.head())
+
+        df.to_csv('books_scraped1.csv', index=False)
+    fetch.print_stats()
+
+if __name__ == "__main__":
+    main()
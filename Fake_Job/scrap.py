@@ -1,65 +1,78 @@
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 import json
 from datetime import datetime
-from urllib.parse import urlparse
 import re
-import pandas as pd
+import argparse
+import time
+from collections import Counter
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Scraper import fetch  # session HTTP partagée (keep-alive, retry)
+from Scraper import parsing, sites  # parsing HTML + schémas d'extraction
+from Scraper import telemetry  # mesures par étape (SCRAPER_TELEMETRY=1)
+from Scraper.checkpoint import CrawlState  # reprise après interruption (--resume)
+from Scraper.sinks import CsvSink  # écriture en flux
+from Scraper.jobstore import JobStore  # offres du dernier crawl, indexées (SQLite + FTS5)
 
 BASE_URL = "https://realpython.github.io/fake-jobs/"
+STATE_NAME = "python_jobs_crawl_state"
+STORE_FILE = "python_jobs.sqlite"
+DISPLAY_COLUMNS = ['title', 'company', 'location', 'contract_type', 'date_posted']
+JOB_COLUMNS = ['title', 'company', 'location', 'date_posted', 'apply_url', 'description', 'contract_type']
+
+# Motifs compilés une fois pour toutes les offres
+DATE_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}')
+URL_PATTERN = re.compile(r'[A-Za-z][A-Za-z0-9+.-]*://[^/?#\s]')  # schéma + hôte non vide
+# Mots-clés cherchés dans la description mise une seule fois en minuscules, par priorité
+# (des tests "in" sur la chaîne battent une alternance regex d'un facteur ~4)
+CONTRACT_TYPES = (('full-time', 'Full-Time'), ('part-time', 'Part-Time'), ('contract', 'Contract'))
 
 
 def get_job_cards(doc):
     """Récupère tous les blocs d'offres sur la page"""
-    return doc.find_all('div', class_='card-content')
+    return parsing.select(doc, sites.JOB_CARD_CSS)
 
 def parse_job_card(card):
-    #xtrait les infos d'une offre
-    title = card.find('h2', class_='title').text.strip() if card.find('h2', class_='title') else ""
-    company = card.find('h3', class_='company').text.strip() if card.find('h3', class_='company') else ""
-    location = card.find('p', class_='location').text.strip() if card.find('p', class_='location') else ""
-    date_posted = card.find('time').text.strip() if card.find('time') else ""
-    apply_tag = card.find('a', string='Apply')
-    apply_url = urljoin(BASE_URL, apply_tag['href']) if apply_tag else ""
-    description_tag = card.find('p', class_='description')
-    description = description_tag.text.strip() if description_tag else ""
-    return {
-        'title': title,
-        'company': company,
-        'location': location,
-        'date_posted': date_posted,
-        'apply_url': apply_url,
-        'description': description
-    }
-
-# Scraping avec filtre "Python" 
-all_jobs = []
-next_page = BASE_URL
-
-while next_page:
-    resp = requests.get(next_page)
-    if resp.status_code != 200:
-        break
-    doc = BeautifulSoup(resp.text, 'html.parser')
-    cards = get_job_cards(doc)
-
-    for card in cards:
-        job = parse_job_card(card)
-        # Filtre uniquement les jobs contenant "Python"
-        if "python" in job['title'].lower() or "python" in job['description'].lower():
-            all_jobs.append(job)
-
-    # Pagination : chercher <li class="next">
-    next_tag = doc.find('li', class_='next')
-    next_page = urljoin(BASE_URL, next_tag.find('a')['href']) if next_tag else None
-# Sauvegarde JSON avec timestamp
-"""timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-filename = f"python_jobs_{timestamp}.json"
-with open(filename, 'w', encoding='utf-8') as f:
-    json.dump(all_jobs, f, ensure_ascii=False, indent=4)
-
-print(f"Scraping terminé. {len(all_jobs)} offres contenant 'Python' sauvegardées dans {filename}.")"""
+    #xtrait les infos d'une offre (chaque sélecteur n'est évalué qu'une fois)
+    fields = sites.JOB_CARD.extract(card)
+    apply_href = fields.pop('apply_href')
+    fields['apply_url'] = urljoin(BASE_URL, apply_href) if apply_href else ""
+    return {key: fields[key] for key in ('title', 'company', 'location', 'date_posted', 'apply_url', 'description')}
+
+# Offres d'une page HTML, pour un pool de processus (Scraper.pipeline) : dicts simples
+def parse_jobs_page(page_url, html):
+    return [parse_job_card(card) for card in get_job_cards(parsing.parse(html))]
+
+# Scraping avec filtre "Python" (état sauvegardé toutes les `state.every` pages) ;
+# les offres, déjà nettoyées, sont produites au fil des pages, celles d'un run interrompu d'abord
+def iter_jobs(state, start_url=BASE_URL):
+    if state.frontier:
+        yield from state.iter_records()
+    next_page = state.next_url(default=start_url)
+
+    while next_page:
+        resp = fetch.get(next_page)
+        if resp.status_code != 200:
+            break
+        doc = parsing.parse(resp.text)
+        cards = get_job_cards(doc)
+
+        page_jobs = []
+        for card in cards:
+            job = normalize_job(parse_job_card(card))
+            if job is not None:
+                page_jobs.append(job)
+
+        # Pagination : chercher <li class="next">
+        next_href = sites.NEXT_PAGE.extract(doc)
+        next_url = urljoin(next_page, next_href) if next_href else None
+        state.page_done(next_page, page_jobs, next_url)
+        telemetry.count("items", len(page_jobs))
+        yield from page_jobs
+        next_page = next_url
+
+    state.finish()
 
 #  Nettoyer et standardiser les dates
 def standardize_date(date_str):
@@ -68,80 +81,107 @@ def standardize_date(date_str):
     if not date_str:
         return None
     # regex simple pour YYYY-MM-DD
-    match = re.search(r'\d{4}-\d{2}-\d{2}', date_str)
+    match = DATE_PATTERN.search(date_str)
     return match.group(0) if match else None
 
-for job in all_jobs:
-    job['date_posted'] = standardize_date(job['date_posted'])
-
-# 2-Classer par type de contrat et localisation 
+# 2-Classer par type de contrat (description déjà en minuscules)
 def detect_contract_type(description):
-    desc = description.lower()
-    if 'full-time' in desc:
-        return 'Full-Time'
-    elif 'part-time' in desc:
-        return 'Part-Time'
-    elif 'contract' in desc:
-        return 'Contract'
-    else:
-        return 'Unknown'
-
-for job in all_jobs:
-    job['contract_type'] = detect_contract_type(job['description'])
-    job['location'] = job.get('location', 'Unknown')
+    for keyword, contract_type in CONTRACT_TYPES:
+        if keyword in description:
+            return contract_type
+    return 'Unknown'
 
-# 3) Extraire et valider les URLs d’application 
+# 3) Extraire et valider les URLs d’application (schéma et hôte présents, comme urlparse)
 def validate_url(url):
-    try:
-        result = urlparse(url)
-        return all([result.scheme, result.netloc])
-    except:
-        return False
-
-for job in all_jobs:
-    job['apply_url'] = job.get('apply_url', '')
+    return bool(url) and URL_PATTERN.match(url) is not None
+
+# Filtre "Python" + nettoyage (1 à 3 ci-dessus) en une passe, à l'extraction de la carte ;
+# None si l'offre ne parle pas de Python
+def normalize_job(job):
+    description = job['description'].lower()
+    if 'python' not in description and 'python' not in job['title'].lower():
+        return None
+    job['date_posted'] = standardize_date(job['date_posted'])
+    job['contract_type'] = detect_contract_type(description)
+    job['location'] = job['location'] or 'Unknown'
     if not validate_url(job['apply_url']):
         job['apply_url'] = None
+    return job
+
+# 4) Détection de doublons au fil de l'eau, basée sur (title + company + location)
+def unique_jobs(jobs):
+    seen = set()
+    for job in jobs:
+        key = (job['title'], job['company'], job['location'])
+        if key not in seen:
+            seen.add(key)
+            yield job
+
+# Tableau des premières offres (sans pandas : réponse immédiate en mode requête)
+def print_jobs(jobs, total, width=30):
+    rows = [[str(job[col] or '')[:width] for col in DISPLAY_COLUMNS] for job in jobs]
+    widths = [max([len(col)] + [len(row[i]) for row in rows]) for i, col in enumerate(DISPLAY_COLUMNS)]
+    for row in [DISPLAY_COLUMNS] + rows:
+        print("  ".join(value.ljust(w) for value, w in zip(row, widths)).rstrip())
+    if total > len(jobs):
+        print(f"... ({total - len(jobs)} autres)")
+
+def crawl_to_store(state, store):
+    """Crawl complet : CSV horodaté + remplacement de la base locale, au fil du crawl"""
+    # 6) Sauvegarder en CSV avec encodage UTF-8, au fil du crawl
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    csv_file = f"python_jobs_clean_{timestamp}.csv"
+    by_city = Counter()
+    by_contract = Counter()
+    with CsvSink(csv_file, fieldnames=JOB_COLUMNS) as sink, store.replace() as writer:
+        state.on_checkpoint(sink.flush)
+        for job in unique_jobs(iter_jobs(state)):
+            sink.write(job)
+            writer.write(job)
+            by_city[job['location']] += 1
+            by_contract[job['contract_type']] += 1
+
+    #  5) Générer des statistiques par ville et type de contrat 
+    import pandas as pd  # chargé après le crawl : démarrage rapide
+    print("Statistiques par ville :")
+    print(pd.Series(by_city, name='count', dtype='int64').rename_axis('location').sort_values(ascending=False))
+    print("\nStatistiques par type de contrat :")
+    print(pd.Series(by_contract, name='count', dtype='int64').rename_axis('contract_type').sort_values(ascending=False))
+    print(f"CSV sauvegardé : {csv_file} ; base locale : {store.path}")
+    fetch.print_stats()
+
+def main(argv=None):
+    # 7) Système de filtres dynamiques en ligne de commande, servis par la base du dernier crawl
+    parser = argparse.ArgumentParser(description="Filtrer les offres d'emploi Python.")
+    parser.add_argument('--city', type=str, help="Filtrer par ville (partie du nom, casse ignorée)")
+    parser.add_argument('--contract', type=str, help="Filtrer par type de contrat (Full-Time/Part-Time/Contract, partie du nom)")
+    parser.add_argument('--search', type=str,
+                        help="Recherche plein texte dans le titre et la description (ex. 'django rest*')")
+    parser.add_argument('--limit', type=int, default=10, help="Nombre d'offres affichées")
+    parser.add_argument('--refresh', action='store_true',
+                        help=f"Re-scrape le site et remplace la base locale ({STORE_FILE})")
+    parser.add_argument('--resume', action='store_true', help="Reprendre le crawl au dernier checkpoint")
+    parser.add_argument('--checkpoint-every', type=int, default=5, help="Sauvegarder l'état toutes les N pages")
+    args = parser.parse_args(argv)
+
+    store = JobStore(STORE_FILE)
+    info = store.info()
+    if args.refresh or args.resume or not info:
+        state = CrawlState(STATE_NAME, resume=args.resume, every=args.checkpoint_every)
+        crawl_to_store(state, store)
+    else:
+        print(f"Offres du crawl du {info['crawled_at']} ({info['count']} offres) ; --refresh pour re-scraper.")
 
-#4) Détection de doublons
-# Doublons basés sur (title + company + location)
-unique_jobs = []
-seen = set()
-for job in all_jobs:
-    key = (job['title'], job['company'], job['location'])
-    if key not in seen:
-        seen.add(key)
-        unique_jobs.append(job)
-all_jobs = unique_jobs
-
-#  5) Générer des statistiques par ville et type de contrat 
-df = pd.DataFrame(all_jobs)
-print("Statistiques par ville :")
-print(df['location'].value_counts())
-print("\nStatistiques par type de contrat :")
-print(df['contract_type'].value_counts())
-
-# 6) Sauvegarder en CSV avec encodage UTF-8
-timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-csv_file = f"python_jobs_clean_{timestamp}.csv"
-df.to_csv(csv_file, index=False, encoding='utf-8')
-print(f"CSV sauvegardé : {csv_file}")
-
-# 7) Système de filtres dynamiques en ligne de commande 
-
-import argparse
-
-parser = argparse.ArgumentParser(description="Filtrer les offres d'emploi Python.")
-parser.add_argument('--city', type=str, help="Filtrer par ville")
-parser.add_argument('--contract', type=str, help="Filtrer par type de contrat (Full-Time/Part-Time/Contract)")
-args = parser.parse_args()
-
-filtered_df = df
-if args.city:
-    filtered_df = filtered_df[filtered_df['location'].str.contains(args.city, case=False)]
-if args.contract:
-    filtered_df = filtered_df[filtered_df['contract_type'].str.contains(args.contract, case=False)]
+    with telemetry.stage("analyse"):
+        start = time.perf_counter()
+        filters = dict(city=args.city, contract=args.contract, text=args.search)
+        total = store.count(**filters)
+        jobs = store.query(limit=args.limit, **filters)
+        elapsed = time.perf_counter() - start
+    store.close()
 
-print(f"\nNombre d'offres après filtrage : {len(filtered_df)}")
-print(filtered_df[['title','company','location','contract_type','date_posted']].head(10))
+    print(f"\nNombre d'offres après filtrage : {total} (requête : {elapsed * 1000:.1f} ms)")
+    print_jobs(jobs, total)
 
+if __name__ == "__main__":
+    main()
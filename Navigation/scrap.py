@@ -1,96 +1,169 @@
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
-import pandas as pd
-import matplotlib.pyplot as plt
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+import os
+import shutil
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Scraper import fetch  # session HTTP partagée (keep-alive, retry)
+from Scraper import parsing, sites  # parsing HTML + schémas d'extraction
+from Scraper import telemetry  # mesures par étape (SCRAPER_TELEMETRY=1)
+from Scraper.checkpoint import CrawlState  # reprise après interruption (--resume)
+from Scraper.sinks import CsvSink, MultiSink, open_sink  # écriture en flux
 
 BASE_URL = "https://books.toscrape.com/"
+STATE_NAME = "books_by_category_crawl_state"
+BOOK_COLUMNS = ['category', 'title', 'price', 'rating']
+CHART_FILE = "category_ranking.png"
 
 #1. Extraire toutes les catégories 
 def get_categories():
-    resp = requests.get(BASE_URL)
+    resp = fetch.get(BASE_URL)
     resp.raise_for_status()
-    doc = BeautifulSoup(resp.text, 'html.parser')
+    doc = parsing.parse(resp.text)
     categories = {}
-    for li in doc.select('ul.nav-list ul li a'):
-        name = li.text.strip()
-        href = li['href']
+    for li in parsing.select(doc, sites.CATEGORY_LINKS_CSS):
+        name = parsing.text(li)
+        href = parsing.attr(li, 'href')
         url = urljoin(BASE_URL, href)
         categories[name] = url
     return categories
 
-#2. Extraire les livres d’une catégorie 
-def get_books_from_category(cat_name, cat_url):
+#2. Extraire les livres d’une catégorie (reprend au checkpoint si `state` est fourni)
+def get_books_from_category(cat_name, cat_url, state=None):
     books = []
     next_page = cat_url
+    if state and cat_name in state.frontier:
+        books = state.all_records(cat_name)  # pages déjà extraites avant l'interruption
+        next_page = state.next_url(cat_name)
 
     while next_page:
-        resp = requests.get(next_page)
+        resp = fetch.get(next_page)
         if resp.status_code != 200:
-            print(f" Erreur {resp.status_code} pour {cat_name}")
+            # la frontière garde cette page : --resume reprendra ici
+            print(f" Erreur {resp.status_code} pour {cat_name} ({next_page})")
             break
 
-        doc = BeautifulSoup(resp.text, 'html.parser')
-        for article in doc.select('article.product_pod'):
-            title = article.h3.a['title']
-            price = float(article.find('p', class_='price_color').text.replace('£','').replace('Â',''))
-            rating_class = article.p['class'][1]
-            rating_map = {'One':1,'Two':2,'Three':3,'Four':4,'Five':5}
-            rating = rating_map.get(rating_class, 0)
-            books.append({
+        doc = parsing.parse(resp.text)
+        page_books = []
+        for pod in sites.BOOK_POD.extract_all(doc, sites.BOOK_POD_CSS):
+            page_books.append({
                 'category': cat_name,
-                'title': title,
-                'price': price,
-                'rating': rating
+                'title': pod['title'],
+                'price': pod['price'],
+                'rating': pod['rating']
             })
+        books.extend(page_books)
+        telemetry.count("items", len(page_books))
 
         # Pagination
-        next_tag = doc.find('li', class_='next')
-        next_page = urljoin(next_page, next_tag.a['href']) if next_tag else None
+        next_href = sites.NEXT_PAGE.extract(doc)
+        next_url = urljoin(next_page, next_href) if next_href else None
+        if state:
+            state.page_done(next_page, page_books, next_url, key=cat_name)
+        next_page = next_url
 
     return books
 
-# 3. Extraire toutes les données 
-all_books = []
-categories = get_categories()
-print(f"{len(categories)} catégories détectées.")
-
-for cat_name, cat_url in categories.items():
-    print(f"Extraction de la catégorie : {cat_name}")
-    cat_books = get_books_from_category(cat_name, cat_url)
-    all_books.extend(cat_books)
-
-# 4. Créer DataFrame 
-df = pd.DataFrame(all_books)
-df.to_csv("books_by_category.csv", index=False, encoding="utf-8")
-print(f"\n {len(df)} livres extraits au total.")
-
-# 5. Analyses 
-stats_by_cat = (
-    df.groupby('category')['price']
-    .agg(['count', 'mean', 'min', 'max'])
-    .rename(columns={'count': 'nb_livres', 'mean': 'prix_moyen', 'min': 'prix_min', 'max': 'prix_max'})
-    .sort_values(by='prix_moyen', ascending=False)
-)
-
-# Calcul de la moyenne pondérée (prix * rating)
-df['pondere'] = df['price'] * df['rating']
-weighted_stats = df.groupby('category').apply(
-    lambda x: (x['pondere'].sum() / x['rating'].sum()) if x['rating'].sum() > 0 else 0
-)
-stats_by_cat['prix_moyen_pondere'] = weighted_stats
-
-# 6. Sauvegarde 
-stats_by_cat.to_csv("category_ranking.csv", encoding="utf-8")
-print("\n Classement des catégories par prix moyen :")
-print(stats_by_cat.head(10))
-
-# 7. Visualisation 
-plt.figure(figsize=(10, 6))
-stats_by_cat['prix_moyen'].plot(kind='bar', color='cornflowerblue')
-plt.title("Prix moyen par catégorie")
-plt.xlabel("Catégorie")
-plt.ylabel("Prix moyen (£)")
-plt.xticks(rotation=80)
-plt.tight_layout()
-plt.show()
\ No newline at end of file
+# 3. Extraire toutes les données (catégories en parallèle, pagination séquentielle dans chaque catégorie)
+def crawl_category(item, state=None):
+    cat_name, cat_url = item
+    start = time.perf_counter()
+    cat_books = get_books_from_category(cat_name, cat_url, state)
+    return cat_books, time.perf_counter() - start
+
+def crawl_all_categories(categories, sink, workers=1, state=None):
+    """Écrit les livres dans `sink`, catégorie par catégorie dès qu'elle est prête
+    (dans l'ordre de get_categories()) ; renvoie les durées par catégorie"""
+    items = list(categories.items())
+    timings = {}
+
+    def collect(results):
+        for (cat_name, _), (cat_books, duration) in zip(items, results):
+            sink.write_many(cat_books)
+            timings[cat_name] = (len(cat_books), duration)
+
+    if workers <= 1:
+        def sequential():
+            for item in items:
+                print(f"Extraction de la catégorie : {item[0]}")
+                yield crawl_category(item, state)
+        collect(sequential())
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # map() rend les résultats dans l'ordre des catégories, au fur et à mesure
+            collect(executor.map(lambda item: crawl_category(item, state), items))
+    if state:
+        state.finish()
+    return timings
+
+def print_timings(timings, total):
+    print(f"\n Temps par catégorie (total {total:.1f}s) :")
+    for cat_name, (count, duration) in sorted(timings.items(), key=lambda kv: kv[1][1], reverse=True):
+        print(f"  {cat_name:<30} {count:>4} livres  {duration:6.2f}s")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scraping de books.toscrape.com par catégorie")
+    parser.add_argument('--workers', type=int, default=8, help="Nombre de catégories extraites en parallèle (1 = séquentiel)")
+    parser.add_argument('--resume', action='store_true', help="Reprendre le crawl au dernier checkpoint")
+    parser.add_argument('--checkpoint-every', type=int, default=5, help="Sauvegarder l'état toutes les N pages")
+    parser.add_argument('--format', choices=['csv', 'parquet', 'arrow'], default='csv',
+                        help="Copie typée en plus du CSV ; l'analyse relit alors ce fichier (memory-map)")
+    parser.add_argument('--rate', type=float, default=None,
+                        help="Requêtes/s max vers le site (défaut : crawl-delay de robots.txt, sinon illimité)")
+    args = parser.parse_args(argv)
+    fetch.configure(pool_maxsize=max(args.workers, fetch.POOL_MAXSIZE))
+    # concurrence ajustée à la santé du site (AIMD), plafonnée au nombre de workers
+    fetch.enable_scheduler(rate=args.rate, max_concurrency=args.workers)
+
+    categories = get_categories()
+    print(f"{len(categories)} catégories détectées.")
+
+    state = CrawlState(STATE_NAME, resume=args.resume, every=args.checkpoint_every)
+    start = time.perf_counter()
+    # 4. Écriture en flux du CSV (et de la copie typée), puis DataFrame relu depuis le fichier
+    sinks = [CsvSink("books_by_category.csv", fieldnames=BOOK_COLUMNS)]
+    typed_file = None
+    if args.format != 'csv':
+        from Scraper import schemas  # exports typés Parquet / Arrow (pyarrow)
+        typed_file = f"books_by_category.{args.format}"
+        sinks.append(open_sink(typed_file, schema=schemas.schema_for(schemas.BOOK_FIELDS, BOOK_COLUMNS)))
+    with MultiSink(sinks) as sink:
+        state.on_checkpoint(sink.flush)
+        timings = crawl_all_categories(categories, sink, workers=args.workers, state=state)
+    print_timings(timings, time.perf_counter() - start)
+
+    # bibliothèques d'analyse chargées après le crawl : démarrage rapide
+    import pandas as pd
+    from Scraper import analytics  # agrégats vectorisés
+    from Scraper import report  # graphiques headless (Agg), mis en cache
+
+    if typed_file:
+        df = schemas.read_table(typed_file)
+    else:
+        df = pd.read_csv("books_by_category.csv", encoding="utf-8")
+    print(f"\n {len(df)} livres extraits au total.")
+
+    # 5. Analyses : stats par catégorie et par note (moyenne pondérée incluse) en un seul groupby
+    with telemetry.stage("analyse"):
+        stats = analytics.catalog_stats(df)
+        stats_by_cat = analytics.stats_for(stats, 'category').sort_values(by='prix_moyen', ascending=False)
+
+        # 6. Sauvegarde 
+        stats_by_cat.to_csv("category_ranking.csv", encoding="utf-8")
+        stats.to_csv("catalog_stats.csv", index=False, encoding="utf-8")
+    print("\n Classement des catégories par prix moyen :")
+    print(stats_by_cat.head(10))
+
+    # 7. Visualisation 
+    with telemetry.stage("graphiques"):
+        chart = report.bar_chart("classement_categories", stats_by_cat['prix_moyen'], title="Prix moyen par catégorie",
+                                 xlabel="Catégorie", ylabel="Prix moyen (£)", color='cornflowerblue', figsize=(10, 6))
+        (image,), _ = report.render([chart])
+        shutil.copyfile(image, CHART_FILE)
+    print(f"\n Graphique enregistré : {CHART_FILE}")
+    fetch.print_stats()
+
+if __name__ == "__main__":
+    main()
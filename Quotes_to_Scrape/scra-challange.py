@@ -1,24 +1,33 @@
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
-import networkx as nx
 import json
+import argparse
 from datetime import datetime
 import re
-from collections import Counter
+from collections import deque
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Scraper import fetch  # session HTTP partagée (keep-alive, retry)
+from Scraper import parsing, sites  # parsing HTML + schémas d'extraction
+from Scraper import telemetry  # mesures par étape (SCRAPER_TELEMETRY=1)
+from Scraper.dedup import DedupExecutor  # une requête par auteur, même en parallèle
+from Scraper.checkpoint import CrawlState  # reprise après interruption (--resume)
+from Scraper.sinks import JsonArraySink  # écriture en flux
+from Scraper.graph import QuoteGraph  # graphe à identifiants entiers, exports en flux
+from Scraper.quoteindex import QuoteIndex, QuoteIndexWriter  # index inversé (python -m Scraper search)
 
 base_url = "http://quotes.toscrape.com/"
+AUTHOR_WORKERS = 8  # pages auteur téléchargées en parallèle de la pagination
+STATE_NAME = "quotes_full_crawl_state"
+INDEX_DIR = "quotes_full_index"
 
 
-def get_quote_data(quote_tag):
+def get_quote_data(quote_tag, page_url=base_url):
     """Extrait la citation, l'auteur et les tags depuis un bloc <div class='quote'>"""
-    text = quote_tag.find('span', class_='text').text.strip()
-    author_tag = quote_tag.find('small', class_='author')
-    author_name = author_tag.text.strip() if author_tag else ""
-    author_url_tag = quote_tag.find('a')
-    author_url = urljoin(base_url, author_url_tag['href']) if author_url_tag else ""
-    tags = [t.text.strip() for t in quote_tag.find_all('a', class_='tag')]
-    return {'text': text, 'author_name': author_name, 'author_url': author_url, 'tags': tags}
+    quote = sites.QUOTE.extract(quote_tag)
+    author_href = quote.pop('author_href')
+    quote['author_url'] = urljoin(page_url, author_href) if author_href else ""
+    return {'text': quote['text'], 'author_name': quote['author_name'], 'author_url': quote['author_url'], 'tags': quote['tags']}
 
 def get_author_details(author_url, authors_cache):
     """Récupère biographie, naissance, lieu et date de décès depuis la page auteur"""
@@ -26,81 +35,140 @@ def get_author_details(author_url, authors_cache):
         return authors_cache[author_url]
 
     try:
-        resp = requests.get(author_url)
+        resp = fetch.get(author_url)
         if resp.status_code != 200:
             details = {'bio': '', 'born_date': '', 'born_location': '', 'death_date': ''}
         else:
-            doc = BeautifulSoup(resp.text, 'html.parser')
-            bio = doc.find('div', class_='author-description').text.strip() if doc.find('div', class_='author-description') else ''
-            born_date = doc.find('span', class_='author-born-date').text.strip() if doc.find('span', class_='author-born-date') else ''
-            born_location = doc.find('span', class_='author-born-location').text.strip() if doc.find('span', class_='author-born-location') else ''
-            death_date_tag = doc.find('span', class_='author-death-date')
-            death_date = death_date_tag.text.strip() if death_date_tag else ''
-            details = {'bio': bio, 'born_date': born_date, 'born_location': born_location, 'death_date': death_date}
+            details = sites.AUTHOR.extract(parsing.parse(resp.text))
         authors_cache[author_url] = details
         return details
     except Exception as e:
         print(f"Erreur sur la page auteur {author_url}: {e}")
         return {'bio': '', 'born_date': '', 'born_location': '', 'death_date': ''}
 
-# Scraping avec cache
-all_quotes = []
-authors_cache = {}
-next_page = base_url
-
-while next_page:
-    response = requests.get(next_page)
-    doc = BeautifulSoup(response.text, 'html.parser')
-
-    for quote_tag in doc.find_all('div', class_='quote'):
-        quote_info = get_quote_data(quote_tag)
-
-        # Récupération infos auteur avec cache
-        author_details = get_author_details(quote_info['author_url'], authors_cache)
-        quote_info['author_details'] = author_details
-
-        all_quotes.append(quote_info)
-
-    # Pagination
-    next_tag = doc.find('li', class_='next')
-    next_page = urljoin(base_url, next_tag.find('a')['href']) if next_tag else None
-
-# Construction du graphe
-G = nx.DiGraph()
-
-for quote in all_quotes:
-    quote_text = quote['text']
-    author = quote['author_name']
-    tags = quote['tags']
-
-    # Ajouter noeuds et relations
-    G.add_node(author, type='author')
-    G.add_node(quote_text, type='quote')
-    G.add_edge(author, quote_text, relation='wrote')
-
-    for tag in tags:
-        G.add_node(tag, type='tag')
-        G.add_edge(quote_text, tag, relation='has_tag')
-
-#  Export GraphML et GEXF 
-timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-graphml_file = f"quotes_graph_{timestamp}.graphml"
-gexf_file = f"quotes_graph_{timestamp}.gexf"
-
-nx.write_graphml(G, graphml_file)
-nx.write_gexf(G, gexf_file)
-print(f"Graphe exporté en GraphML ({graphml_file}) et GEXF ({gexf_file})")
-
-#  Analyse : auteurs les plus cités 
-author_counts = Counter([q['author_name'] for q in all_quotes])
-most_cited_authors = author_counts.most_common(10)
-print("Top 10 auteurs les plus cités :")
-for author, count in most_cited_authors:
-    print(f"{author}: {count} citations")
-
-# Sauvegarde JSON 
-json_file = f"quotes_full_{timestamp}.json"
-with open(json_file, 'w', encoding='utf-8') as f:
-    json.dump(all_quotes, f, ensure_ascii=False, indent=4)
-
-print(f"Scraping terminé. {len(all_quotes)} citations sauvegardées dans {json_file}.")
+# Scraping avec cache (mémoire pour le run, disque entre deux runs) ; les pages
+# auteur sont téléchargées en arrière-plan pendant la pagination, une fois par URL
+def iter_quote_pages(state, authors, authors_cache, start_url=base_url):
+    """Produit les citations page par page (celles d'un run interrompu d'abord)"""
+    if state.frontier:
+        resumed = state.all_records()
+        for quote_info in resumed:
+            authors.submit(quote_info['author_url'], get_author_details, quote_info['author_url'], authors_cache)
+        yield resumed
+    next_page = state.next_url(default=start_url)
+
+    while next_page:
+        # pages liste toujours relues (nouvelles citations) ; seules les pages auteur viennent du cache
+        response = fetch.get(next_page, use_cache=False)
+        doc = parsing.parse(response.text)
+
+        page_quotes = []
+        for quote_tag in parsing.select(doc, sites.QUOTE_CSS):
+            quote_info = get_quote_data(quote_tag, next_page)
+            authors.submit(quote_info['author_url'], get_author_details, quote_info['author_url'], authors_cache)
+            page_quotes.append(quote_info)
+
+        # Pagination
+        next_href = sites.NEXT_PAGE.extract(doc)
+        next_url = urljoin(start_url, next_href) if next_href else None
+        state.page_done(next_page, page_quotes, next_url)
+        telemetry.count("items", len(page_quotes))
+        yield page_quotes
+        next_page = next_url
+    state.finish()
+
+def iter_quotes(state, start_url=base_url, author_workers=AUTHOR_WORKERS):
+    """Citations avec author_details, dans l'ordre, dès que leurs auteurs sont prêts"""
+    authors_cache = {}
+    waiting = deque()
+
+    def join(page_quotes):
+        for quote_info in page_quotes:
+            yield dict(quote_info, author_details=authors.result(quote_info['author_url']))
+
+    with DedupExecutor(max_workers=author_workers) as authors:
+        for page_quotes in iter_quote_pages(state, authors, authors_cache, start_url):
+            waiting.append(page_quotes)
+            while waiting and all(authors.done(q['author_url']) for q in waiting[0]):
+                yield from join(waiting.popleft())
+        while waiting:
+            yield from join(waiting.popleft())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scraping de quotes.toscrape.com + graphe auteurs/tags")
+    parser.add_argument('--resume', action='store_true', help="Reprendre le crawl au dernier checkpoint")
+    parser.add_argument('--checkpoint-every', type=int, default=5, help="Sauvegarder l'état toutes les N pages")
+    parser.add_argument('--graph-format', action='append', choices=['graphml', 'gexf', 'csv', 'parquet'],
+                        help="Format(s) d'export du graphe (répétable ; défaut : graphml et gexf)")
+    parser.add_argument('--networkx', action='store_true',
+                        help="Construit et exporte le graphe avec networkx (noeuds = textes complets)")
+    parser.add_argument('--no-cache', action='store_true', help="Désactive le cache disque des pages auteur")
+    parser.add_argument('--cache-ttl', type=float, default=24, help="Durée (heures) avant revalidation d'une page auteur en cache")
+    args = parser.parse_args(argv)
+    graph_formats = args.graph_format or ['graphml', 'gexf']
+
+    if not args.no_cache:
+        fetch.enable_cache(ttl=args.cache_ttl * 3600)
+    state = CrawlState(STATE_NAME, resume=args.resume, every=args.checkpoint_every)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    json_file = f"quotes_full_{timestamp}.json"
+
+    # Construction du graphe, indexation et sauvegarde JSON au fil du crawl
+    if args.networkx:
+        import networkx as nx
+        G = nx.DiGraph()
+    else:
+        graph = QuoteGraph()
+
+    with JsonArraySink(json_file, indent=4) as sink, QuoteIndexWriter(INDEX_DIR) as index:
+        state.on_checkpoint(sink.flush)
+        for quote in iter_quotes(state):
+            sink.write(quote)
+            index.add(quote)
+            quote_text = quote['text']
+            author = quote['author_name']
+            tags = quote['tags']
+
+            # Ajouter noeuds et relations
+            if not args.networkx:
+                graph.add_quote(author, quote_text, tags)
+                continue
+            G.add_node(author, type='author')
+            G.add_node(quote_text, type='quote')
+            G.add_edge(author, quote_text, relation='wrote')
+
+            for tag in tags:
+                G.add_node(tag, type='tag')
+                G.add_edge(quote_text, tag, relation='has_tag')
+
+    #  Export du graphe (GraphML et GEXF par défaut)
+    graph_files = [f"quotes_graph_{timestamp}.{fmt}" for fmt in graph_formats]
+    with telemetry.stage("export_graphe"):
+        for graph_file in graph_files:
+            if not args.networkx:
+                graph.write(graph_file)
+            elif graph_file.endswith('.graphml'):
+                nx.write_graphml(G, graph_file)
+            elif graph_file.endswith('.gexf'):
+                nx.write_gexf(G, graph_file)
+            elif graph_file.endswith('.csv'):
+                nx.write_edgelist(G, graph_file, delimiter=',', data=['relation'])
+            else:
+                print(f"Format non pris en charge avec --networkx : {graph_file}")
+                continue
+            print(f"Graphe exporté : {graph_file}")
+
+    #  Analyse : auteurs les plus cités (comptes tirés de l'index, sans relire les citations)
+    index = QuoteIndex(INDEX_DIR)
+    most_cited_authors = index.top("author", 10)
+    index.close()
+    print("Top 10 auteurs les plus cités :")
+    for author, count in most_cited_authors:
+        print(f"{author}: {count} citations")
+
+    print(f"Scraping terminé. {sink.count} citations sauvegardées dans {json_file}, index dans {INDEX_DIR}/.")
+
+    fetch.print_stats()
+
+if __name__ == "__main__":
+    main()
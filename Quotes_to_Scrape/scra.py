@@ -1,75 +1,119 @@
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 import json
+import argparse
+from collections import deque
 from datetime import datetime
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Scraper import fetch  # session HTTP partagée (keep-alive, retry)
+from Scraper import parsing, sites  # parsing HTML + schémas d'extraction
+from Scraper import telemetry  # mesures par étape (SCRAPER_TELEMETRY=1)
+from Scraper.dedup import DedupExecutor  # une requête par auteur, même en parallèle
+from Scraper.checkpoint import CrawlState  # reprise après interruption (--resume)
+from Scraper.sinks import JsonArraySink  # écriture en flux
+from Scraper.quoteindex import QuoteIndexWriter  # index inversé (python -m Scraper search)
 
 url = "http://quotes.toscrape.com/"
+AUTHOR_WORKERS = 8  # pages auteur téléchargées en parallèle de la pagination
+STATE_NAME = "quotes_crawl_state"
+INDEX_DIR = "quotes_index"
 
 
-def get_quote_data(quote_tag):
+def get_quote_data(quote_tag, page_url=url):
     """Extrait la citation, l'auteur et les tags depuis un bloc <div class='quote'>"""
-    text = quote_tag.find('span', class_='text').text.strip()
-    author_tag = quote_tag.find('small', class_='author')
-    author_name = author_tag.text.strip() if author_tag else ""
-    author_url_tag = quote_tag.find('a')
-    author_url = urljoin(url, author_url_tag['href']) if author_url_tag else ""
-    tags = [t.text.strip() for t in quote_tag.find_all('a', class_='tag')]
-    return {'text': text, 'author_name': author_name, 'author_url': author_url, 'tags': tags}
+    quote = sites.QUOTE.extract(quote_tag)
+    author_href = quote.pop('author_href')
+    quote['author_url'] = urljoin(page_url, author_href) if author_href else ""
+    return {'text': quote['text'], 'author_name': quote['author_name'], 'author_url': quote['author_url'], 'tags': quote['tags']}
 
 def get_author_details(author_url):
     """Récupère biographie, naissance, lieu et date de décès depuis la page auteur"""
     try:
-        resp = requests.get(author_url)
+        resp = fetch.get(author_url)
         if resp.status_code != 200:
             return {'bio': '', 'born_date': '', 'born_location': '', 'death_date': ''}
-        doc = BeautifulSoup(resp.text, 'html.parser')
-        bio = doc.find('div', class_='author-description').text.strip() if doc.find('div', class_='author-description') else ''
-        born_date = doc.find('span', class_='author-born-date').text.strip() if doc.find('span', class_='author-born-date') else ''
-        born_location = doc.find('span', class_='author-born-location').text.strip() if doc.find('span', class_='author-born-location') else ''
-        death_date_tag = doc.find('span', class_='author-death-date')
-        death_date = death_date_tag.text.strip() if death_date_tag else ''
-        return {'bio': bio, 'born_date': born_date, 'born_location': born_location, 'death_date': death_date}
+        return sites.AUTHOR.extract(parsing.parse(resp.text))
     except Exception as e:
         print(f"Erreur sur la page auteur {author_url}: {e}")
         return {'bio': '', 'born_date': '', 'born_location': '', 'death_date': ''}
 
-# Scraping toutes les pages
-all_quotes = []
-authors_cache = {}  # pour éviter de scraper plusieurs fois le même auteur
-next_page = url
+# Scraping toutes les pages : les pages auteur sont téléchargées en arrière-plan
+# pendant la pagination, une seule fois par URL
+def iter_quote_pages(state, authors, start_url=url):
+    """Produit les citations page par page (celles d'un run interrompu d'abord)"""
+    if state.frontier:
+        resumed = state.all_records()
+        for quote_info in resumed:
+            if quote_info['author_url']:
+                authors.submit(quote_info['author_url'], get_author_details, quote_info['author_url'])
+        yield resumed
+    next_page = state.next_url(default=start_url)
 
-while next_page:
-    response = requests.get(next_page)
-    doc = BeautifulSoup(response.text, 'html.parser')
+    while next_page:
+        response = fetch.get(next_page)
+        doc = parsing.parse(response.text)
 
-    for quote_tag in doc.find_all('div', class_='quote'):
-        quote_info = get_quote_data(quote_tag)
+        page_quotes = []
+        for quote_tag in parsing.select(doc, sites.QUOTE_CSS):
+            quote_info = get_quote_data(quote_tag, next_page)
+            if quote_info['author_url']:
+                authors.submit(quote_info['author_url'], get_author_details, quote_info['author_url'])
+            page_quotes.append(quote_info)
 
-        # Si l'auteur n'est pas déjà scrappé
-        if quote_info['author_name'] not in authors_cache and quote_info['author_url']:
-            author_details = get_author_details(quote_info['author_url'])
-            authors_cache[quote_info['author_name']] = author_details
+        # Pagination
+        next_href = sites.NEXT_PAGE.extract(doc)
+        if next_href:
+            next_url = urljoin(start_url, next_href)
         else:
-            author_details = authors_cache.get(quote_info['author_name'], {})
+            next_url = None
+        state.page_done(next_page, page_quotes, next_url)
+        telemetry.count("items", len(page_quotes))
+        yield page_quotes
+        next_page = next_url
+    state.finish()
 
+def iter_quotes(state, start_url=url, author_workers=AUTHOR_WORKERS):
+    """Citations avec author_details, dans l'ordre, dès que leurs auteurs sont prêts"""
+    waiting = deque()
+
+    def ready(page_quotes):
+        return all(authors.done(q['author_url']) for q in page_quotes if q['author_url'])
+
+    def join(page_quotes):
         # Créer structure hiérarchique Citation → Auteur → Tags
-        quote_info['author_details'] = author_details
+        for quote_info in page_quotes:
+            details = authors.result(quote_info['author_url']) if quote_info['author_url'] else {}
+            yield dict(quote_info, author_details=details)
+
+    with DedupExecutor(max_workers=author_workers) as authors:
+        for page_quotes in iter_quote_pages(state, authors, start_url):
+            waiting.append(page_quotes)
+            while waiting and ready(waiting[0]):
+                yield from join(waiting.popleft())
+        while waiting:
+            yield from join(waiting.popleft())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scraping de quotes.toscrape.com avec infos auteurs")
+    parser.add_argument('--resume', action='store_true', help="Reprendre le crawl au dernier checkpoint")
+    parser.add_argument('--checkpoint-every', type=int, default=5, help="Sauvegarder l'état toutes les N pages")
+    args = parser.parse_args(argv)
 
-        all_quotes.append(quote_info)
+    state = CrawlState(STATE_NAME, resume=args.resume, every=args.checkpoint_every)
 
-    # Pagination
-    next_tag = doc.find('li', class_='next')
-    if next_tag:
-        next_page = urljoin(url, next_tag.find('a')['href'])
-    else:
-        next_page = None
+    # Sauvegarde JSON au fil du crawl
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"quotes_scraped_{timestamp}.json"
 
-# Sauvegarde JSON 
-timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-filename = f"quotes_scraped_{timestamp}.json"
+    with JsonArraySink(filename, indent=4) as sink, QuoteIndexWriter(INDEX_DIR) as index:
+        state.on_checkpoint(sink.flush)
+        for quote_info in iter_quotes(state):
+            sink.write(quote_info)
+            index.add(quote_info)
 
-with open(filename, 'w', encoding='utf-8') as f:
-    json.dump(all_quotes, f, ensure_ascii=False, indent=4)
+    print(f"Scraping terminé. {sink.count} citations sauvegardées dans {filename}, index dans {INDEX_DIR}/.")
+    fetch.print_stats()
 
-print(f"Scraping terminé. {len(all_quotes)} citations sauvegardées dans {filename}.")
+if __name__ == "__main__":
+    main()
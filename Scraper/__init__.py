@@ -0,0 +1 @@
+"""Outils partagés par les scrapers du dépôt (requêtes HTTP, ...)."""
@@ -0,0 +1,74 @@
+"""Agrégats de prix vectorisés pour les catalogues de livres (Navigation,
+march_livresque).
+
+Un seul groupby sur le couple (catégorie, note) calcule les sommes partielles
+de chaque groupe (nombre, somme, min, max, somme des prix × note, somme des
+notes) ; les statistiques par catégorie et par note sont ensuite agrégées à
+partir de ce petit cube, sans fonction Python par groupe. La moyenne pondérée
+vaut somme(prix × note) / somme(note), 0 si aucune note.
+
+    stats = analytics.catalog_stats(df)               # table longue : dimension, groupe, stats
+    by_cat = analytics.stats_for(stats, 'category')   # une dimension, indexée par groupe
+
+La médiane ne se recompose pas à partir de sommes partielles : avec
+median=True elle demande un groupby supplémentaire par dimension.
+"""
+import pandas as pd
+
+DIMENSIONS = ('category', 'rating')
+STAT_COLUMNS = ['nb_livres', 'prix_moyen', 'prix_min', 'prix_max', 'prix_moyen_pondere']
+
+
+def _cube(df, dimensions, price, weight):
+    """Sommes partielles par combinaison de dimensions (une passe sur les données)"""
+    work = pd.DataFrame({name: df[name] for name in dimensions})
+    work['_price'] = df[price].astype('float64')
+    work['_weight'] = df[weight].astype('float64')
+    work['_weighted'] = work['_price'] * work['_weight']
+    # dropna=False : un livre sans catégorie compte quand même dans les stats par note
+    return work.groupby(list(dimensions), observed=True, dropna=False, sort=False).agg(
+        n=('_price', 'count'),
+        total=('_price', 'sum'),
+        low=('_price', 'min'),
+        high=('_price', 'max'),
+        weighted=('_weighted', 'sum'),
+        weights=('_weight', 'sum'),
+    )
+
+
+def _rollup(cube, dimension):
+    parts = cube.groupby(level=dimension, observed=True).agg(
+        n=('n', 'sum'), total=('total', 'sum'), low=('low', 'min'), high=('high', 'max'),
+        weighted=('weighted', 'sum'), weights=('weights', 'sum'),
+    )
+    return pd.DataFrame({
+        'nb_livres': parts['n'],
+        'prix_moyen': parts['total'] / parts['n'],
+        'prix_min': parts['low'],
+        'prix_max': parts['high'],
+        'prix_moyen_pondere': (parts['weighted'] / parts['weights'].where(parts['weights'] > 0)).fillna(0),
+    })
+
+
+def catalog_stats(df, dimensions=DIMENSIONS, price='price', weight='rating', median=False):
+    """Statistiques de prix par catégorie et par note, en une table longue
+
+    Colonnes : dimension, groupe, nb_livres, prix_moyen, prix_min, prix_max,
+    prix_moyen_pondere (+ prix_median si median=True).
+    """
+    cube = _cube(df, dimensions, price, weight)
+    tables = []
+    for dimension in dimensions:
+        table = _rollup(cube, dimension)
+        if median:
+            table['prix_median'] = df.groupby(dimension, observed=True)[price].median()
+        table.index = table.index.astype(object)  # garde les notes entières à côté des catégories
+        tables.append(table.rename_axis('groupe').reset_index().assign(dimension=dimension))
+    columns = ['dimension', 'groupe'] + STAT_COLUMNS + (['prix_median'] if median else [])
+    return pd.concat(tables, ignore_index=True)[columns]
+
+
+def stats_for(stats, dimension):
+    """Extrait une dimension de catalog_stats(), indexée par ses groupes"""
+    table = stats[stats['dimension'] == dimension].drop(columns='dimension')
+    return table.set_index('groupe').rename_axis(dimension)
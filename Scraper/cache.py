@@ -0,0 +1,123 @@
+"""Cache HTTP persistant (SQLite) indexé par URL.
+
+Chaque entrée garde le corps, les en-têtes, l'ETag et le Last-Modified de la
+réponse. Tant que l'entrée a moins de `ttl` secondes elle est servie sans
+requête ; au-delà, fetch.get() envoie un GET conditionnel et un 304 la
+rafraîchit. La taille totale est bornée : les entrées les moins récemment
+utilisées sont supprimées en premier (LRU).
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "http_cache.sqlite")
+DEFAULT_TTL = 24 * 3600          # secondes
+DEFAULT_MAX_BYTES = 500 * 2**20  # 500 Mo
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url           TEXT PRIMARY KEY,
+    status        INTEGER NOT NULL,
+    headers       TEXT NOT NULL,
+    body          BLOB NOT NULL,
+    etag          TEXT,
+    last_modified TEXT,
+    stored_at     REAL NOT NULL,
+    last_access   REAL NOT NULL,
+    size          INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses(last_access);
+"""
+
+
+class CacheEntry:
+    __slots__ = ("url", "status", "headers", "body", "etag", "last_modified", "stored_at")
+
+    def __init__(self, url, status, headers, body, etag, last_modified, stored_at):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at
+
+    def is_fresh(self, ttl):
+        return ttl is not None and time.time() - self.stored_at < ttl
+
+    def can_revalidate(self):
+        return bool(self.etag or self.last_modified)
+
+
+class ResponseCache:
+    """Cache de réponses sur disque, partageable entre threads"""
+
+    def __init__(self, path=DEFAULT_PATH, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, url):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, headers, body, etag, last_modified, stored_at FROM responses WHERE url = ?",
+                (url,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+        status, headers, body, etag, last_modified, stored_at = row
+        return CacheEntry(url, status, json.loads(headers), body, etag, last_modified, stored_at)
+
+    def put(self, url, status, headers, body):
+        """Enregistre une réponse 200 ; `headers` est un dict-like d'en-têtes"""
+        now = time.time()
+        headers = {k: v for k, v in headers.items() if k.lower() not in ("content-encoding", "content-length")}
+        size = len(body) + len(url)
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, status, json.dumps(headers), body, headers.get("ETag") or headers.get("etag"),
+                 headers.get("Last-Modified") or headers.get("last-modified"), now, now, size))
+            self._total += size - (old[0] if old else 0)
+            self._evict()
+            self._conn.commit()
+
+    def touch(self, url):
+        """Marque une entrée comme revalidée (réponse 304)"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("UPDATE responses SET stored_at = ?, last_access = ? WHERE url = ?", (now, now, url))
+            self._conn.commit()
+
+    def _evict(self):
+        # supprime les entrées les moins récemment utilisées jusqu'à repasser sous la limite
+        while self._total > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT url, size FROM responses ORDER BY last_access LIMIT 64").fetchall()
+            if not rows:
+                self._total = 0
+                break
+            for url, size in rows:
+                if self._total <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+                self._total -= size
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._total = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,132 @@
+"""Détection de changements entre deux runs de surveillance (prix, stock...).
+
+Un instantané <nom>.json garde pour chaque élément (clé = URL de sa page
+détail) l'empreinte des champs lus sur la page liste et les données déjà
+extraites de la page détail. Au run suivant, seules les pages détail des
+éléments nouveaux ou dont l'empreinte a changé sont retéléchargées ; les
+autres reprennent les données de l'instantané.
+
+    snapshot = Snapshot("books_catalog_snapshot", fields=('title', 'price', 'rating', 'stock'))
+    changes = snapshot.diff(listing)              # {clé: enregistrement de la page liste}
+    details = {key: snapshot.details(key) for key in changes.unchanged}
+    details.update((key, get_details(listing[key])) for key in changes.to_fetch())
+    log = snapshot.commit(listing, details)       # insert / update / delete, puis sauvegarde
+    write_change_log("books_changes.jsonl", log)
+
+Un élément dont la page détail n'a pas pu être lue (détails vides) est
+enregistré sans empreinte : il sera retéléchargé au run suivant.
+
+content_hash() résume le texte complet d'un bloc de la page liste : à
+surveiller avec les champs, il signale aussi un changement qu'aucun champ
+extrait ne porte.
+"""
+import hashlib
+import json
+import os
+from datetime import datetime
+
+
+def content_hash(text):
+    """Empreinte courte du contenu texte d'un bloc HTML"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def fingerprint(record, fields):
+    """Empreinte des champs `fields` d'un enregistrement"""
+    payload = json.dumps([record.get(name) for name in fields], ensure_ascii=False, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ChangeSet:
+    """Clés nouvelles, modifiées, supprimées et inchangées depuis l'instantané"""
+
+    def __init__(self):
+        self.inserted = []
+        self.updated = []
+        self.deleted = []
+        self.unchanged = []
+
+    def to_fetch(self):
+        """Éléments dont la page détail doit être retéléchargée"""
+        return self.inserted + self.updated
+
+    def summary(self):
+        return (f"{len(self.inserted)} nouveaux, {len(self.updated)} modifiés, "
+                f"{len(self.deleted)} supprimés, {len(self.unchanged)} inchangés")
+
+
+class Snapshot:
+    def __init__(self, name, fields):
+        self.path = f"{name}.json"
+        self.fields = tuple(fields)
+        self.items = {}   # clé -> {"fp": empreinte, "record": données liste, "details": données détail}
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                saved = json.load(f)
+            if tuple(saved.get("fields", ())) == self.fields:
+                self.items = saved["items"]
+            else:
+                print(f"Instantané {self.path} ignoré : champs surveillés différents.")
+
+    def __len__(self):
+        return len(self.items)
+
+    def details(self, key):
+        item = self.items.get(key)
+        return dict(item["details"]) if item else {}
+
+    def diff(self, current):
+        """Compare {clé: enregistrement} à l'instantané"""
+        changes = ChangeSet()
+        for key, record in current.items():
+            old = self.items.get(key)
+            if old is None:
+                changes.inserted.append(key)
+            elif old["fp"] != fingerprint(record, self.fields):
+                changes.updated.append(key)
+            else:
+                changes.unchanged.append(key)
+        changes.deleted = [key for key in self.items if key not in current]
+        return changes
+
+    def commit(self, current, details):
+        """Remplace l'instantané par le run courant et renvoie le journal des changements"""
+        now = datetime.now().isoformat(timespec="seconds")
+        log = []
+        items = {}
+        for key, record in current.items():
+            new_details = details.get(key) or {}
+            old = self.items.get(key)
+            if old is None:
+                log.append({"time": now, "op": "insert", "key": key, "record": {**record, **new_details}})
+            else:
+                before = {**old["record"], **old["details"]}
+                after = {**record, **new_details}
+                changed = {name: [before.get(name), value] for name, value in after.items()
+                           if before.get(name) != value}
+                if changed:
+                    log.append({"time": now, "op": "update", "key": key, "changes": changed})
+            items[key] = {
+                "fp": fingerprint(record, self.fields) if new_details else None,
+                "record": record,
+                "details": new_details,
+            }
+        for key, old in self.items.items():
+            if key not in current:
+                log.append({"time": now, "op": "delete", "key": key, "record": {**old["record"], **old["details"]}})
+        self.items = items
+        self.save()
+        return log
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"fields": list(self.fields), "items": self.items}, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, self.path)
+
+
+def write_change_log(path, log):
+    """Ajoute les changements au journal JSONL (une ligne par changement)"""
+    with open(path, "a", encoding="utf-8") as f:
+        for entry in log:
+            f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
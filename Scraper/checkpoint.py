@@ -0,0 +1,148 @@
+"""État de crawl persistant pour reprendre un scraping interrompu (--resume).
+
+Deux fichiers par crawl :
+    <nom>.json          frontière (prochaine page par clé), URLs visitées,
+                        nombre d'enregistrements validés
+    <nom>.records.jsonl enregistrements déjà extraits, une ligne par record
+
+Les enregistrements sont ajoutés au fichier .jsonl à chaque checkpoint (tous
+les `every` pages) puis le .json est réécrit de façon atomique ; après un
+arrêt brutal, seules les lignes validées par le dernier .json sont relues.
+Les enregistrements ne sont pas gardés en mémoire : iter_records() les relit
+depuis le disque.
+
+    state = CrawlState("fake_jobs_state", resume=args.resume)
+    next_page = state.next_url(default=BASE_URL)
+    while next_page:
+        ...
+        state.page_done(next_page, jobs, next_url)
+        next_page = next_url
+    state.finish()
+    for job in state.iter_records():
+        ...
+"""
+import json
+import os
+import threading
+
+DEFAULT_KEY = "default"
+
+
+class CrawlState:
+    def __init__(self, name, resume=False, every=5):
+        self.state_path = f"{name}.json"
+        self.records_path = f"{name}.records.jsonl"
+        self.every = every
+        self.frontier = {}   # clé -> URL de la prochaine page (None = terminé)
+        self.visited = set()
+        self.complete = False
+        self._pending = []
+        self._committed = 0
+        self._pages_since_checkpoint = 0
+        self._lock = threading.Lock()
+        self._listeners = []
+        if resume:
+            self._load()
+        else:
+            self.clear()
+
+    # ----- Lecture / écriture -----
+    def _load(self):
+        if not os.path.exists(self.state_path):
+            # arrêt avant le premier .json : les lignes du .jsonl ne sont validées par rien
+            self.clear()
+            return
+        with open(self.state_path, encoding="utf-8") as f:
+            saved = json.load(f)
+        self.frontier = saved["frontier"]
+        self.visited = set(saved["visited"])
+        self.complete = saved.get("complete", False)
+        self._committed = saved["committed"]
+
+        kept_bytes = 0
+        if os.path.exists(self.records_path):
+            with open(self.records_path, "rb") as f:
+                for _ in range(self._committed):
+                    line = f.readline()
+                    if not line:
+                        break
+                    kept_bytes += len(line)
+            # supprime les lignes écrites après le dernier checkpoint validé
+            with open(self.records_path, "r+b") as f:
+                f.truncate(kept_bytes)
+        print(f"Reprise : {self._committed} enregistrements, {len(self.visited)} pages déjà visitées.")
+
+    def checkpoint(self):
+        with self._lock:
+            self._checkpoint()
+
+    def _checkpoint(self):
+        if self._pending:
+            with open(self.records_path, "a", encoding="utf-8") as f:
+                for key, record in self._pending:
+                    f.write(json.dumps({"k": key, "r": record}, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._committed += len(self._pending)
+            self._pending = []
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"frontier": self.frontier, "visited": sorted(self.visited),
+                       "committed": self._committed, "complete": self.complete}, f)
+        os.replace(tmp_path, self.state_path)
+        self._pages_since_checkpoint = 0
+        for listener in self._listeners:
+            listener()
+
+    def on_checkpoint(self, callback):
+        """Appelle callback() après chaque checkpoint (ex. sink.flush)"""
+        self._listeners.append(callback)
+
+    def clear(self):
+        for path in (self.state_path, self.records_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    # ----- Suivi du crawl -----
+    def next_url(self, key=DEFAULT_KEY, default=None):
+        """Page où reprendre pour `key` ; None si ce crawl est déjà terminé"""
+        return self.frontier.get(key, default)
+
+    def is_done(self, key=DEFAULT_KEY):
+        return key in self.frontier and self.frontier[key] is None
+
+    def is_visited(self, url):
+        return url in self.visited
+
+    def page_done(self, url, records, next_url, key=DEFAULT_KEY):
+        """Enregistre une page traitée, ses enregistrements et la page suivante"""
+        with self._lock:
+            self.visited.add(url)
+            self.frontier[key] = next_url
+            self._pending.extend((key, record) for record in records)
+            self._pages_since_checkpoint += 1
+            if self._pages_since_checkpoint >= self.every:
+                self._checkpoint()
+
+    def finish(self):
+        with self._lock:
+            self.complete = True
+            self._checkpoint()
+
+    def iter_records(self, key=None):
+        """Relit les enregistrements (validés puis en attente), filtrés par clé si fournie"""
+        with self._lock:
+            committed = self._committed
+            pending = list(self._pending)
+        if os.path.exists(self.records_path):
+            with open(self.records_path, encoding="utf-8") as f:
+                for _, line in zip(range(committed), f):
+                    entry = json.loads(line)
+                    if key is None or entry["k"] == key:
+                        yield entry["r"]
+        for record_key, record in pending:
+            if key is None or record_key == key:
+                yield record
+
+    def all_records(self, key=None):
+        return list(self.iter_records(key))
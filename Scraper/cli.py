@@ -0,0 +1,64 @@
+"""Point d'entrée unique des scrapers, depuis la racine du dépôt :
+
+    python -m Scraper books --pipeline
+    python -m Scraper categories --format parquet
+    python -m Scraper jobs --city Boston
+    python -m Scraper quotes --graph-format parquet
+    python -m Scraper report --delta
+    python -m Scraper search --tag love --top author
+    python -m Scraper serp --queries queries.txt --pages 3
+    python -m Scraper jobs --help          # options propres à la commande
+
+Seul le script de la commande demandée est importé, une fois la ligne de
+commande lue : `python -m Scraper --help` ne charge aucune bibliothèque.
+pandas, matplotlib et plotly ne sont chargés que par les commandes qui
+analysent ou tracent, après le crawl. Les fichiers produits sont écrits dans
+le répertoire courant, comme en lançant le script directement.
+
+Temps de démarrage par commande : benchmarks/bench_startup.py.
+"""
+import argparse
+import importlib
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROG = "python -m Scraper"
+
+# commande -> (script ou module du paquet, description)
+COMMANDS = {
+    "books": ("Books_to_Scrape/scrap.py", "livres de books.toscrape.com (liste + pages détail, --site)"),
+    "categories": ("Navigation/scrap.py", "livres par catégorie, statistiques et graphique"),
+    "jobs": ("Fake_Job/scrap.py", "offres Python de fake-jobs, nettoyées et filtrées"),
+    "quotes": ("Quotes_to_Scrape/scra-challange.py", "citations et auteurs de quotes.toscrape.com + graphe"),
+    "report": ("march_livresque/scrap.py", "analyse du catalogue + rapport PDF (--details, --delta)"),
+    "search": ("Scraper.quoteindex", "recherche dans l'index des citations écrit par quotes"),
+    "serp": ("web_scraping_lab/main.py", "résultats SerpAPI par lots (cache, pagination, dédoublonnage)"),
+}
+
+
+def load_command(name):
+    """Importe le script d'une commande (dossiers sans __init__, noms non importables)"""
+    path = COMMANDS[name][0]
+    if not path.endswith(".py"):
+        return importlib.import_module(path)
+    spec = importlib.util.spec_from_file_location(f"scraper_{name}", os.path.join(ROOT, path))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # fonctions picklables pour le pool de processus (--pipeline)
+    spec.loader.exec_module(module)
+    return module
+
+
+def main(argv=None):
+    commands = "\n".join(f"  {name:<12} {description}" for name, (_, description) in COMMANDS.items())
+    parser = argparse.ArgumentParser(
+        prog=PROG, description="Scrapers du dépôt WebScraping",
+        epilog=f"commandes :\n{commands}", formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=COMMANDS, metavar="commande", help="voir la liste ci-dessous")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="options de la commande (<commande> --help)")
+    args = parser.parse_args(argv)
+
+    module = load_command(args.command)
+    sys.argv[0] = f"{PROG} {args.command}"  # nom affiché par l'aide de la commande
+    module.main(args.args)
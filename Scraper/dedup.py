@@ -0,0 +1,53 @@
+"""Exécution en arrière-plan avec déduplication des tâches en cours.
+
+Chaque clé (par ex. l'URL d'un auteur) n'est soumise qu'une seule fois :
+les appels suivants reçoivent le même Future, que la tâche soit encore en
+cours ou déjà terminée.
+
+    with DedupExecutor(max_workers=8) as pool:
+        pool.submit(author_url, get_author_details, author_url)
+        ...
+        details = pool.result(author_url)
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class DedupExecutor:
+    def __init__(self, max_workers=8):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key, fn, *args, **kwargs):
+        """Lance fn(*args) pour `key` si ce n'est pas déjà fait ; renvoie le Future partagé"""
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None:
+                future = self._executor.submit(fn, *args, **kwargs)
+                self._futures[key] = future
+            return future
+
+    def done(self, key):
+        return self._futures[key].done()
+
+    def result(self, key, timeout=None):
+        return self._futures[key].result(timeout)
+
+    def results(self):
+        """dict clé -> résultat, en attendant les tâches restantes"""
+        with self._lock:
+            futures = dict(self._futures)
+        return {key: future.result() for key, future in futures.items()}
+
+    def __len__(self):
+        return len(self._futures)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
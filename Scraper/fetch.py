@@ -0,0 +1,357 @@
+"""Couche HTTP partagée : une Session poolée (keep-alive), timeouts, retry/backoff
+sur 5xx/429, cache disque et ordonnanceur par hôte optionnels (voir cache.py et
+scheduler.py) et compteurs de temps par requête (connexion / attente / transfert).
+
+Utilisation depuis un script :
+
+    from Scraper import fetch
+    resp = fetch.get(url)
+    fetch.enable_cache()      # optionnel : réponses persistées entre deux runs
+    fetch.enable_scheduler()  # optionnel : débit et concurrence adaptés à chaque hôte
+    fetch.print_stats()
+"""
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+from . import cache as cache_defaults
+from . import scheduler as scheduler_defaults
+from . import telemetry
+from .cache import ResponseCache
+from .scheduler import THROTTLE_STATUS, HostScheduler
+
+try:  # requests ne décode le brotli que si le paquet est installé
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+# Réglages par défaut (modifiables via configure())
+POOL_CONNECTIONS = 10      # nombre d'hôtes gardés en pool
+POOL_MAXSIZE = 20          # connexions keep-alive par hôte
+TIMEOUT = (5, 30)          # (connexion, lecture) en secondes
+RETRIES = 3
+BACKOFF_FACTOR = 0.5
+RETRY_STATUS = (429, 500, 502, 503, 504)
+USER_AGENT = "Mozilla/5.0 (compatible; WebScraping-lab)"
+
+_local = threading.local()
+
+
+# ----- Mesure du temps d'établissement des connexions -----
+def _record_connect(seconds):
+    _local.connect_time = getattr(_local, "connect_time", 0.0) + seconds
+    _local.connections = getattr(_local, "connections", 0) + 1
+
+
+def _record_socket(seconds):
+    _local.socket_time = getattr(_local, "socket_time", 0.0) + seconds
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def _new_conn(self):
+        # résolution DNS + connexion TCP
+        start = time.perf_counter()
+        sock = super()._new_conn()
+        _record_socket(time.perf_counter() - start)
+        return sock
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _record_connect(time.perf_counter() - start)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def _new_conn(self):
+        start = time.perf_counter()
+        sock = super()._new_conn()
+        _record_socket(time.perf_counter() - start)
+        return sock
+
+    def connect(self):
+        # inclut la poignée de main TLS
+        start = time.perf_counter()
+        super().connect()
+        _record_connect(time.perf_counter() - start)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter dont les connexions mesurent leur temps de connect()"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+# ----- Compteurs globaux -----
+class FetchStats:
+    """Compteurs cumulés (thread-safe) sur toutes les requêtes"""
+
+    FIELDS = ("requests", "errors", "retries", "connections", "bytes",
+              "connect_time", "wait_time", "transfer_time", "cache_hits", "not_modified")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._values = {name: 0 for name in self.FIELDS}
+
+    def add(self, **values):
+        with self._lock:
+            for name, value in values.items():
+                self._values[name] += value
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._values)
+
+
+stats = FetchStats()
+
+
+def get_stats():
+    return stats.snapshot()
+
+
+def reset_stats():
+    stats.reset()
+
+
+def print_stats():
+    s = get_stats()
+    n = s["requests"] or 1
+    print(f"\nHTTP : {s['requests']} requêtes, {s['connections']} connexions ouvertes, "
+          f"{s['retries']} retries, {s['errors']} erreurs, {s['bytes'] / 1024:.1f} Ko")
+    if s["cache_hits"] or s["not_modified"]:
+        print(f"  cache : {s['cache_hits']} servies sans requête, {s['not_modified']} revalidées (304)")
+    print(f"  connexion : {s['connect_time']:.2f}s | attente serveur : {s['wait_time']:.2f}s | "
+          f"transfert : {s['transfer_time']:.2f}s (moy. {1000 * (s['connect_time'] + s['wait_time'] + s['transfer_time']) / n:.0f} ms/req)")
+    if _scheduler is not None:
+        _scheduler.print_summary()
+
+
+# ----- Session partagée -----
+def make_session(pool_connections=None, pool_maxsize=None, retries=None, backoff_factor=None,
+                 retry_throttled=True):
+    """Crée une Session keep-alive avec pool de connexions et retry/backoff
+
+    retry_throttled=False laisse les 429/503 à l'appelant (ordonnanceur).
+    """
+    status_forcelist = RETRY_STATUS if retry_throttled else [s for s in RETRY_STATUS if s not in THROTTLE_STATUS]
+    retry = Retry(
+        total=RETRIES if retries is None else retries,
+        backoff_factor=BACKOFF_FACTOR if backoff_factor is None else backoff_factor,
+        status_forcelist=status_forcelist,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=retry_throttled,
+        raise_on_status=False,  # on renvoie la dernière réponse, le script décide
+    )
+    adapter = TimedHTTPAdapter(
+        pool_connections=POOL_CONNECTIONS if pool_connections is None else pool_connections,
+        pool_maxsize=POOL_MAXSIZE if pool_maxsize is None else pool_maxsize,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT, "Accept-Encoding": ACCEPT_ENCODING})
+    return session
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Session unique partagée par tous les appels à get()"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                # avec l'ordonnanceur, les 429/503 lui reviennent (pause de tout l'hôte)
+                _session = make_session(retry_throttled=_scheduler is None)
+    return _session
+
+
+def configure(pool_connections=None, pool_maxsize=None, retries=None, backoff_factor=None, timeout=None):
+    """Change les réglages et recrée la session partagée"""
+    global POOL_CONNECTIONS, POOL_MAXSIZE, RETRIES, BACKOFF_FACTOR, TIMEOUT, _session
+    with _session_lock:
+        if pool_connections is not None:
+            POOL_CONNECTIONS = pool_connections
+        if pool_maxsize is not None:
+            POOL_MAXSIZE = pool_maxsize
+        if retries is not None:
+            RETRIES = retries
+        if backoff_factor is not None:
+            BACKOFF_FACTOR = backoff_factor
+        if timeout is not None:
+            TIMEOUT = timeout
+        _reset_session()
+
+
+def _reset_session():
+    global _session
+    if _session is not None:
+        _session.close()
+    _session = None
+
+
+# ----- Cache disque -----
+_cache = None
+
+
+def enable_cache(path=cache_defaults.DEFAULT_PATH, ttl=cache_defaults.DEFAULT_TTL,
+                 max_bytes=cache_defaults.DEFAULT_MAX_BYTES):
+    """Active le cache persistant pour tous les appels à get() ; ttl=0 force la revalidation"""
+    global _cache
+    disable_cache()
+    _cache = ResponseCache(path, ttl=ttl, max_bytes=max_bytes)
+    return _cache
+
+
+def disable_cache():
+    global _cache
+    if _cache is not None:
+        _cache.close()
+    _cache = None
+
+
+# ----- Ordonnanceur par hôte -----
+_scheduler = None
+
+
+def enable_scheduler(rate=None, burst=1, max_concurrency=scheduler_defaults.MAX_CONCURRENCY,
+                     initial_concurrency=scheduler_defaults.INITIAL_CONCURRENCY, robots=True):
+    """Fait passer get() par un HostScheduler (rate : requêtes/s max par hôte, None = robots.txt seul)"""
+    global _scheduler
+    robots_fetcher = (lambda robots_url: get_session().get(robots_url, timeout=TIMEOUT)) if robots else None
+    with _session_lock:
+        _scheduler = HostScheduler(rate=rate, burst=burst, initial_concurrency=initial_concurrency,
+                                   max_concurrency=max_concurrency, robots_fetcher=robots_fetcher,
+                                   user_agent=USER_AGENT, retries=RETRIES)
+        _reset_session()
+    return _scheduler
+
+
+def disable_scheduler():
+    global _scheduler
+    with _session_lock:
+        _scheduler = None
+        _reset_session()
+
+
+def _response_from_cache(entry):
+    resp = requests.Response()
+    resp.status_code = entry.status
+    resp.headers = CaseInsensitiveDict(entry.headers)
+    resp._content = entry.body
+    resp.url = entry.url
+    resp.encoding = get_encoding_from_headers(resp.headers)
+    return resp
+
+
+def _cache_key(url, params):
+    """URL réellement demandée (params inclus dans la query string) : clé du cache"""
+    if not params:
+        return url
+    return requests.Request("GET", url, params=params).prepare().url
+
+
+def get(url, session=None, use_cache=True, **kwargs):
+    """GET via la session partagée ; le corps est lu entièrement avant le retour
+
+    use_cache=False ignore le cache disque pour cette requête (page qui doit
+    être relue à chaque run, comme une page liste).
+    """
+    cache = _cache if use_cache else None
+    key = _cache_key(url, kwargs.get("params"))
+    entry = cache.get(key) if cache is not None else None
+    if entry is not None:
+        if entry.is_fresh(cache.ttl):
+            stats.add(cache_hits=1)
+            return _response_from_cache(entry)
+        if entry.can_revalidate():
+            headers = dict(kwargs.pop("headers", None) or {})
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+            kwargs["headers"] = headers
+
+    scheduler = _scheduler
+    if scheduler is None:
+        resp = _timed_get(url, session or get_session(), **kwargs)
+    else:
+        resp = scheduler.run(url, lambda: _timed_get(url, session or get_session(), **kwargs))
+
+    if cache is not None:
+        if resp.status_code == 304 and entry is not None:
+            cache.touch(key)
+            stats.add(not_modified=1)
+            return _response_from_cache(entry)
+        if resp.status_code == 200:
+            cache.put(key, resp.status_code, resp.headers, resp.content)
+    return resp
+
+
+def _timed_get(url, session, **kwargs):
+    kwargs.setdefault("timeout", TIMEOUT)
+    connect_before = getattr(_local, "connect_time", 0.0)
+    socket_before = getattr(_local, "socket_time", 0.0)
+    conns_before = getattr(_local, "connections", 0)
+
+    start = time.perf_counter()
+    try:
+        resp = session.get(url, stream=True, **kwargs)
+    except requests.RequestException:
+        stats.add(requests=1, errors=1)
+        raise
+    headers_at = time.perf_counter()
+    content = resp.content  # téléchargement du corps
+    done = time.perf_counter()
+
+    connect_time = getattr(_local, "connect_time", 0.0) - connect_before
+    connections = getattr(_local, "connections", 0) - conns_before
+    retries = resp.raw.retries.history if getattr(resp.raw, "retries", None) else ()
+    wait_time = max(headers_at - start - connect_time, 0.0)
+    stats.add(
+        requests=1,
+        errors=0 if resp.ok else 1,
+        retries=len(retries),
+        connections=connections,
+        bytes=len(content),
+        connect_time=connect_time,
+        wait_time=wait_time,
+        transfer_time=done - headers_at,
+    )
+    if telemetry.enabled:
+        if connections:
+            socket_time = getattr(_local, "socket_time", 0.0) - socket_before
+            telemetry.observe("http.connect", socket_time)
+            if url.startswith("https:"):
+                telemetry.observe("http.tls", max(connect_time - socket_time, 0.0))
+        telemetry.observe("http.wait", wait_time)
+        telemetry.observe("http.transfer", done - headers_at)
+    return resp
@@ -0,0 +1,248 @@
+"""Frontière de crawl générique : URLs canonisées, dédupliquées et servies par
+priorité (pages liste avant pages détail, par exemple).
+
+Un site décrit ses liens à suivre par type de page (voir sites.BOOKS_RULES) :
+
+    frontier = Frontier(priorities=sites.BOOKS_PRIORITIES)
+    frontier.push("https://books.toscrape.com/", "home")
+    for kind, url, doc, meta in crawl(frontier, sites.BOOKS_RULES, workers=8):
+        ...
+
+Chaque URL n'est téléchargée qu'une fois, même découverte depuis plusieurs
+pages (catalogue, catégorie...). L'ensemble des URLs vues garde une empreinte
+de 64 bits par URL ; pour les très gros crawls, un BloomFilter (taille fixe,
+quelques octets par URL, faux positifs rares) peut le remplacer.
+"""
+import hashlib
+import heapq
+import itertools
+import math
+import posixpath
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from . import fetch, parsing
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid")
+INDEX_PAGES = ("index.html", "index.htm")
+
+
+def canonicalize(url, strip_index=True):
+    """Forme canonique d'une URL : schéma/hôte en minuscules, port par défaut,
+    segments ./.. résolus, fragment et paramètres de suivi retirés, paramètres
+    triés ; « dossier/index.html » devient « dossier/ »."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path or "/"
+    if "/." in path:
+        trailing = path.endswith("/")
+        path = posixpath.normpath(path)
+        path = "/" if path in (".", "/") else path + ("/" if trailing else "")
+    if strip_index:
+        head, _, last = path.rpartition("/")
+        if last in INDEX_PAGES:
+            path = head + "/"
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if not k.startswith(TRACKING_PARAMS))
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def _digest(key):
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+
+
+class VisitedSet:
+    """Ensemble exact d'URLs stockées sous forme d'empreintes 64 bits"""
+
+    def __init__(self):
+        self._hashes = set()
+
+    def add(self, key):
+        """Ajoute `key` ; renvoie False si elle était déjà présente"""
+        h = int.from_bytes(_digest(key)[:8], "little")
+        if h in self._hashes:
+            return False
+        self._hashes.add(h)
+        return True
+
+    def __contains__(self, key):
+        return int.from_bytes(_digest(key)[:8], "little") in self._hashes
+
+    def __len__(self):
+        return len(self._hashes)
+
+
+class BloomFilter:
+    """Filtre de Bloom dimensionné pour `capacity` URLs au taux de faux positifs voulu
+
+    Un faux positif fait sauter une URL jamais vue : à réserver aux crawls
+    trop gros pour VisitedSet.
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self._count = 0
+
+    def _positions(self, key):
+        digest = _digest(key)
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key):
+        new = False
+        for pos in self._positions(key):
+            byte, bit = divmod(pos, 8)
+            if not self._bits[byte] & (1 << bit):
+                self._bits[byte] |= 1 << bit
+                new = True
+        if new:
+            self._count += 1
+        return new
+
+    def __contains__(self, key):
+        return all(self._bits[pos // 8] & (1 << (pos % 8)) for pos in self._positions(key))
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def nbytes(self):
+        return len(self._bits)
+
+
+class LinkRule:
+    """Liens à suivre depuis un type de page : sélecteur CSS -> type de page cible
+
+    meta_fields : Schema appliqué au bloc `block_css` contenant le lien (ex. la
+    vignette d'un livre) dont les champs accompagnent l'URL découverte ;
+    text_as : nom sous lequel garder le texte du lien ; inherit : recopie les
+    métadonnées de la page courante (ex. la catégorie le long de la pagination).
+    """
+
+    def __init__(self, css, kind, attr="href", block_css=None, meta_fields=None, text_as=None, inherit=False):
+        self.css = css
+        self.kind = kind
+        self.attr = attr
+        self.block_css = block_css
+        self.meta_fields = meta_fields
+        self.text_as = text_as
+        self.inherit = inherit
+
+    def _meta(self, link, block, page_meta):
+        meta = dict(page_meta) if self.inherit else {}
+        if self.meta_fields is not None and block is not None:
+            meta.update(self.meta_fields.extract(block))
+        if self.text_as:
+            meta[self.text_as] = parsing.text(link)
+        return meta
+
+    def extract(self, doc, page_url, page_meta=None):
+        """Liste de (URL absolue, métadonnées) trouvées dans la page"""
+        page_meta = page_meta or {}
+        if self.block_css is None:
+            pairs = [(link, None) for link in parsing.select(doc, self.css)]
+        else:
+            pairs = [(parsing.select_one(block, self.css), block) for block in parsing.select(doc, self.block_css)]
+        found = []
+        for link, block in pairs:
+            href = parsing.attr(link, self.attr, None)
+            if href:
+                found.append((urljoin(page_url, href), self._meta(link, block, page_meta)))
+        return found
+
+
+class Frontier:
+    """File de priorité d'URLs à visiter, sans doublon (priorité basse = servie d'abord)"""
+
+    def __init__(self, priorities=None, visited=None, canonical=canonicalize):
+        self.priorities = priorities or {}
+        self.seen = VisitedSet() if visited is None else visited
+        self.canonical = canonical
+        self._heap = []
+        self._order = itertools.count()  # FIFO à priorité égale
+        self._lock = threading.Lock()
+        self.duplicates = 0
+        self.failures = 0  # pages non téléchargées (erreur réseau ou statut != 200)
+
+    def push(self, url, kind, meta=None, priority=None):
+        """Ajoute une URL jamais vue ; renvoie False si elle l'a déjà été"""
+        key = self.canonical(url)
+        if priority is None:
+            priority = self.priorities.get(kind, 0)
+        with self._lock:
+            if not self.seen.add(key):
+                self.duplicates += 1
+                return False
+            heapq.heappush(self._heap, (priority, next(self._order), url, kind, meta or {}))
+        return True
+
+    def pop(self):
+        """(url, type, métadonnées) la plus prioritaire, ou None si la file est vide"""
+        with self._lock:
+            if not self._heap:
+                return None
+            _, _, url, kind, meta = heapq.heappop(self._heap)
+        return url, kind, meta
+
+    def pop_many(self, n):
+        """Jusqu'à n entrées, toutes de la meilleure priorité disponible"""
+        with self._lock:
+            if not self._heap:
+                return []
+            best = self._heap[0][0]
+            batch = []
+            while self._heap and len(batch) < n and self._heap[0][0] == best:
+                _, _, url, kind, meta = heapq.heappop(self._heap)
+                batch.append((url, kind, meta))
+        return batch
+
+    def __len__(self):
+        return len(self._heap)
+
+
+def crawl(frontier, rules, workers=1, max_pages=None, get=None):
+    """Vide la frontière : produit (type, url, doc, métadonnées) par page téléchargée
+
+    Les liens de chaque page sont extraits selon rules[type] et ajoutés à la
+    frontière avant de produire la page. Les pages d'une même priorité sont
+    téléchargées par lots de `workers` en parallèle. Une page en échec (erreur
+    réseau ou statut != 200) est comptée dans frontier.failures, le crawl continue.
+    """
+    get = get or fetch.get
+
+    def download(entry):
+        try:
+            return get(entry[0]), None
+        except Exception as e:  # réseau, après les retries de la session
+            return None, e
+
+    pages = 0
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        while len(frontier) and (max_pages is None or pages < max_pages):
+            limit = workers if max_pages is None else min(workers, max_pages - pages)
+            batch = frontier.pop_many(limit)
+            for (url, kind, meta), (resp, error) in zip(batch, executor.map(download, batch)):
+                pages += 1
+                if error is not None:
+                    frontier.failures += 1
+                    print(f"Erreur {type(error).__name__} pour {url} : {error}")
+                    continue
+                if resp.status_code != 200:
+                    frontier.failures += 1
+                    print(f"Erreur {resp.status_code} pour {url}")
+                    continue
+                doc = parsing.parse(resp.text)
+                for rule in rules.get(kind, ()):
+                    for link, link_meta in rule.extract(doc, url, meta):
+                        frontier.push(link, rule.kind, link_meta)
+                yield kind, url, doc, meta
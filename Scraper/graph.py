@@ -0,0 +1,154 @@
+"""Graphe auteurs -> citations -> tags sans networkx : identifiants entiers,
+tables d'attributs et arêtes dans des tableaux compacts, exports en flux.
+
+    graph = QuoteGraph()
+    for quote in iter_quotes(state):
+        graph.add_quote(quote['author_name'], quote['text'], quote['tags'])
+    graph.write("quotes_graph.graphml")     # .graphml, .gexf, .csv (liste d'arêtes), .parquet
+
+Chaque noeud est identifié par (type, libellé) : un tag homonyme d'un auteur
+reste un noeud distinct. Comme dans un DiGraph, une arête (source, cible) n'est
+ajoutée qu'une fois : une citation déjà vue ne crée pas de nouveau noeud mais
+reçoit les arêtes qui lui manquent (second auteur, nouveaux tags). Les fichiers
+sont écrits ligne à ligne depuis les tableaux : temps et mémoire restent
+linéaires en nombre de citations.
+
+Liste d'arêtes : <nom>.csv (source, cible, relation) + <nom>.nodes.csv
+(id, type, libellé). Parquet : <nom>.parquet (arêtes) + <nom>.nodes.parquet.
+"""
+import csv
+import os
+from array import array
+from xml.sax.saxutils import escape, quoteattr
+
+NODE_TYPES = ('author', 'quote', 'tag')
+RELATIONS = ('wrote', 'has_tag')
+AUTHOR, QUOTE, TAG = range(3)
+WROTE, HAS_TAG = range(2)
+CHUNK = 10000  # lignes écrites par appel à writelines()
+
+
+class QuoteGraph:
+    def __init__(self):
+        self.labels = []               # id -> libellé
+        self.types = array('B')        # id -> indice dans NODE_TYPES
+        self.sources = array('I')
+        self.targets = array('I')
+        self.relations = array('B')    # indice dans RELATIONS
+        self._ids = ({}, {}, {})       # par type : libellé -> id
+        self._edges = set()            # source << 32 | cible : arêtes déjà présentes
+
+    def node(self, kind, label):
+        """Identifiant du noeud (créé au premier appel)"""
+        ids = self._ids[kind]
+        node_id = ids.get(label)
+        if node_id is None:
+            node_id = ids[label] = len(self.labels)
+            self.labels.append(label)
+            self.types.append(kind)
+        return node_id
+
+    def edge(self, source, target, relation):
+        """Ajoute l'arête source -> cible si elle n'existe pas encore"""
+        key = source << 32 | target
+        if key not in self._edges:
+            self._edges.add(key)
+            self.sources.append(source)
+            self.targets.append(target)
+            self.relations.append(relation)
+
+    def add_quote(self, author, text, tags):
+        quote_id = self.node(QUOTE, text)
+        self.edge(self.node(AUTHOR, author), quote_id, WROTE)
+        for tag in tags:
+            self.edge(quote_id, self.node(TAG, tag), HAS_TAG)
+
+    def __len__(self):
+        return len(self.labels)
+
+    @property
+    def edge_count(self):
+        return len(self.sources)
+
+    # ----- Exports -----
+    def write(self, path):
+        ext = os.path.splitext(path)[1].lower()
+        writers = {".graphml": self.write_graphml, ".gexf": self.write_gexf,
+                   ".csv": self.write_edgelist, ".parquet": self.write_parquet}
+        if ext not in writers:
+            raise ValueError(f"Format de graphe inconnu : {path}")
+        writers[ext](path)
+
+    def _write_lines(self, f, lines):
+        chunk = []
+        for line in lines:
+            chunk.append(line)
+            if len(chunk) >= CHUNK:
+                f.writelines(chunk)
+                chunk = []
+        f.writelines(chunk)
+
+    def write_graphml(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('<?xml version="1.0" encoding="utf-8"?>\n'
+                    '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+                    '<key id="d0" for="node" attr.name="type" attr.type="string"/>\n'
+                    '<key id="d1" for="node" attr.name="label" attr.type="string"/>\n'
+                    '<key id="d2" for="edge" attr.name="relation" attr.type="string"/>\n'
+                    '<graph edgedefault="directed">\n')
+            self._write_lines(f, (
+                f'<node id="n{i}"><data key="d0">{NODE_TYPES[kind]}</data><data key="d1">{escape(label)}</data></node>\n'
+                for i, (kind, label) in enumerate(zip(self.types, self.labels))))
+            self._write_lines(f, (
+                f'<edge source="n{s}" target="n{t}"><data key="d2">{RELATIONS[r]}</data></edge>\n'
+                for s, t, r in zip(self.sources, self.targets, self.relations)))
+            f.write('</graph>\n</graphml>\n')
+
+    def write_gexf(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('<?xml version="1.0" encoding="utf-8"?>\n'
+                    '<gexf xmlns="http://www.gexf.net/1.2draft" version="1.2">\n'
+                    '<graph defaultedgetype="directed" mode="static">\n'
+                    '<attributes class="node" mode="static"><attribute id="0" title="type" type="string"/></attributes>\n'
+                    '<attributes class="edge" mode="static"><attribute id="1" title="relation" type="string"/></attributes>\n'
+                    '<nodes>\n')
+            self._write_lines(f, (
+                f'<node id="{i}" label={quoteattr(label)}><attvalues><attvalue for="0" value="{NODE_TYPES[kind]}"/></attvalues></node>\n'
+                for i, (kind, label) in enumerate(zip(self.types, self.labels))))
+            f.write('</nodes>\n<edges>\n')
+            self._write_lines(f, (
+                f'<edge id="{e}" source="{s}" target="{t}"><attvalues><attvalue for="1" value="{RELATIONS[r]}"/></attvalues></edge>\n'
+                for e, (s, t, r) in enumerate(zip(self.sources, self.targets, self.relations))))
+            f.write('</edges>\n</graph>\n</gexf>\n')
+
+    def write_edgelist(self, path):
+        base = os.path.splitext(path)[0]
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(['source', 'target', 'relation'])
+            writer.writerows(zip(self.sources, self.targets, (RELATIONS[r] for r in self.relations)))
+        with open(f"{base}.nodes.csv", "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(['id', 'type', 'label'])
+            writer.writerows((i, NODE_TYPES[kind], label) for i, (kind, label) in enumerate(zip(self.types, self.labels)))
+
+    def write_parquet(self, path):
+        import numpy as np
+        from .schemas import _require_pyarrow, pa, pq  # pyarrow chargé seulement pour ce format
+        _require_pyarrow()
+        base = os.path.splitext(path)[0]
+        # tableaux array -> numpy sans copie
+        relations = np.frombuffer(self.relations, dtype=np.uint8).astype(np.int8)
+        relation = pa.DictionaryArray.from_arrays(pa.array(relations), pa.array(RELATIONS))
+        pq.write_table(pa.table({
+            'source': pa.array(np.frombuffer(self.sources, dtype=np.uint32)),
+            'target': pa.array(np.frombuffer(self.targets, dtype=np.uint32)),
+            'relation': relation,
+        }), path, compression="zstd")
+        types = np.frombuffer(self.types, dtype=np.uint8).astype(np.int8)
+        node_type = pa.DictionaryArray.from_arrays(pa.array(types), pa.array(NODE_TYPES))
+        pq.write_table(pa.table({
+            'id': pa.array(np.arange(len(self.labels), dtype=np.uint32)),
+            'type': node_type,
+            'label': pa.array(self.labels, pa.string()),
+        }), f"{base}.nodes.parquet", compression="zstd")
@@ -0,0 +1,159 @@
+"""Stockage local indexé des offres d'emploi nettoyées (SQLite).
+
+Le dernier crawl est conservé sur disque : les filtres de la ligne de commande
+interrogent la base au lieu de re-scraper le site.
+
+    store = JobStore("python_jobs.sqlite")
+    with store.replace() as writer:              # remplace le crawl précédent
+        for job in jobs:
+            writer.write(job)
+    jobs = store.query(city="Boston", contract="full", text="django")
+
+Les filtres de ville et de contrat cherchent une sous-chaîne sans tenir compte
+de la casse, comme str.contains(case=False) : « boston » trouve « Boston, MA »
+et « FR » toutes les villes françaises. La recherche plein texte sur titre +
+description passe par une table FTS5 (tous les mots demandés, `djan*` pour un
+préfixe) ; sans FTS5 dans le SQLite de Python, elle retombe sur des LIKE.
+
+Le remplacement est une seule transaction : un crawl interrompu laisse la base
+du crawl précédent intacte.
+"""
+import sqlite3
+import time
+from contextlib import contextmanager
+
+COLUMNS = ('title', 'company', 'location', 'date_posted', 'apply_url', 'description', 'contract_type')
+BATCH_SIZE = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id            INTEGER PRIMARY KEY,
+    title         TEXT,
+    company       TEXT,
+    location      TEXT COLLATE NOCASE,
+    date_posted   TEXT,
+    apply_url     TEXT,
+    description   TEXT,
+    contract_type TEXT COLLATE NOCASE
+);
+CREATE INDEX IF NOT EXISTS jobs_location ON jobs(location);
+CREATE INDEX IF NOT EXISTS jobs_contract_type ON jobs(contract_type);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+# table FTS5 sans copie du texte (contenu lu dans jobs), reconstruite après chaque crawl
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title, description, content='jobs', content_rowid='id'
+);
+"""
+
+
+def _like_contains(value):
+    """Motif LIKE « contient », jokers de l'utilisateur échappés"""
+    return "%" + value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def _fts_query(text):
+    """Mots de l'utilisateur -> requête FTS5 (chaque mot entre guillemets, * final conservé)"""
+    terms = []
+    for word in text.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*").replace('"', '""')
+        if word:
+            terms.append(f'"{word}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+class _Writer:
+    def __init__(self, conn):
+        self._conn = conn
+        self._buffer = []
+        self.count = 0
+
+    def write(self, job):
+        self._buffer.append(tuple(job.get(name) for name in COLUMNS))
+        self.count += 1
+        if len(self._buffer) >= BATCH_SIZE:
+            self.flush()
+
+    def write_many(self, jobs):
+        for job in jobs:
+            self.write(job)
+
+    def flush(self):
+        if self._buffer:
+            self._conn.executemany(
+                f"INSERT INTO jobs ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                self._buffer)
+            self._buffer = []
+
+
+class JobStore:
+    def __init__(self, path):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        try:
+            self._conn.executescript(_FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:  # SQLite compilé sans FTS5
+            self.has_fts = False
+
+    @contextmanager
+    def replace(self):
+        """Remplace toutes les offres (une transaction, annulée en cas d'erreur)"""
+        writer = _Writer(self._conn)
+        with self._conn:  # COMMIT en sortie, ROLLBACK sur exception
+            self._conn.execute("DELETE FROM jobs")
+            yield writer
+            writer.flush()
+            if self.has_fts:
+                self._conn.execute("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')")
+            self._conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", [
+                ("crawled_at", time.strftime("%Y-%m-%d %H:%M:%S")), ("count", str(writer.count))])
+
+    def _filters(self, city, contract, text):
+        """(« FROM ... WHERE ... », paramètres, ORDER BY) communs à query() et count()"""
+        where, params = [], []
+        source, order = "jobs", "jobs.id"
+        if city:
+            where.append("jobs.location LIKE ? ESCAPE '\\'")
+            params.append(_like_contains(city))
+        if contract:
+            where.append("jobs.contract_type LIKE ? ESCAPE '\\'")
+            params.append(_like_contains(contract))
+        if text and self.has_fts and _fts_query(text):
+            source = "jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid"
+            where.append("jobs_fts MATCH ?")
+            params.append(_fts_query(text))
+            order = "jobs_fts.rank"
+        elif text:
+            for word in text.split():
+                where.append("(jobs.title LIKE ? ESCAPE '\\' OR jobs.description LIKE ? ESCAPE '\\')")
+                pattern = _like_contains(word.rstrip("*"))
+                params += [pattern, pattern]
+        sql = f" FROM {source}" + (" WHERE " + " AND ".join(where) if where else "")
+        return sql, params, order
+
+    def query(self, city=None, contract=None, text=None, limit=None):
+        """Offres (dicts) filtrées, les plus pertinentes d'abord si `text` (plein texte titre + description)"""
+        sql, params, order = self._filters(city, contract, text)
+        sql = f"SELECT {', '.join('jobs.' + name for name in COLUMNS)}{sql} ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def count(self, city=None, contract=None, text=None):
+        """Nombre d'offres correspondant aux mêmes filtres que query()"""
+        sql, params, _ = self._filters(city, contract, text)
+        return self._conn.execute(f"SELECT COUNT(*){sql}", params).fetchone()[0]
+
+    def info(self):
+        """Métadonnées du dernier crawl enregistré ({} si la base est vide)"""
+        return {key: value for key, value in self._conn.execute("SELECT key, value FROM meta")}
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,180 @@
+"""Couche de parsing HTML interchangeable.
+
+Trois backends, du plus rapide au plus lent :
+    - "selectolax" (moteur lexbor, si le paquet est installé)
+    - "lxml"       (BeautifulSoup + lxml, si installé)
+    - "html.parser" (BeautifulSoup seul, toujours disponible)
+
+Le backend par défaut est le plus rapide disponible ; la variable
+d'environnement SCRAPER_PARSER permet d'en imposer un.
+
+L'extraction des champs est déclarative : un Schema associe à chaque champ un
+sélecteur CSS (+ attribut / transformation). Les sélecteurs sont compilés une
+seule fois puis appliqués à chaque bloc (article, carte, citation...) :
+
+    schema = Schema({'title': Field('h3 > a', attr='title'),
+                     'price': Field('p.price_color', transform=parse_price)})
+    doc = parse(resp.text)
+    books = [schema.extract(node) for node in select(doc, 'article.product_pod')]
+"""
+import os
+
+from . import telemetry
+
+# bs4 et soupsieve (~50 ms) ne sont importés qu'au premier document BeautifulSoup
+BeautifulSoup = None
+soupsieve = None
+
+
+def _load_soup():
+    global BeautifulSoup, soupsieve
+    if soupsieve is None:
+        from bs4 import BeautifulSoup as soup_class
+        import soupsieve as sv
+        BeautifulSoup, soupsieve = soup_class, sv
+    return soupsieve
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as _SelectolaxParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as _SelectolaxParser
+    except ImportError:
+        _SelectolaxParser = None
+
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+
+def available_backends():
+    backends = []
+    if _SelectolaxParser is not None:
+        backends.append("selectolax")
+    if HAS_LXML:
+        backends.append("lxml")
+    backends.append("html.parser")
+    return backends
+
+
+def default_backend():
+    wanted = os.environ.get("SCRAPER_PARSER")
+    backends = available_backends()
+    if wanted:
+        if wanted not in backends:
+            raise ValueError(f"Backend HTML indisponible : {wanted} (disponibles : {', '.join(backends)})")
+        return wanted
+    return backends[0]
+
+
+BACKEND = default_backend()
+
+
+def parse(html, backend=None):
+    """Parse une page et renvoie le noeud racine du backend choisi"""
+    backend = backend or BACKEND
+    with telemetry.stage("parse"):
+        if backend == "selectolax":
+            return _SelectolaxParser(html)
+        _load_soup()
+        return BeautifulSoup(html, backend)
+
+
+def _is_soup(node):
+    return hasattr(node, "find_all")
+
+
+# ----- Accès aux noeuds, quel que soit le backend -----
+def select(node, css):
+    if _is_soup(node):
+        return _load_soup().select(css, node)
+    return node.css(css)
+
+
+def select_one(node, css):
+    if _is_soup(node):
+        return _load_soup().select_one(css, node)
+    return node.css_first(css)
+
+
+def text(node):
+    if node is None:
+        return ""
+    if _is_soup(node):
+        return node.get_text().strip()
+    return node.text().strip()
+
+
+def attr(node, name, default=""):
+    if node is None:
+        return default
+    value = node.get(name) if _is_soup(node) else node.attributes.get(name)
+    if value is None:
+        return default
+    # BeautifulSoup renvoie une liste pour l'attribut class
+    return " ".join(value) if isinstance(value, list) else value
+
+
+# ----- Extraction déclarative -----
+class Field:
+    """Un champ à extraire : sélecteur CSS relatif au bloc, attribut ou texte
+
+    many=True renvoie la liste de toutes les correspondances ; match_text ne
+    garde que les noeuds dont le texte vaut exactement cette chaîne.
+    """
+
+    def __init__(self, css, attr=None, many=False, default="", transform=None, match_text=None):
+        self.css = css
+        self.attr = attr
+        self.many = many
+        self.default = default
+        self.transform = transform
+        self.match_text = match_text
+        self._compiled = None  # sélecteur soupsieve, compilé une seule fois au premier bloc BeautifulSoup
+
+    def _nodes(self, node):
+        if _is_soup(node):
+            if self._compiled is None:
+                self._compiled = _load_soup().compile(self.css)
+            if self.many or self.match_text is not None:
+                return self._compiled.select(node)
+            found = self._compiled.select_one(node)
+            return [found] if found is not None else []
+        if self.many or self.match_text is not None:
+            return node.css(self.css)
+        found = node.css_first(self.css)
+        return [found] if found is not None else []
+
+    def _value(self, node):
+        value = text(node) if self.attr is None else attr(node, self.attr)
+        return self.transform(value) if self.transform else value
+
+    def extract(self, node):
+        nodes = self._nodes(node)
+        if self.match_text is not None:
+            nodes = [n for n in nodes if text(n) == self.match_text]
+        if self.many:
+            return [self._value(n) for n in nodes]
+        if not nodes:
+            return self.default
+        return self._value(nodes[0])
+
+
+class Schema:
+    """Ensemble de champs appliqués en une passe à un bloc HTML"""
+
+    def __init__(self, fields):
+        self.fields = fields
+
+    def _extract(self, node):
+        return {name: field.extract(node) for name, field in self.fields.items()}
+
+    def extract(self, node):
+        with telemetry.stage("extract"):
+            return self._extract(node)
+
+    def extract_all(self, doc, css):
+        with telemetry.stage("extract"):
+            return [self._extract(node) for node in select(doc, css)]
@@ -0,0 +1,244 @@
+"""Pipeline téléchargement / parsing : des threads téléchargent le HTML brut dans
+une file bornée, un pool de processus le parse (le parsing est CPU et garde
+le GIL ; les processus utilisent tous les cœurs).
+
+La fonction de parsing reçoit (url, html) et renvoie une liste de dicts
+simples : seuls ces enregistrements reviennent au processus principal, jamais
+d'arbre HTML. Elle doit être définie au niveau d'un module (picklable) :
+
+    def parse_page(page_url, html):
+        doc = parsing.parse(html)
+        return [parse_job_card(card) for card in get_job_cards(doc)]
+
+    pipe = ParsePipeline(parse_page, fetch_workers=16, parse_workers=4, queue_size=64, batch_size=16)
+    for url, records in pipe.run(urls):   # dans l'ordre des URLs
+        ...
+    pipe.print_metrics()
+
+Les pages sont envoyées aux processus par lots (jusqu'à `batch_size` pages
+déjà en file) : l'aller-retour entre processus coûte plus cher que le parsing
+d'une petite page.
+
+Les résultats sont rendus dans l'ordre : une page lente retient toutes les
+suivantes. Aucun téléchargement ne part plus de `window` pages au-delà de la
+première page non rendue, ce qui borne la mémoire des résultats en attente
+(par défaut, deux fois ce que le pipeline peut contenir en vol).
+
+Les métriques indiquent où le pipeline attend : téléchargeurs bloqués sur la
+file pleine ou dispatcher en attente d'un processus libre (parsing trop lent),
+dispatcher en attente de HTML (réseau trop lent).
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from . import fetch
+
+_DONE = object()
+_WAKE = object()  # un lot vient de finir : le dispatcher peut rendre des résultats
+
+
+def _warm_up():
+    return os.getpid()
+
+
+def _parse_batch(parse_page, pages):
+    """Exécuté dans un processus : [(enregistrements, durée, erreur)] par page"""
+    results = []
+    for url, content, encoding in pages:
+        start = time.perf_counter()
+        try:
+            records, error = parse_page(url, content.decode(encoding or "utf-8", errors="replace")), None
+        except Exception as e:
+            records, error = [], f"{type(e).__name__}: {e}"
+        results.append((records, time.perf_counter() - start, error))
+    return results
+
+
+class PipelineMetrics:
+    """Compteurs du pipeline (thread-safe)"""
+
+    FIELDS = ("pages", "records", "errors", "bytes", "fetch_time", "fetch_blocked", "parse_time",
+              "batches", "starved", "pool_wait", "queue_samples", "queue_total", "queue_max")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {name: 0 for name in self.FIELDS}
+
+    def add(self, **deltas):
+        with self._lock:
+            for name, value in deltas.items():
+                self._values[name] += value
+
+    def sample_queue(self, depth):
+        with self._lock:
+            self._values["queue_samples"] += 1
+            self._values["queue_total"] += depth
+            self._values["queue_max"] = max(self._values["queue_max"], depth)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._values)
+
+
+class ParsePipeline:
+    def __init__(self, parse_page, fetch_workers=8, parse_workers=None, queue_size=64, batch_size=16, get=None,
+                 window=None):
+        self.parse_page = parse_page
+        self.fetch_workers = max(1, fetch_workers)
+        self.parse_workers = parse_workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.batch_size = max(1, batch_size)
+        # pages en vol : téléchargements + file + 2 lots par processus
+        in_flight = self.fetch_workers + queue_size + 2 * self.parse_workers * self.batch_size
+        self.window = max(1, window or 2 * in_flight)
+        self.get = get or fetch.get
+        self.metrics = PipelineMetrics()
+        self.elapsed = 0.0
+
+    # ----- Téléchargement (threads) -----
+    def _fetcher(self, jobs, jobs_lock, html_queue, gate, window_end):
+        try:
+            while True:
+                with jobs_lock:
+                    job = next(jobs, None)
+                if job is None:
+                    return
+                index, url = job
+                with gate:  # trop de résultats en attente derrière une page lente
+                    while index >= window_end[0]:
+                        gate.wait()
+                start = time.perf_counter()
+                try:
+                    resp = self.get(url)
+                    item = (index, url, resp.status_code, resp.content, resp.encoding)
+                except Exception as e:
+                    print(f"Erreur de téléchargement {url} : {e}")
+                    item = (index, url, None, b"", None)
+                fetched = time.perf_counter()
+                html_queue.put(item)  # bloque si la file est pleine : le parsing ne suit pas
+                self.metrics.add(fetch_time=fetched - start, fetch_blocked=time.perf_counter() - fetched,
+                                 bytes=len(item[3]))
+        finally:
+            html_queue.put(_DONE)
+
+    # ----- Parsing (processus) -----
+    def run(self, urls):
+        """Produit (url, enregistrements) pour chaque URL, dans l'ordre d'entrée"""
+        started = time.perf_counter()
+        html_queue = queue.Queue(maxsize=self.queue_size)
+        jobs = enumerate(urls)
+        jobs_lock = threading.Lock()
+        # au plus 2 lots par processus en attente : la mémoire reste bornée
+        slots = threading.BoundedSemaphore(self.parse_workers * 2)
+        pending = {}      # indice -> (url, future du lot ou None si erreur de téléchargement, position)
+        next_index = 0
+        finished = 0
+        gate = threading.Condition()
+        window_end = [self.window]  # premier indice qu'un téléchargeur ne peut pas encore prendre
+
+        def batch_done(_):
+            slots.release()
+            try:
+                html_queue.put_nowait(_WAKE)
+            except queue.Full:  # le dispatcher a déjà de quoi se réveiller
+                pass
+
+        try:
+            with ProcessPoolExecutor(max_workers=self.parse_workers) as pool:
+                # processus créés avant les threads de téléchargement (fork sans verrou tenu)
+                for future in [pool.submit(_warm_up) for _ in range(self.parse_workers)]:
+                    future.result()
+                fetchers = [threading.Thread(target=self._fetcher, args=(jobs, jobs_lock, html_queue, gate, window_end),
+                                            daemon=True)
+                            for _ in range(self.fetch_workers)]
+                for thread in fetchers:
+                    thread.start()
+
+                while finished < len(fetchers):
+                    wait_start = time.perf_counter()
+                    items = [html_queue.get()]
+                    self.metrics.add(starved=time.perf_counter() - wait_start)
+                    self.metrics.sample_queue(html_queue.qsize())
+                    # complète le lot avec les pages déjà arrivées, sans attendre
+                    while len(items) < self.batch_size:
+                        try:
+                            items.append(html_queue.get_nowait())
+                        except queue.Empty:
+                            break
+                    batch = []
+                    for item in items:
+                        if item is _DONE:
+                            finished += 1
+                            continue
+                        if item is _WAKE:
+                            continue
+                        index, url, status, content, encoding = item
+                        if status != 200:
+                            if status is not None:
+                                print(f"Erreur {status} pour {url}")
+                            self.metrics.add(errors=1)
+                            pending[index] = (url, None, 0)
+                        else:
+                            batch.append((index, url, content, encoding))
+                    if batch:
+                        wait_start = time.perf_counter()
+                        slots.acquire()
+                        self.metrics.add(pool_wait=time.perf_counter() - wait_start, batches=1)
+                        future = pool.submit(_parse_batch, self.parse_page,
+                                             [(url, content, encoding) for _, url, content, encoding in batch])
+                        future.add_done_callback(batch_done)
+                        for position, (index, url, _, _) in enumerate(batch):
+                            pending[index] = (url, future, position)
+                    # rend les résultats déjà prêts, dans l'ordre
+                    while next_index in pending and (pending[next_index][1] is None or pending[next_index][1].done()):
+                        yield self._result(*pending.pop(next_index))
+                        next_index += 1
+                    with gate:
+                        window_end[0] = next_index + self.window
+                        gate.notify_all()
+                while next_index in pending:
+                    yield self._result(*pending.pop(next_index))
+                    next_index += 1
+        finally:
+            with gate:  # arrêt anticipé : libère les téléchargeurs en attente
+                window_end[0] = float("inf")
+                gate.notify_all()
+            self.elapsed += time.perf_counter() - started
+
+    def _result(self, url, future, position):
+        if future is None:
+            return url, []
+        try:
+            records, parse_time, error = future.result()[position]
+        except Exception as e:  # processus mort, résultat non picklable...
+            records, parse_time, error = [], 0.0, f"{type(e).__name__}: {e}"
+        if error:
+            print(f"Erreur de parsing {url} : {error}")
+            self.metrics.add(errors=1)
+            return url, []
+        self.metrics.add(pages=1, records=len(records), parse_time=parse_time)
+        return url, records
+
+    # ----- Rapport -----
+    def print_metrics(self):
+        m = self.metrics.snapshot()
+        elapsed = self.elapsed or 1e-9
+        mean_depth = m["queue_total"] / m["queue_samples"] if m["queue_samples"] else 0
+        print(f"\nPipeline : {m['pages']} pages, {m['records']} enregistrements, {m['errors']} erreurs "
+              f"en {elapsed:.1f}s ({m['pages'] / elapsed:.1f} pages/s)")
+        print(f"  téléchargement : {self.fetch_workers} threads, {m['fetch_time']:.1f}s cumulées, "
+              f"{m['bytes'] / 1024:.0f} Ko, bloqués {m['fetch_blocked']:.1f}s sur la file pleine")
+        mean_batch = m["pages"] / m["batches"] if m["batches"] else 0
+        print(f"  parsing : {self.parse_workers} processus, {m['parse_time']:.1f}s cumulées, "
+              f"{m['batches']} lots ({mean_batch:.1f} pages en moyenne), "
+              f"file moyenne {mean_depth:.1f} / {self.queue_size} (max {m['queue_max']})")
+        print(f"  dispatcher : {m['starved']:.1f}s à attendre du HTML, "
+              f"{m['pool_wait']:.1f}s à attendre un processus libre")
+        parse_bound = m["fetch_blocked"] / self.fetch_workers + m["pool_wait"]
+        if parse_bound > m["starved"]:
+            print("  goulot : parsing (augmenter les processus de parsing)")
+        else:
+            print("  goulot : réseau (augmenter les threads de téléchargement)")
@@ -0,0 +1,283 @@
+"""Index inversé sur disque des citations : mots, tags et auteurs -> numéros de
+citation, construit au fil du crawl et interrogé sans tout recharger.
+
+    with QuoteIndexWriter("quotes_index") as writer:
+        for quote in iter_quotes(state):
+            writer.add(quote)                    # dict avec text, author_name, tags
+
+    index = QuoteIndex("quotes_index")
+    ids = index.search(words="life", tags=["love"], author="Albert Einstein")
+    index.get(ids[0])                            # une citation, relue depuis le disque
+    index.top("author", 10)                      # [(auteur, nb de citations), ...]
+    index.top("tag", 5, words="life")            # top-k restreint à une recherche
+
+    python -m Scraper search --tag love --word life --top author
+
+Chaque construction écrit une génération complète dans un sous-répertoire
+(gen-000001/, gen-000002/...) ; le fichier CURRENT nomme la génération
+active. Fichiers d'une génération :
+    quotes.jsonl   une citation par ligne (numéro = numéro de ligne)
+    offsets.bin    position de chaque ligne (uint64) : accès direct à une citation
+    postings.bin   listes de numéros croissants, écarts encodés en varint
+    terms.json     terme -> [position, longueur, nb de citations]
+Les termes sont préfixés par leur nature : "w:" mot, "t:" tag, "a:" auteur.
+Les listes restent encodées en mémoire pendant le crawl (1 octet par
+occurrence le plus souvent). À la fermeture, CURRENT est remplacé par un seul
+os.replace() : un lecteur voit l'ancienne génération ou la nouvelle, jamais
+un mélange, et un crawl interrompu laisse l'index précédent intact. La
+génération précédente est gardée pour les lecteurs qui viennent de lire
+CURRENT ; les plus anciennes sont supprimées.
+"""
+import argparse
+import heapq
+import json
+import mmap
+import os
+import re
+import shutil
+import sys
+import time
+from array import array
+from operator import itemgetter
+
+KINDS = {"word": "w:", "tag": "t:", "author": "a:"}
+WORD = re.compile(r"\w+")
+CURRENT = "CURRENT"
+GENERATION = re.compile(r"gen-(\d+)$")
+
+
+def tokenize(text):
+    """Mots distincts d'un texte, en minuscules"""
+    return set(WORD.findall(text.lower()))
+
+
+def encode_varint(value, out):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_postings(data):
+    """Écarts varint -> numéros de citation croissants"""
+    ids, current, delta, shift = [], 0, 0, 0
+    for byte in data:
+        delta |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            current += delta
+            ids.append(current)
+            delta = shift = 0
+    return ids
+
+
+def _generations(directory):
+    """Numéros des générations présentes dans le répertoire"""
+    found = (GENERATION.match(name) for name in os.listdir(directory))
+    return sorted(int(match.group(1)) for match in found if match)
+
+
+def current_path(directory):
+    """Répertoire de la génération active (le répertoire lui-même pour un index sans CURRENT)"""
+    try:
+        with open(os.path.join(directory, CURRENT), encoding="utf-8") as f:
+            return os.path.join(directory, f.read().strip())
+    except FileNotFoundError:
+        return directory
+
+
+class QuoteIndexWriter:
+    def __init__(self, directory):
+        self.directory = directory
+        self.count = 0
+        self._postings = {}  # terme -> [octets encodés, dernier numéro, nb de citations]
+        self._offsets = array("Q")
+        os.makedirs(directory, exist_ok=True)
+        # numéro jamais utilisé, même par une génération restée inachevée
+        self.generation = f"gen-{max(_generations(directory), default=0) + 1:06d}"
+        os.makedirs(self._path(""))
+        self._quotes = open(self._path("quotes.jsonl"), "wb")
+
+    def _path(self, name):
+        return os.path.join(self.directory, self.generation, name)
+
+    def add(self, quote):
+        """Indexe une citation (dict avec text, author_name, tags) ; renvoie son numéro"""
+        quote_id = self.count
+        author = quote.get("author_name") or ""
+        tags = list(quote.get("tags") or ())
+        self._offsets.append(self._quotes.tell())
+        line = json.dumps({"text": quote["text"], "author": author, "tags": tags}, ensure_ascii=False)
+        self._quotes.write(line.encode("utf-8") + b"\n")
+
+        terms = {"w:" + word for word in tokenize(quote["text"])}
+        terms.update("t:" + tag.lower() for tag in tags)
+        if author:
+            terms.add("a:" + author)
+        postings = self._postings
+        for term in terms:
+            entry = postings.get(term)
+            if entry is None:
+                entry = postings[term] = [bytearray(), 0, 0]
+            encode_varint(quote_id - entry[1], entry[0])
+            entry[1] = quote_id
+            entry[2] += 1
+        self.count += 1
+        return quote_id
+
+    def close(self):
+        self._quotes.close()
+        terms, position = {}, 0
+        with open(self._path("postings.bin"), "wb") as f:
+            for term, (data, _, df) in self._postings.items():
+                f.write(data)
+                terms[term] = [position, len(data), df]
+                position += len(data)
+        with open(self._path("offsets.bin"), "wb") as f:
+            if sys.byteorder == "big":
+                self._offsets.byteswap()  # fichier toujours en petit-boutiste
+            self._offsets.tofile(f)
+        with open(self._path("terms.json"), "w", encoding="utf-8") as f:
+            json.dump({"count": self.count, "terms": terms}, f, ensure_ascii=False)
+        # bascule atomique vers la nouvelle génération
+        current = os.path.join(self.directory, CURRENT)
+        previous = os.path.basename(current_path(self.directory))
+        with open(current + ".tmp", "w", encoding="utf-8") as f:
+            f.write(self.generation)
+        os.replace(current + ".tmp", current)
+        for number in _generations(self.directory):
+            name = f"gen-{number:06d}"
+            if name not in (self.generation, previous):
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._quotes.close()
+            shutil.rmtree(self._path(""), ignore_errors=True)
+        return False
+
+
+def _map(path):
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class QuoteIndex:
+    def __init__(self, directory):
+        self.directory = directory
+        path = current_path(directory)
+        with open(os.path.join(path, "terms.json"), encoding="utf-8") as f:
+            data = json.load(f)
+        self.count = data["count"]
+        self.terms = data["terms"]
+        self._postings = _map(os.path.join(path, "postings.bin"))
+        self._offsets = _map(os.path.join(path, "offsets.bin"))
+        self._quotes = _map(os.path.join(path, "quotes.jsonl"))
+        self._authors = None  # nom en minuscules -> terme, construit à la première recherche
+
+    def postings(self, term):
+        entry = self.terms.get(term)
+        if entry is None:
+            return []
+        position, length, _ = entry
+        return decode_postings(self._postings[position:position + length])
+
+    def _author_term(self, name):
+        term = "a:" + name
+        if term in self.terms:
+            return term
+        if self._authors is None:
+            self._authors = {t[2:].lower(): t for t in self.terms if t.startswith("a:")}
+        return self._authors.get(name.lower(), term)
+
+    def _query_terms(self, words=None, tags=(), author=None):
+        if isinstance(words, str):
+            words = [words]
+        terms = {"w:" + word for text in (words or ()) for word in tokenize(text)}
+        terms.update("t:" + tag.lower() for tag in tags or ())
+        if author:
+            terms.add(self._author_term(author))
+        return terms
+
+    def search(self, words=None, tags=(), author=None):
+        """Numéros des citations contenant tous les mots, tous les tags et de cet auteur"""
+        terms = self._query_terms(words, tags, author)
+        if not terms:
+            return list(range(self.count))
+        if any(term not in self.terms for term in terms):
+            return []
+        # de la liste la plus courte à la plus longue : l'intersection ne fait que rétrécir
+        ordered = sorted(terms, key=lambda term: self.terms[term][2])
+        result = self.postings(ordered[0])
+        for term in ordered[1:]:
+            if not result:
+                break
+            members = set(self.postings(term))
+            result = [quote_id for quote_id in result if quote_id in members]
+        return result
+
+    def get(self, quote_id):
+        start = int.from_bytes(self._offsets[8 * quote_id:8 * quote_id + 8], "little")
+        end = self._quotes.find(b"\n", start)
+        return json.loads(self._quotes[start:end])
+
+    def quotes(self, ids):
+        return [self.get(quote_id) for quote_id in ids]
+
+    def top(self, kind, k=10, words=None, tags=(), author=None):
+        """k auteurs / tags / mots les plus fréquents, parmi les citations d'une recherche si filtres"""
+        prefix = KINDS[kind]
+        candidates = [term for term in self.terms if term.startswith(prefix)]
+        if words or tags or author:
+            ids = set(self.search(words, tags, author))
+            counts = ((len(ids.intersection(self.postings(term))), term) for term in candidates) if ids else ()
+        else:
+            counts = ((self.terms[term][2], term) for term in candidates)
+        # à égalité, l'ordre d'apparition au crawl (comme Counter.most_common)
+        return [(term[len(prefix):], n) for n, term in heapq.nlargest(k, counts, key=itemgetter(0)) if n]
+
+    def close(self):
+        for data in (self._postings, self._offsets, self._quotes):
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recherche dans l'index des citations (tags, auteur, mots)")
+    parser.add_argument("--index", default="quotes_index",
+                        help="Répertoire de l'index (quotes_index : scra.py, quotes_full_index : scra-challange.py)")
+    parser.add_argument("--word", action="append", help="Mot(s) présents dans la citation (répétable)")
+    parser.add_argument("--tag", action="append", help="Tag de la citation (répétable)")
+    parser.add_argument("--author", help="Auteur (nom complet, casse ignorée)")
+    parser.add_argument("--top", choices=list(KINDS), help="Top-k des auteurs / tags / mots parmi les résultats")
+    parser.add_argument("-k", type=int, default=10, help="Taille du top")
+    parser.add_argument("--limit", type=int, default=5, help="Citations affichées")
+    args = parser.parse_args(argv)
+
+    index = QuoteIndex(args.index)
+    start = time.perf_counter()
+    ids = index.search(args.word, args.tag, args.author)
+    quotes = index.quotes(ids[:args.limit])
+    top = index.top(args.top, args.k, args.word, args.tag, args.author) if args.top else []
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(ids)} citations sur {index.count} (requête : {elapsed * 1000:.1f} ms)")
+    for quote in quotes:
+        print(f"  {quote['text']} — {quote['author']} [{', '.join(quote['tags'])}]")
+    if args.top:
+        print(f"\nTop {args.k} {args.top} :")
+        for label, n in top:
+            print(f"  {label}: {n}")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Enregistrements compacts pour les éléments scrapés gardés en mémoire.
+
+Un dict Python coûte ~200 à 650 octets plus ses clés ; une classe à
+__slots__ n'a ni dict d'instance ni table de hachage : 8 octets par champ.
+
+    book = Book(title="...", price=51.77, rating=3)
+    book['price'], book.get('stock'), book.update(details)   # comme un dict
+    df = to_frame(books, columns=['title', 'price'])         # sans dict intermédiaire
+
+Les sinks (sinks.py) acceptent directement ces enregistrements. Ils ne servent
+que là où des éléments restent en mémoire (Books_to_Scrape : liste des livres
+avant l'export) ; les scripts qui écrivent au fil du crawl (offres, citations)
+gardent des dicts, libérés dès qu'ils sont écrits. Voir
+benchmarks/bench_records.py pour la mémoire par livre comparée aux dicts.
+"""
+from operator import attrgetter
+
+
+class Record:
+    """Base : champs déclarés dans __slots__, None par défaut, accès façon dict"""
+
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs):
+        for name, value in zip(self.__slots__, args):
+            setattr(self, name, value)
+        for name in self.__slots__[len(args):]:
+            setattr(self, name, kwargs.pop(name, None))
+        if kwargs:
+            raise TypeError(f"{type(self).__name__} : champs inconnus {sorted(kwargs)}")
+
+    @classmethod
+    def from_dict(cls, data):
+        """Construit depuis un dict (les clés inconnues sont ignorées)"""
+        return cls(*[data.get(name) for name in cls.__slots__])
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def update(self, data):
+        for name, value in data.items():
+            setattr(self, name, value)
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def __setitem__(self, name, value):
+        setattr(self, name, value)
+
+    def get(self, name, default=None):
+        return getattr(self, name, default)
+
+    def keys(self):
+        return list(self.__slots__)
+
+    def __eq__(self, other):
+        return type(other) is type(self) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class Book(Record):
+    __slots__ = ('title', 'price', 'rating', 'stock', 'url', 'detail_url', 'category',
+                 'main_category', 'sub_category', 'description', 'img_url')
+
+
+# ----- DataFrames -----
+def to_frame(records, columns=None):
+    """DataFrame construit ligne à ligne depuis les attributs (pas de dict par ligne)"""
+    import pandas as pd  # import tardif : les scripts qui n'en ont pas besoin démarrent vite
+    if not records:
+        return pd.DataFrame(columns=columns)
+    columns = list(columns or records[0].__slots__)
+    if len(columns) == 1:
+        return pd.DataFrame({columns[0]: [getattr(r, columns[0]) for r in records]})
+    return pd.DataFrame.from_records(list(map(attrgetter(*columns), records)), columns=columns)
+
@@ -0,0 +1,248 @@
+"""Rapports de graphiques headless : rendu Agg sans pyplot, en parallèle, avec cache.
+
+Un graphique est décrit par un ChartSpec qui ne contient que des agrégats :
+classes d'un histogramme, valeurs par groupe, nuage de points échantillonné.
+Le tracé ne dépend plus du nombre de lignes du catalogue, seulement de ces
+quelques centaines de valeurs.
+
+    charts = [
+        report.histogram_chart("prix", df['price'], bins=20, title="Distribution des prix"),
+        report.bar_chart("prix_note", avg_price_by_rating, title="Prix moyen par note"),
+        report.scatter_chart("note_prix", df['rating'], df['price'], groups=df['category']),
+    ]
+    result = report.build_pdf("books_report.pdf", charts, workers=4)
+    report.write_html("books_report.html", charts)      # plotly, si installé
+
+Chaque graphique est rendu en PNG dans `cache_dir`, sous une clé calculée à
+partir de ses agrégats et de ses options : un graphique inchangé depuis le
+run précédent est repris tel quel, seuls les autres sont redessinés (dans un
+pool de processus s'il y en a plusieurs). Le PDF assemble les images du cache,
+une page par graphique ; il n'est pas réécrit si aucune page n'a changé.
+
+Compromis : les pages du PDF sont ces images matricielles (DPI = 150), pas
+des tracés vectoriels. Assembler le PDF depuis le cache suppose de recopier
+des pages déjà rendues ; matplotlib ne sait pas relire une page PDF et la
+fusion de PDF vectoriels demanderait une dépendance de plus (pypdf). Le zoom
+et la sélection de texte sont donc perdus ; augmenter DPI (et RENDER_VERSION)
+donne des pages plus nettes mais plus lourdes.
+
+matplotlib n'est importé qu'au rendu, par l'API objet (Figure + canvas Agg) :
+aucune fenêtre, aucun état global pyplot, utilisable sans affichage.
+"""
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+DEFAULT_CACHE_DIR = "report_cache"
+DPI = 150
+MAX_POINTS = 5000  # points gardés pour un nuage (tirage déterministe)
+RENDER_VERSION = 1  # à incrémenter si le tracé change : invalide le cache
+
+
+class ChartSpec:
+    """Graphique prêt à tracer : type, agrégats (listes simples) et options d'affichage"""
+
+    __slots__ = ("name", "kind", "data", "options")
+
+    def __init__(self, name, kind, data, options):
+        self.name = name
+        self.kind = kind
+        self.data = data
+        self.options = options
+
+    def key(self):
+        """Empreinte des agrégats et des options : clé du cache"""
+        payload = json.dumps([RENDER_VERSION, self.kind, self.data, self.options], sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:20]
+
+
+def _options(title, xlabel, ylabel, color, figsize, **extra):
+    return {"title": title, "xlabel": xlabel, "ylabel": ylabel, "color": color, "figsize": list(figsize), **extra}
+
+
+def histogram_chart(name, values, bins=20, title="", xlabel="", ylabel="", color=None, figsize=(6, 4)):
+    """Histogramme : les classes sont calculées ici (numpy), le tracé ne voit que les effectifs"""
+    import numpy as np
+    values = np.asarray(values, dtype="float64")
+    values = values[np.isfinite(values)]
+    counts, edges = np.histogram(values, bins=bins)
+    data = {"counts": counts.tolist(), "edges": edges.tolist()}
+    return ChartSpec(name, "hist", data, _options(title, xlabel, ylabel, color, figsize))
+
+
+def bar_chart(name, series, title="", xlabel="", ylabel="", color=None, figsize=(6, 4)):
+    """Barres à partir d'une Series déjà agrégée (une barre par entrée de l'index)"""
+    data = {"labels": [str(label) for label in series.index], "values": [float(v) for v in series.to_numpy()]}
+    return ChartSpec(name, "bar", data, _options(title, xlabel, ylabel, color, figsize))
+
+
+def sample_indices(n, max_points=MAX_POINTS, seed=0):
+    """Positions (croissantes) d'un tirage sans remise de max_points parmi n, None si n <= max_points"""
+    if n <= max_points:
+        return None
+    import numpy as np
+    return np.sort(np.random.default_rng(seed).choice(n, max_points, replace=False))
+
+
+def scatter_chart(name, x, y, groups=None, hover=None, max_points=MAX_POINTS,
+                  title="", xlabel="", ylabel="", color=None, figsize=(6, 4), alpha=0.6):
+    """Nuage de points, échantillonné à max_points au-delà (même tirage d'un run à l'autre)
+
+    `groups` (couleur) et `hover` (texte au survol) ne servent qu'au rapport
+    interactif ; le nombre total de points est gardé dans les options.
+    """
+    import numpy as np
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    keep = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    sample = sample_indices(len(keep), max_points)
+    if sample is not None:
+        keep = keep[sample]
+    data = {"x": x[keep].tolist(), "y": y[keep].tolist()}
+    for column, values in (("groups", groups), ("hover", hover)):
+        if values is not None:
+            data[column] = [None if v is None or v != v else str(v) for v in np.asarray(values, dtype=object)[keep]]
+    options = _options(title, xlabel, ylabel, color, figsize, alpha=alpha, total=int(np.isfinite(x).sum()))
+    return ChartSpec(name, "scatter", data, options)
+
+
+def _draw(spec, fig):
+    options = spec.options
+    data = spec.data
+    ax = fig.add_subplot()
+    if spec.kind == "hist":
+        edges = data["edges"]
+        # mêmes barres que plt.hist sur les valeurs brutes : une par classe, pondérée par son effectif
+        ax.hist(edges[:-1], bins=edges, weights=data["counts"], color=options["color"])
+    elif spec.kind == "bar":
+        positions = range(len(data["values"]))
+        ax.bar(positions, data["values"], color=options["color"])
+        ax.set_xticks(list(positions), data["labels"], rotation=90)
+    elif spec.kind == "scatter":
+        ax.scatter(data["x"], data["y"], alpha=options["alpha"], color=options["color"])
+    else:
+        raise ValueError(f"Type de graphique inconnu : {spec.kind}")
+    ax.set_title(options["title"])
+    ax.set_xlabel(options["xlabel"])
+    ax.set_ylabel(options["ylabel"])
+    fig.tight_layout()
+
+
+def render_png(spec, path):
+    """Rend un graphique en PNG (Agg) ; écriture atomique. Exécutable dans un processus du pool"""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = Figure(figsize=spec.options["figsize"], dpi=DPI)
+    FigureCanvasAgg(fig)
+    _draw(spec, fig)
+    tmp = path + ".tmp"
+    fig.savefig(tmp, format="png", dpi=DPI)
+    os.replace(tmp, path)
+    return path
+
+
+def render(charts, cache_dir=DEFAULT_CACHE_DIR, workers=None):
+    """PNG de chaque graphique, dans l'ordre -> (chemins, nombre de graphiques redessinés)
+
+    Les graphiques déjà en cache (même clé) ne sont pas redessinés ; les
+    anciennes images d'un graphique dont les données ont changé sont supprimées.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    paths = [os.path.join(cache_dir, f"{spec.name}-{spec.key()}.png") for spec in charts]
+    missing = [(spec, path) for spec, path in zip(charts, paths) if not os.path.exists(path)]
+    workers = min(workers or os.cpu_count() or 1, len(missing))
+    if workers > 1:
+        import matplotlib.figure  # chargé avant le fork : les processus en héritent
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(render_png, *zip(*missing)))
+    else:
+        for spec, path in missing:
+            render_png(spec, path)
+
+    current = set(paths)
+    names = {spec.name for spec in charts}
+    for filename in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, filename)
+        if filename.endswith(".png") and filename.rsplit("-", 1)[0] in names and path not in current:
+            os.remove(path)
+    return paths, len(missing)
+
+
+def build_pdf(path, charts, cache_dir=DEFAULT_CACHE_DIR, workers=None):
+    """Rapport PDF (une page par graphique) à partir des images du cache
+
+    Renvoie {"pages", "rendered", "reused", "written", "seconds"} ; le PDF
+    n'est réécrit que si une page a changé ou s'il n'existe pas.
+    """
+    start = time.perf_counter()
+    paths, rendered = render(charts, cache_dir, workers)
+    report_key = hashlib.sha1("".join(paths).encode("utf-8")).hexdigest()
+    key_file = os.path.join(cache_dir, os.path.basename(path) + ".key")
+    written = False
+    previous = None
+    if os.path.exists(key_file):
+        with open(key_file, encoding="utf-8") as f:
+            previous = f.read()
+    if previous != report_key or not os.path.exists(path):
+        _assemble_pdf(path, paths)
+        with open(key_file, "w", encoding="utf-8") as f:
+            f.write(report_key)
+        written = True
+    return {"pages": len(paths), "rendered": rendered, "reused": len(paths) - rendered,
+            "written": written, "seconds": time.perf_counter() - start}
+
+
+def _assemble_pdf(path, images):
+    from matplotlib.figure import Figure
+    from matplotlib.image import imread
+    from matplotlib.backends.backend_pdf import PdfPages
+    tmp = path + ".tmp"
+    with PdfPages(tmp) as pdf:
+        for image_path in images:
+            image = imread(image_path)
+            height, width = image.shape[:2]
+            fig = Figure(figsize=(width / DPI, height / DPI), dpi=DPI)
+            ax = fig.add_axes((0, 0, 1, 1))
+            ax.imshow(image, interpolation="none")
+            ax.set_axis_off()
+            pdf.savefig(fig)
+    os.replace(tmp, path)
+
+
+def write_html(path, charts):
+    """Version interactive (plotly) des mêmes graphiques, sur les mêmes agrégats
+
+    Renvoie False si plotly n'est pas installé.
+    """
+    try:
+        import plotly.graph_objects as go
+    except ImportError:
+        return False
+    parts = []
+    for spec in charts:
+        data, options = spec.data, spec.options
+        if spec.kind == "hist":
+            edges = data["edges"]
+            centers = [(a + b) / 2 for a, b in zip(edges, edges[1:])]
+            fig = go.Figure(go.Bar(x=centers, y=data["counts"], width=[b - a for a, b in zip(edges, edges[1:])]))
+        elif spec.kind == "bar":
+            fig = go.Figure(go.Bar(x=data["labels"], y=data["values"]))
+        else:
+            fig = go.Figure()
+            groups = data.get("groups") or [None] * len(data["x"])
+            hover = data.get("hover")
+            by_group = {}
+            for i, group in enumerate(groups):
+                by_group.setdefault(group, []).append(i)
+            for group, rows in by_group.items():
+                fig.add_trace(go.Scattergl(
+                    x=[data["x"][i] for i in rows], y=[data["y"][i] for i in rows], mode="markers",
+                    name=group or "—", opacity=options["alpha"],
+                    text=[hover[i] for i in rows] if hover else None))
+        fig.update_layout(title=options["title"], xaxis_title=options["xlabel"], yaxis_title=options["ylabel"])
+        parts.append(fig.to_html(full_html=False, include_plotlyjs="cdn" if not parts else False))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("<html><head><meta charset='utf-8'></head><body>\n" + "\n".join(parts) + "\n</body></html>\n")
+    return True
@@ -0,0 +1,297 @@
+"""Ordonnanceur de politesse par hôte : débit limité (token bucket), crawl-delay
+de robots.txt et concurrence adaptative AIMD.
+
+Pour chaque hôte :
+    - un seau à jetons espace les requêtes (rate requêtes/s, rafale `burst`) ;
+      le Crawl-delay / Request-rate de robots.txt abaisse ce débit ;
+    - le nombre de requêtes simultanées augmente de 1 par « fenêtre » tant que
+      la latence et le taux d'erreur restent sains (additive increase), et est
+      divisé par deux sur 429/503, Retry-After ou latence dégradée
+      (multiplicative decrease) ; comme TCP, seules les requêtes parties après
+      la dernière réduction peuvent en déclencher une autre ;
+    - un Retry-After suspend l'hôte jusqu'à l'échéance.
+
+Branché dans fetch.get() via fetch.enable_scheduler() :
+
+    fetch.enable_scheduler(rate=5, max_concurrency=16)
+    resp = fetch.get(url)     # attend son tour pour cet hôte
+    fetch.print_stats()       # inclut l'état de chaque hôte
+"""
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib import robotparser
+from urllib.parse import urlsplit
+
+THROTTLE_STATUS = (429, 503)
+INITIAL_CONCURRENCY = 2
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 16
+DECREASE_FACTOR = 0.5       # multiplicative decrease
+LATENCY_FACTOR = 3.0        # latence lissée > 3 x la meilleure observée = saturation...
+LATENCY_SLACK = 0.1         # ... et au moins 100 ms de plus (évite le bruit en local)
+MAX_ERROR_RATE = 0.2        # taux d'erreur lissé au-delà duquel on réduit
+EWMA_ALPHA = 0.2
+PROBE_STEP = 0.1            # croissance ralentie près de la concurrence qui a déjà saturé l'hôte
+DEFAULT_PAUSE = 1.0         # pause sur 429/503 sans Retry-After (secondes)
+MAX_PAUSE = 300.0
+
+
+def parse_retry_after(value):
+    """Retry-After en secondes (nombre ou date HTTP), None si absent/illisible"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_crawl_delay(lines, user_agent):
+    """Crawl-delay (secondes, décimales acceptées) du groupe robots.txt qui s'applique
+
+    urllib.robotparser ignore les délais non entiers (« Crawl-delay: 0.5 ») ;
+    le groupe propre à l'agent prime sur « * ».
+    """
+    agent = user_agent.lower()
+    delays = {}
+    group, in_rules = [], False
+    for line in lines:
+        line = line.split("#", 1)[0].strip()
+        if ":" not in line:
+            continue
+        key, value = (part.strip() for part in line.split(":", 1))
+        key = key.lower()
+        if key == "user-agent":
+            if in_rules:
+                group, in_rules = [], False
+            group.append(value.lower())
+            continue
+        in_rules = True
+        if key == "crawl-delay":
+            try:
+                delay = float(value)
+            except ValueError:
+                continue
+            for name in group:
+                delays.setdefault(name, delay)
+    specific = [d for name, d in delays.items() if name != "*" and name in agent]
+    if specific:
+        return specific[0]
+    return delays.get("*")
+
+
+class TokenBucket:
+    """Seau à jetons par réservation : renvoie le temps d'attente avant d'envoyer"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def reserve(self, now):
+        now = max(now, self.updated)
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class HostState:
+    """Débit, concurrence et santé d'un hôte"""
+
+    def __init__(self, host, rate=None, burst=1, initial=INITIAL_CONCURRENCY, max_concurrency=MAX_CONCURRENCY):
+        self.host = host
+        self.rate = rate
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.burst = burst
+        self.limit = float(min(initial, max_concurrency))
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.latency = None        # moyenne lissée (EWMA)
+        self.best_latency = None
+        self.error_rate = 0.0
+        self.last_decrease = 0.0
+        self.ceiling = None        # concurrence au dernier ralentissement
+        self.crawl_delay = None
+        self.requests = 0
+        self.throttled = 0
+        self.peak = 0
+        self.robots_loaded = False
+        self.robots_lock = threading.Lock()
+        self._cond = threading.Condition()
+
+    # ----- robots.txt -----
+    def apply_robots(self, parser, delay, user_agent):
+        rate = parser.request_rate(user_agent)
+        robots_rate = None
+        if delay:
+            self.crawl_delay = float(delay)
+            robots_rate = 1 / self.crawl_delay
+        if rate and rate.seconds:
+            robots_rate = min(robots_rate or float("inf"), rate.requests / rate.seconds)
+        if robots_rate and (self.rate is None or robots_rate < self.rate):
+            with self._cond:
+                self.rate = robots_rate
+                self.bucket = TokenBucket(robots_rate, self.burst)
+
+    # ----- Créneaux -----
+    def acquire(self):
+        """Attend un créneau (concurrence, pause, jeton) ; renvoie l'instant d'envoi"""
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            now = time.monotonic()
+            start = max(now, self.paused_until)
+            if self.bucket is not None:
+                start += self.bucket.reserve(start)
+        if start > now:
+            time.sleep(start - now)
+        return start
+
+    def release(self, sent_at, status, latency=None, retry_after=None, throttled=False):
+        """Fin d'une requête : ajuste la concurrence (AIMD) et la pause de l'hôte
+
+        status=None signale une exception réseau ; throttled=True qu'un 429/503
+        a été reçu puis retenté en interne par urllib3.
+        """
+        with self._cond:
+            self.in_flight -= 1
+            self.requests += 1
+            now = time.monotonic()
+            failed = status is None or status >= 500
+            self.error_rate += EWMA_ALPHA * ((1.0 if failed else 0.0) - self.error_rate)
+            if throttled or status in THROTTLE_STATUS:
+                self.throttled += 1
+                pause = retry_after if retry_after is not None else DEFAULT_PAUSE
+                self.paused_until = max(self.paused_until, now + min(pause, MAX_PAUSE))
+                self._decrease(sent_at, now)
+            elif failed:
+                if self.error_rate > MAX_ERROR_RATE:
+                    self._decrease(sent_at, now)
+            elif latency is not None:
+                self.best_latency = latency if self.best_latency is None else min(self.best_latency, latency)
+                self.latency = latency if self.latency is None else self.latency + EWMA_ALPHA * (latency - self.latency)
+                if self.latency > max(self.best_latency * LATENCY_FACTOR, self.best_latency + LATENCY_SLACK):
+                    self._decrease(sent_at, now)
+                elif self.in_flight + 1 >= int(self.limit):
+                    # +1 créneau par fenêtre complète de réponses saines, si la fenêtre est utilisée ;
+                    # prudemment à l'approche du plafond déjà rencontré
+                    step = 1 / self.limit
+                    if self.ceiling is not None and self.limit + 1 >= self.ceiling:
+                        step *= PROBE_STEP
+                    self.limit = min(self.max_concurrency, self.limit + step)
+            self._cond.notify_all()
+
+    def _decrease(self, sent_at, now):
+        if sent_at < self.last_decrease:
+            return  # requête partie avant la dernière réduction : même épisode de surcharge
+        self.ceiling = self.limit
+        self.limit = max(MIN_CONCURRENCY, self.limit * DECREASE_FACTOR)
+        self.last_decrease = now
+
+    def snapshot(self):
+        with self._cond:
+            return {
+                "host": self.host,
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "limit": self.limit,
+                "peak": self.peak,
+                "rate": self.rate,
+                "crawl_delay": self.crawl_delay,
+                "latency": self.latency,
+                "error_rate": self.error_rate,
+            }
+
+
+class HostScheduler:
+    """Un HostState par hôte, créé à la première requête (robots.txt lu à ce moment)
+
+    robots_fetcher(url) -> réponse (status_code, text) ou None pour ignorer
+    robots.txt. Une réponse 429/503 est renvoyée en file (après la pause de
+    l'hôte) jusqu'à `retries` fois.
+    """
+
+    def __init__(self, rate=None, burst=1, initial_concurrency=INITIAL_CONCURRENCY,
+                 max_concurrency=MAX_CONCURRENCY, robots_fetcher=None, user_agent="*", retries=3):
+        self.rate = rate
+        self.burst = burst
+        self.initial_concurrency = initial_concurrency
+        self.max_concurrency = max_concurrency
+        self.robots_fetcher = robots_fetcher
+        self.user_agent = user_agent
+        self.retries = retries
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def host_state(self, url):
+        parts = urlsplit(url)
+        with self._lock:
+            state = self._hosts.get(parts.netloc)
+            if state is None:
+                state = HostState(parts.netloc, self.rate, self.burst, self.initial_concurrency, self.max_concurrency)
+                self._hosts[parts.netloc] = state
+        if not state.robots_loaded:
+            with state.robots_lock:
+                if not state.robots_loaded:
+                    self._load_robots(state, f"{parts.scheme}://{parts.netloc}/robots.txt")
+                    state.robots_loaded = True
+        return state
+
+    def _load_robots(self, state, robots_url):
+        if self.robots_fetcher is None:
+            return
+        try:
+            resp = self.robots_fetcher(robots_url)
+        except Exception as e:
+            print(f"robots.txt illisible pour {state.host} : {e}")
+            return
+        if resp is None or resp.status_code != 200:
+            return
+        lines = resp.text.splitlines()
+        parser = robotparser.RobotFileParser(robots_url)
+        parser.parse(lines)
+        state.apply_robots(parser, parse_crawl_delay(lines, self.user_agent), self.user_agent)
+
+    def run(self, url, send):
+        """Exécute send() quand l'hôte de `url` le permet, puis met à jour son état"""
+        state = self.host_state(url)
+        for attempt in range(self.retries + 1):
+            sent_at = state.acquire()
+            start = time.perf_counter()
+            try:
+                resp = send()
+            except Exception:
+                state.release(sent_at, None)
+                raise
+            retries = resp.raw.retries.history if getattr(resp.raw, "retries", None) else ()
+            throttled = any(r.status in THROTTLE_STATUS for r in retries)
+            # une réponse retentée inclut les pauses de backoff : sa durée n'est pas une latence
+            latency = None if retries else time.perf_counter() - start
+            retry_after = parse_retry_after(resp.headers.get("Retry-After")) if resp.status_code in THROTTLE_STATUS else None
+            state.release(sent_at, resp.status_code, latency, retry_after, throttled)
+            if resp.status_code not in THROTTLE_STATUS:
+                break
+        return resp
+
+    def snapshot(self):
+        with self._lock:
+            hosts = list(self._hosts.values())
+        return [state.snapshot() for state in hosts]
+
+    def print_summary(self):
+        for s in self.snapshot():
+            rate = f"{s['rate']:.2f} req/s" if s['rate'] else "illimité"
+            delay = f", crawl-delay {s['crawl_delay']:g}s" if s['crawl_delay'] else ""
+            latency = f"{1000 * s['latency']:.0f} ms" if s['latency'] is not None else "-"
+            print(f"  {s['host']} : {s['requests']} requêtes, {s['throttled']} ralentissements, "
+                  f"concurrence {s['limit']:.1f} (pic {s['peak']}), débit {rate}{delay}, latence {latency}")
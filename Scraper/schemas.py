@@ -0,0 +1,126 @@
+"""Schémas typés (pyarrow) des jeux de données scrapés + lecture/écriture
+Parquet et Arrow IPC.
+
+Les colonnes numériques sont typées une fois pour toutes (prix en float64,
+note en int8, stock en int32), les colonnes très répétitives (catégorie,
+ville, type de contrat, auteur) sont encodées en dictionnaire et les tags sont
+des listes. Les analyses rechargent ensuite les fichiers sans ré-inférer les
+types :
+
+    schemas.write_table(df, "books_by_category.parquet", schemas.BOOK_FIELDS)
+    df = schemas.read_table("books_by_category.parquet")
+
+Un fichier Arrow IPC (.arrow) écrit avec compression="uncompressed" est relu
+en memory-map sans copie ; compressé (lz4 par défaut), il est décompressé à la
+lecture.
+"""
+import os
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow est optionnel : seuls les exports typés en dépendent
+    pa = None
+    pq = None
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("Les formats Parquet/Arrow nécessitent pyarrow (pip install pyarrow)")
+
+
+def _types():
+    _require_pyarrow()
+    category = pa.dictionary(pa.int32(), pa.string())
+    return {
+        "string": pa.string(),
+        "category": category,
+        "float": pa.float64(),
+        "int8": pa.int8(),
+        "int32": pa.int32(),
+        "tags": pa.list_(category),
+    }
+
+
+# Catalogue des champs connus par jeu de données : nom -> type logique.
+# Un fichier n'utilise que les colonnes réellement présentes (voir schema_for).
+BOOK_FIELDS = {
+    "category": "category",
+    "main_category": "category",
+    "sub_category": "category",
+    "title": "string",
+    "price": "float",
+    "rating": "int8",
+    "stock": "int32",
+    "url": "string",
+    "detail_url": "string",
+    "description": "string",
+    "img_url": "string",
+}
+
+JOB_FIELDS = {
+    "title": "string",
+    "company": "string",
+    "location": "category",
+    "date_posted": "string",
+    "apply_url": "string",
+    "description": "string",
+    "contract_type": "category",
+}
+
+QUOTE_FIELDS = {
+    "text": "string",
+    "author_name": "category",
+    "author_url": "category",
+    "tags": "tags",
+}
+
+
+def schema_for(fields, columns):
+    """Schéma pyarrow limité aux `columns` présentes, dans leur ordre"""
+    types = _types()
+    return pa.schema([(name, types[fields.get(name, "string")]) for name in columns])
+
+
+def to_arrow(data, fields):
+    """DataFrame ou liste de dicts -> pa.Table typée selon `fields`"""
+    _require_pyarrow()
+    if isinstance(data, list):
+        columns = list(data[0].keys()) if data else list(fields)
+        return pa.Table.from_pylist(data, schema=schema_for(fields, columns))
+    # les colonnes imbriquées non décrites (ex. author_details) sont ignorées
+    columns = [c for c in data.columns if c in fields]
+    return pa.Table.from_pandas(data[columns], schema=schema_for(fields, columns), preserve_index=False)
+
+
+def write_table(data, path, fields, compression=None):
+    """Écrit en .parquet (zstd par défaut) ou .arrow/.feather (Arrow IPC, lz4 par défaut)"""
+    table = to_arrow(data, fields)
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".parquet":
+        pq.write_table(table, path, compression=compression or "zstd")
+    elif ext in (".arrow", ".feather", ".ipc"):
+        codec = None if compression == "uncompressed" else (compression or "lz4")
+        options = pa.ipc.IpcWriteOptions(compression=codec)
+        with pa.OSFile(path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+                writer.write_table(table)
+    else:
+        raise ValueError(f"Format typé inconnu : {path}")
+    return table
+
+
+def read_arrow(path, columns=None):
+    """Relit un fichier typé en pa.Table (memory-map pour Parquet et Arrow IPC)"""
+    _require_pyarrow()
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".parquet":
+        return pq.read_table(path, columns=columns, memory_map=True)
+    # le fichier reste mappé tant que la table (qui référence ses buffers) existe
+    table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+    return table.select(columns) if columns else table
+
+
+def read_table(path, columns=None):
+    """Relit un fichier typé en DataFrame (catégories -> dtype category, note -> int8)"""
+    return read_arrow(path, columns).to_pandas()
@@ -0,0 +1,248 @@
+"""Client SerpAPI par lots : requêtes en parallèle, pagination, cache compressé
+et résultats normalisés en une seule table dédupliquée.
+
+    queries = read_queries("queries.txt")        # "amazon iphone 15" ou une ligne JSON de paramètres
+    client = SerpClient(api_key, cache=SerpCache("serp_cache.sqlite"), pages=3)
+    seen = set()
+    for query, page, response in client.run(queries, workers=4):
+        for row in unique_rows(normalize(query, page, response), seen):
+            sink.write(row)
+
+Le cache garde chaque réponse JSON compressée (zlib), indexée par l'empreinte
+de ses paramètres (clé d'API exclue) : une requête déjà faite ne consomme pas
+de crédit tant que l'entrée a moins de `ttl` secondes. Les erreurs ne sont
+pas mises en cache.
+
+Les appels passent par fetch.get() (session partagée, retry sur 5xx) ; le
+débit vers l'API se règle avec l'ordonnanceur par hôte de fetch, un hôte
+correspondant à une API :
+
+    fetch.enable_scheduler(rate=5, max_concurrency=4, robots=False)
+
+Les pages d'une même requête se suivent (lien serpapi_pagination.next),
+les requêtes distinctes partent en parallèle. `endpoint` permet de viser un
+serveur local (benchmarks/fake_sites.py sert /serp/search.json).
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+from . import fetch, telemetry
+
+ENDPOINT = "https://serpapi.com/search.json"
+DEFAULT_TTL = 7 * 24 * 3600  # secondes
+# paramètre portant le texte recherché, par moteur ("q" sinon)
+QUERY_PARAMS = {"amazon": "k", "ebay": "_nkw", "walmart": "query", "home_depot": "q", "google_play": "q"}
+# listes de résultats reconnues dans une réponse, dans cet ordre
+RESULT_KEYS = ("organic_results", "shopping_results", "apps", "jobs_results", "local_results")
+ID_FIELDS = ("asin", "product_id", "item_id", "job_id", "place_id", "app_id")
+ROW_COLUMNS = ['engine', 'query', 'page', 'position', 'id', 'title', 'link', 'price', 'rating', 'reviews']
+# paramètres exclus de la clé du cache (n'influent pas sur la réponse)
+UNCACHED_PARAMS = ("api_key", "output", "no_cache", "async")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key       TEXT PRIMARY KEY,
+    params    TEXT NOT NULL,
+    body      BLOB NOT NULL,
+    stored_at REAL NOT NULL
+);
+"""
+
+
+def cache_key(params):
+    """Empreinte stable des paramètres d'une requête (ordre et clé d'API ignorés)"""
+    kept = sorted((str(k), str(v)) for k, v in params.items() if k not in UNCACHED_PARAMS)
+    return hashlib.sha1(json.dumps(kept).encode("utf-8")).hexdigest()
+
+
+class SerpCache:
+    """Réponses SerpAPI sur disque (JSON compressé), partageable entre threads"""
+
+    def __init__(self, path, ttl=DEFAULT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, params):
+        """Réponse (dict) encore valable pour ces paramètres, None sinon"""
+        with self._lock:
+            row = self._conn.execute("SELECT body, stored_at FROM responses WHERE key = ?",
+                                     (cache_key(params),)).fetchone()
+        if row is None or (self.ttl is not None and time.time() - row[1] >= self.ttl):
+            return None
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, params, response):
+        public = {k: v for k, v in params.items() if k not in UNCACHED_PARAMS}
+        body = zlib.compress(json.dumps(response, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 6)
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                               (cache_key(params), json.dumps(public, sort_keys=True), body, time.time()))
+            self._conn.commit()
+
+    def info(self):
+        """(nombre de réponses, octets compressés)"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(body)), 0) FROM responses").fetchone()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def parse_query_line(line):
+    """Une ligne du fichier de requêtes -> paramètres, None si vide ou commentaire
+
+    "amazon iphone 15" donne {"engine": "amazon", "k": "iphone 15"} ; une ligne
+    commençant par "{" est un objet JSON de paramètres SerpAPI complet.
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    if line.startswith("{"):
+        return json.loads(line)
+    engine, _, text = line.partition(" ")
+    return {"engine": engine, QUERY_PARAMS.get(engine, "q"): text.strip()}
+
+
+def read_queries(path):
+    with open(path, encoding="utf-8") as f:
+        return [params for params in map(parse_query_line, f) if params is not None]
+
+
+def query_text(params):
+    return params.get(QUERY_PARAMS.get(params.get("engine"), "q")) or params.get("q") or ""
+
+
+def next_page_params(params, response):
+    """Paramètres de la page suivante d'après serpapi_pagination.next, None s'il n'y en a pas"""
+    pagination = response.get("serpapi_pagination") or response.get("pagination") or {}
+    next_url = pagination.get("next")
+    if not next_url:
+        return None
+    # on garde notre endpoint et notre clé : seuls les paramètres du lien sont repris
+    return {**params, **dict(parse_qsl(urlsplit(next_url).query))}
+
+
+class SerpClient:
+    """Exécute des requêtes SerpAPI (cache d'abord) ; compteurs dans `stats`"""
+
+    def __init__(self, api_key, endpoint=ENDPOINT, cache=None, pages=1, refresh=False):
+        self.api_key = api_key
+        self.endpoint = endpoint
+        self.cache = cache
+        self.pages = pages
+        self.refresh = refresh  # ignore les réponses en cache (elles sont remplacées)
+        self.stats = Counter()
+        self._lock = threading.Lock()
+
+    def _count(self, **values):
+        with self._lock:
+            self.stats.update(values)
+
+    def fetch_page(self, params):
+        """Une page de résultats (dict) ; {"error": ...} si l'API ou le réseau échoue"""
+        if self.cache is not None and not self.refresh:
+            response = self.cache.get(params)
+            if response is not None:
+                self._count(cached=1)
+                return response
+        try:
+            resp = fetch.get(self.endpoint, params={**params, "api_key": self.api_key, "output": "json"})
+        except Exception as e:  # réseau (après les retries de la session)
+            self._count(api_calls=1, errors=1)
+            # le type seul : le message de requests contient l'URL, donc la clé d'API
+            return {"error": f"{type(e).__name__} (erreur réseau)"}
+        self._count(api_calls=1)
+        try:
+            response = resp.json()
+        except ValueError:  # page d'erreur HTML, corps tronqué
+            response = None
+        if resp.status_code != 200 or not isinstance(response, dict) or "error" in response:
+            self._count(errors=1)
+            error = response.get("error") if isinstance(response, dict) else None
+            return {"error": error or f"HTTP {resp.status_code}"}
+        if self.cache is not None:
+            self.cache.put(params, response)
+        return response
+
+    def fetch_query(self, params):
+        """[(numéro de page, réponse)] en suivant la pagination jusqu'à `pages` pages"""
+        results = []
+        page_params = params
+        for page in range(1, self.pages + 1):
+            response = self.fetch_page(page_params)
+            results.append((page, response))
+            if "error" in response:
+                break
+            page_params = next_page_params(page_params, response)
+            if page_params is None:
+                break
+        return results
+
+    def run(self, queries, workers=4):
+        """Produit (paramètres, page, réponse) dans l'ordre des requêtes, exécutées en parallèle
+
+        Une requête présente plusieurs fois dans le lot n'est envoyée qu'une fois.
+        """
+        unique = list({cache_key(params): params for params in queries}.values())
+        self._count(queries=len(unique))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for params, results in zip(unique, executor.map(self.fetch_query, unique)):
+                for page, response in results:
+                    self._count(pages=1)
+                    yield params, page, response
+
+
+def iter_items(response):
+    for key in RESULT_KEYS:
+        for item in response.get(key) or ():
+            if isinstance(item.get("items"), list):  # google_play : sections contenant des applis
+                yield from item["items"]
+            else:
+                yield item
+
+
+def normalize(params, page, response):
+    """Résultats d'une page -> lignes à colonnes fixes (ROW_COLUMNS)"""
+    engine = params.get("engine", "google")
+    query = query_text(params)
+    rows = []
+    for position, item in enumerate(iter_items(response), 1):
+        item_id = next((item[name] for name in ID_FIELDS if item.get(name)), None)
+        price = item.get("extracted_price")
+        if price is None and isinstance(item.get("price"), dict):
+            price = item["price"].get("extracted_value")
+        rows.append({
+            'engine': engine,
+            'query': query,
+            'page': page,
+            'position': item.get("position", position),
+            'id': item_id,
+            'title': item.get("title"),
+            'link': item.get("link_clean") or item.get("link") or item.get("product_link"),
+            'price': price,
+            'rating': item.get("rating"),
+            'reviews': item.get("reviews"),
+        })
+    telemetry.count("items", len(rows))
+    return rows
+
+
+def unique_rows(rows, seen):
+    """Lignes pas encore vues, par (moteur, identifiant, ou lien, ou titre) ; `seen` est mis à jour"""
+    for row in rows:
+        key = (row['engine'], row['id'] or row['link'] or row['title'])
+        if key not in seen:
+            seen.add(key)
+            yield row
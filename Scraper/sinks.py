@@ -0,0 +1,272 @@
+"""Écriture en flux des enregistrements scrapés (CSV, JSON, JSON Lines, Parquet,
+Arrow IPC).
+
+Les enregistrements sont bufferisés par lots de `batch_size` puis écrits :
+la mémoire reste bornée et les données arrivent sur disque au fil du crawl.
+
+    with open_sink("books_by_category.csv") as sink:
+        for page_books in pages:
+            sink.write_many(page_books)
+
+Les enregistrements peuvent être des dicts ou des records.Record.
+
+Brancher flush() sur les checkpoints d'un CrawlState garantit que tout ce qui
+est validé dans l'état de crawl est aussi sur disque :
+
+    state.on_checkpoint(sink.flush)
+"""
+import csv
+import json
+import os
+
+
+class RecordSink:
+    """Base commune : buffer borné + context manager"""
+
+    def __init__(self, path, batch_size=1000):
+        self.path = path
+        self.batch_size = batch_size
+        self.count = 0
+        self._buffer = []
+
+    def write(self, record):
+        if not isinstance(record, dict):  # records.Record (classes à __slots__)
+            record = record.to_dict()
+        self._buffer.append(record)
+        self.count += 1
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        if self._buffer:
+            self._write_batch(self._buffer)
+            self._buffer = []
+        self._sync()
+
+    def close(self):
+        self.flush()
+        self._close()
+
+    def _write_batch(self, records):
+        raise NotImplementedError
+
+    def _sync(self):
+        pass
+
+    def _close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CsvSink(RecordSink):
+    """CSV UTF-8 ; les colonnes sont celles du premier enregistrement si non fournies"""
+
+    def __init__(self, path, fieldnames=None, batch_size=1000, encoding="utf-8"):
+        super().__init__(path, batch_size)
+        self.fieldnames = fieldnames
+        self._file = open(path, "w", newline="", encoding=encoding)
+        self._writer = None
+
+    def _write_batch(self, records):
+        if self._writer is None:
+            self.fieldnames = self.fieldnames or list(records[0].keys())
+            self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames, extrasaction="ignore")
+            self._writer.writeheader()
+        self._writer.writerows(records)
+
+    def _sync(self):
+        self._file.flush()
+
+    def _close(self):
+        if self._writer is None and self.fieldnames:
+            csv.DictWriter(self._file, fieldnames=self.fieldnames).writeheader()
+        self._file.close()
+
+
+class JsonLinesSink(RecordSink):
+    """Un objet JSON par ligne"""
+
+    def __init__(self, path, batch_size=1000):
+        super().__init__(path, batch_size)
+        self._file = open(path, "w", encoding="utf-8")
+
+    def _write_batch(self, records):
+        self._file.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+
+    def _sync(self):
+        self._file.flush()
+
+    def _close(self):
+        self._file.close()
+
+
+class JsonArraySink(RecordSink):
+    """Tableau JSON écrit en flux, identique à json.dump(liste, indent=...)"""
+
+    def __init__(self, path, indent=4, batch_size=1000):
+        super().__init__(path, batch_size)
+        self.indent = indent
+        self._file = open(path, "w", encoding="utf-8")
+        self._first = True
+
+    def _write_batch(self, records):
+        pad = "\n" + " " * (self.indent or 0)
+        for record in records:
+            text = json.dumps(record, ensure_ascii=False, indent=self.indent)
+            if self.indent is not None:
+                text = text.replace("\n", pad)
+                self._file.write(("[" if self._first else ",") + pad + text)
+            else:
+                self._file.write(("[" if self._first else ", ") + text)
+            self._first = False
+
+    def _sync(self):
+        self._file.flush()
+
+    def _close(self):
+        if self._first:
+            self._file.write("[]")
+        else:
+            self._file.write("\n]" if self.indent is not None else "]")
+        self._file.close()
+
+
+class ParquetSink(RecordSink):
+    """Parquet (pyarrow requis) : un row group par lot"""
+
+    def __init__(self, path, schema=None, batch_size=10000, compression="zstd"):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("ParquetSink nécessite pyarrow (pip install pyarrow)")
+        super().__init__(path, batch_size)
+        self._pa = pa
+        self._pq = pq
+        self.schema = schema
+        self.compression = compression
+        self._writer = None
+
+    def _write_batch(self, records):
+        table = self._pa.Table.from_pylist(records, schema=self.schema)
+        if self._writer is None:
+            self.schema = table.schema
+            self._writer = self._pq.ParquetWriter(self.path, self.schema, compression=self.compression)
+        self._writer.write_table(table)
+
+    def _close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+class ArrowSink(RecordSink):
+    """Fichier Arrow IPC (pyarrow requis) : un record batch par lot
+
+    Les colonnes dictionnaire (catégories, tags) partagent un dictionnaire
+    unique pour tout le fichier, complété lot après lot (deltas IPC) : le
+    format fichier refuse qu'un lot remplace le dictionnaire du précédent.
+    """
+
+    def __init__(self, path, schema=None, batch_size=10000, compression="lz4"):
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("ArrowSink nécessite pyarrow (pip install pyarrow)")
+        super().__init__(path, batch_size)
+        self._pa = pa
+        self.schema = schema
+        self.compression = compression
+        self._file = None
+        self._writer = None
+        self._dictionaries = {}  # colonne -> {valeur: indice} cumulé sur tout le fichier
+
+    def _unify(self, name, array):
+        """Réindexe un DictionaryArray sur le dictionnaire cumulé de la colonne"""
+        pa = self._pa
+        seen = self._dictionaries.setdefault(name, {})
+        mapping = [seen.setdefault(value, len(seen)) for value in array.dictionary.to_pylist()]
+        indices = pa.array(mapping, array.type.index_type).take(array.indices)
+        return pa.DictionaryArray.from_arrays(indices, pa.array(list(seen), array.type.value_type))
+
+    def _unify_column(self, name, column):
+        types = self._pa.types
+        if types.is_dictionary(column.type):
+            return self._unify(name, column)
+        if types.is_list(column.type) and types.is_dictionary(column.type.value_type):
+            values = self._unify(name, column.values)
+            return self._pa.ListArray.from_arrays(column.offsets, values, mask=column.is_null())
+        return column
+
+    def _write_batch(self, records):
+        batch = self._pa.RecordBatch.from_pylist(records, schema=self.schema)
+        if self._writer is None:
+            self.schema = batch.schema
+            self._file = self._pa.OSFile(self.path, "wb")
+            options = self._pa.ipc.IpcWriteOptions(compression=self.compression, emit_dictionary_deltas=True)
+            self._writer = self._pa.ipc.new_file(self._file, self.schema, options=options)
+        columns = [self._unify_column(name, column) for name, column in zip(batch.schema.names, batch.columns)]
+        self._writer.write_batch(self._pa.RecordBatch.from_arrays(columns, schema=self.schema))
+
+    def _close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._file.close()
+
+
+class MultiSink:
+    """Envoie chaque enregistrement à plusieurs sinks (ex. CSV + Parquet)"""
+
+    def __init__(self, sinks):
+        self.sinks = sinks
+
+    @property
+    def count(self):
+        return self.sinks[0].count if self.sinks else 0
+
+    def write(self, record):
+        for sink in self.sinks:
+            sink.write(record)
+
+    def write_many(self, records):
+        records = list(records)
+        for sink in self.sinks:
+            sink.write_many(records)
+
+    def flush(self):
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_sink(path, **kwargs):
+    """Choisit le format d'après l'extension (.csv, .json, .jsonl, .parquet, .arrow)"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return CsvSink(path, **kwargs)
+    if ext in (".jsonl", ".ndjson"):
+        return JsonLinesSink(path, **kwargs)
+    if ext == ".json":
+        return JsonArraySink(path, **kwargs)
+    if ext == ".parquet":
+        return ParquetSink(path, **kwargs)
+    if ext in (".arrow", ".feather", ".ipc"):
+        return ArrowSink(path, **kwargs)
+    raise ValueError(f"Format de sortie inconnu : {path}")
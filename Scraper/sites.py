@@ -0,0 +1,91 @@
+"""Schémas d'extraction déclaratifs pour chaque site scrapé (voir parsing.py)."""
+import re
+
+from .frontier import LinkRule
+from .parsing import Field, Schema
+
+RATING_MAP = {'One': 1, 'Two': 2, 'Three': 3, 'Four': 4, 'Five': 5}
+_DIGITS = re.compile(r'\d+')
+
+
+def parse_price(price_text):
+    return float(price_text.replace('£', '').replace('Â', ''))
+
+
+def parse_rating(class_attr):
+    # class="star-rating Three"
+    parts = class_attr.split()
+    return RATING_MAP.get(parts[1], 0) if len(parts) > 1 else 0
+
+
+def parse_stock(stock_text):
+    match = _DIGITS.search(stock_text)
+    return int(match.group()) if match else 0
+
+
+# Lien "next" de la pagination (books, quotes, jobs)
+NEXT_PAGE = Field('li.next > a', attr='href', default=None)
+
+# ----- books.toscrape.com -----
+# Bloc <article class="product_pod"> d'une page liste / catégorie
+BOOK_POD_CSS = 'article.product_pod'
+BOOK_POD = Schema({
+    'title': Field('h3 > a', attr='title', transform=str.strip),
+    'href': Field('h3 > a', attr='href'),
+    'price': Field('p.price_color', transform=parse_price),
+    'rating': Field('p.star-rating', attr='class', transform=parse_rating, default=0),
+    'stock_text': Field('p.instock.availability'),
+})
+
+# Page détail d'un livre
+BOOK_DETAIL = Schema({
+    'breadcrumb': Field('ul.breadcrumb li', many=True),
+    'description': Field('meta[name="description"]', attr='content', transform=str.strip),
+    'stock_text': Field('p.instock.availability'),
+    'img_src': Field('div.item.active img', attr='src'),
+})
+
+# Menu des catégories de la page d'accueil
+CATEGORY_LINKS_CSS = 'ul.nav-list ul li a'
+
+# Crawl complet du site (voir frontier.py) : accueil -> catégories / pages du
+# catalogue -> pages détail. Les pages liste passent avant les pages détail ;
+# un livre présent dans le catalogue et dans sa catégorie n'est visité qu'une fois.
+BOOKS_PRIORITIES = {'home': 0, 'category': 1, 'listing': 1, 'detail': 2}
+_BOOK_DETAIL_LINKS = LinkRule('h3 > a', 'detail', block_css=BOOK_POD_CSS, meta_fields=BOOK_POD, inherit=True)
+BOOKS_RULES = {
+    'home': [LinkRule(CATEGORY_LINKS_CSS, 'category', text_as='category'),
+             _BOOK_DETAIL_LINKS,
+             LinkRule('li.next > a', 'listing')],
+    'listing': [_BOOK_DETAIL_LINKS, LinkRule('li.next > a', 'listing')],
+    'category': [_BOOK_DETAIL_LINKS, LinkRule('li.next > a', 'category', inherit=True)],
+    'detail': [],
+}
+
+# ----- realpython.github.io/fake-jobs -----
+# La carte complète (div.card) contient aussi le pied avec le lien "Apply"
+JOB_CARD_CSS = 'div.card'
+JOB_CARD = Schema({
+    'title': Field('h2.title'),
+    'company': Field('h3.company'),
+    'location': Field('p.location'),
+    'date_posted': Field('time'),
+    'apply_href': Field('a', attr='href', match_text='Apply'),
+    'description': Field('p.description'),
+})
+
+# ----- quotes.toscrape.com -----
+QUOTE_CSS = 'div.quote'
+QUOTE = Schema({
+    'text': Field('span.text'),
+    'author_name': Field('small.author'),
+    'author_href': Field('a', attr='href'),
+    'tags': Field('a.tag', many=True),
+})
+
+AUTHOR = Schema({
+    'bio': Field('div.author-description'),
+    'born_date': Field('span.author-born-date'),
+    'born_location': Field('span.author-born-location'),
+    'death_date': Field('span.author-death-date'),
+})
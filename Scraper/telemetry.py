@@ -0,0 +1,340 @@
+"""Télémétrie des runs : durée par étape (histogrammes), compteurs, export
+JSON / Prometheus et profilage optionnel (cProfile ou pyinstrument) par étape.
+
+Désactivée par défaut (coût négligeable) ; s'active sans modifier les scripts
+par variables d'environnement :
+
+    SCRAPER_TELEMETRY=1 python Books_to_Scrape/scrap.py           # résumé en fin de run
+    SCRAPER_TELEMETRY=metrics.prom python Navigation/scrap.py     # + export (.json ou .prom)
+    SCRAPER_PROFILE=parse,extract python Fake_Job/scrap.py        # profil de ces étapes
+    SCRAPER_PROFILER=pyinstrument                                  # au lieu de cProfile
+
+ou depuis le code : telemetry.enable(output="metrics.json", profile=["parse"]).
+
+Étapes mesurées par la bibliothèque :
+    http.connect   résolution DNS + connexion TCP (nouvelles connexions)
+    http.tls       poignée de main TLS (nouvelles connexions https)
+    http.wait      envoi de la requête -> en-têtes de la réponse
+    http.transfer  téléchargement du corps
+    parse          construction de l'arbre HTML (parsing.parse)
+    extract        application d'un Schema (parsing.Schema)
+Les scripts ajoutent les leurs :
+
+    with telemetry.stage("analyse"):
+        ...
+    telemetry.count("items", len(books))
+
+Les étapes exécutées dans plusieurs threads se chevauchent : leur temps cumulé
+peut dépasser la durée du run. Les processus du pipeline (pipeline.py) ont
+leur propre mesure du parsing et ne remontent pas ici.
+"""
+import atexit
+import bisect
+import functools
+import json
+import os
+import re
+import threading
+import time
+
+try:
+    import pyinstrument
+except ImportError:  # optionnel : seul SCRAPER_PROFILER=pyinstrument en dépend
+    pyinstrument = None
+
+# Bornes des histogrammes (secondes)
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PROFILE_DIR = "profiles"
+
+enabled = False
+_output = None
+_profile_stages = set()
+_profiler_kind = "cprofile"
+_lock = threading.Lock()
+_local = threading.local()
+_histograms = {}
+_counters = {}
+_profilers = {}   # (étape, thread) -> profileur, relancé à chaque passage dans l'étape
+_started = time.perf_counter()
+_atexit_registered = False
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        """Estimation par interpolation linéaire dans le seau du quantile (comme Prometheus)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative, lower = 0, 0.0
+        for bound, n in zip(BUCKETS, self.counts):
+            if n and cumulative + n >= rank:
+                return min(lower + (bound - lower) * (rank - cumulative) / n, self.max)
+            cumulative += n
+            lower = bound
+        return self.max
+
+    def to_dict(self):
+        cumulative, buckets = 0, {}
+        for bound, n in zip(BUCKETS, self.counts):
+            cumulative += n
+            buckets[str(bound)] = cumulative
+        buckets["+Inf"] = self.count
+        return {"count": self.count, "sum": self.sum, "max": self.max, "buckets": buckets}
+
+
+# ----- Activation -----
+def enable(output=None, profile=(), profiler="cprofile", summary=True):
+    """Active la mesure ; output : fichier .json ou .prom écrit en fin de run"""
+    global enabled, _output, _profile_stages, _profiler_kind, _atexit_registered
+    if profiler == "pyinstrument" and pyinstrument is None:
+        print("pyinstrument n'est pas installé : profilage avec cProfile.")
+        profiler = "cprofile"
+    enabled = True
+    _output = output
+    _profile_stages = set(profile)
+    _profiler_kind = profiler
+    if summary and not _atexit_registered:
+        atexit.register(_at_exit)
+        _atexit_registered = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def reset():
+    global _started
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+        _profilers.clear()
+        _started = time.perf_counter()
+
+
+def _configure_from_env():
+    value = os.environ.get("SCRAPER_TELEMETRY", "")
+    profile = [s.strip() for s in os.environ.get("SCRAPER_PROFILE", "").split(",") if s.strip()]
+    if value or profile:
+        output = value if value.endswith((".json", ".prom")) else None
+        enable(output=output, profile=profile, profiler=os.environ.get("SCRAPER_PROFILER", "cprofile"))
+
+
+# ----- Mesures -----
+def observe(name, seconds):
+    if not enabled:
+        return
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram()
+        histogram.observe(seconds)
+
+
+def count(name, n=1):
+    if not enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+class _Stage:
+    __slots__ = ("name", "start", "profiler")
+
+    def __init__(self, name):
+        self.name = name
+        self.profiler = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        if self.name in _profile_stages and not getattr(_local, "profiling", False):
+            self.profiler = _profiler_for(self.name)
+            _local.profiling = True
+            _start_profiler(self.profiler)
+        return self
+
+    def __exit__(self, *exc):
+        if self.profiler is not None:
+            _stop_profiler(self.profiler)
+            _local.profiling = False
+        observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name):
+    """Contexte mesurant la durée d'une étape (rien si la télémétrie est désactivée)"""
+    return _Stage(name) if enabled else _NULL_STAGE
+
+
+def timed(name):
+    """Décorateur : chaque appel de la fonction est mesuré comme l'étape `name`"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ----- Profilage -----
+# un profileur par (étape, thread) ; un seul actif à la fois par thread
+def _profiler_for(name):
+    key = (name, threading.get_ident())
+    with _lock:
+        profiler = _profilers.get(key)
+        if profiler is None:
+            if _profiler_kind == "pyinstrument":
+                profiler = pyinstrument.Profiler()
+            else:
+                import cProfile
+                profiler = cProfile.Profile()
+            _profilers[key] = profiler
+    return profiler
+
+
+def _start_profiler(profiler):
+    if _profiler_kind == "pyinstrument":
+        profiler.start()
+    else:
+        profiler.enable()
+
+
+def _stop_profiler(profiler):
+    if _profiler_kind == "pyinstrument":
+        profiler.stop()
+    else:
+        profiler.disable()
+
+
+def write_profiles(directory=PROFILE_DIR):
+    """Écrit un profil par étape ; renvoie les chemins écrits"""
+    with _lock:
+        by_stage = {}
+        for (name, _), profiler in _profilers.items():
+            by_stage.setdefault(name, []).append(profiler)
+    if not by_stage:
+        return []
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for name, profilers in by_stage.items():
+        base = os.path.join(directory, re.sub(r"[^\w.-]", "_", name))
+        if _profiler_kind == "pyinstrument":
+            # pyinstrument ne fusionne pas les threads : un fichier par thread
+            for i, profiler in enumerate(profilers):
+                if profiler.last_session is None:
+                    continue
+                path = f"{base}.{i}.html" if len(profilers) > 1 else f"{base}.html"
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(profiler.output_html())
+                paths.append(path)
+        else:
+            import pstats
+            path = f"{base}.prof"
+            pstats.Stats(*profilers).dump_stats(path)  # python -m pstats <fichier> / snakeviz
+            paths.append(path)
+    return paths
+
+
+# ----- Export -----
+def _http_counters():
+    from . import fetch  # import tardif : fetch importe ce module
+    s = fetch.get_stats()
+    return {f"http_{name}": s[name] for name in
+            ("requests", "errors", "retries", "connections", "bytes", "cache_hits", "not_modified")}
+
+
+def snapshot():
+    with _lock:
+        stages = {name: h.to_dict() for name, h in _histograms.items()}
+        counters = dict(_counters)
+    counters.update(_http_counters())
+    return {"duration": time.perf_counter() - _started, "stages": stages, "counters": counters}
+
+
+def _metric_name(name):
+    return "scraper_" + re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def to_prometheus(data=None):
+    """Format texte Prometheus (node_exporter textfile, pushgateway...)"""
+    data = data or snapshot()
+    lines = ["# TYPE scraper_stage_seconds histogram"]
+    for name, h in sorted(data["stages"].items()):
+        for bound, n in h["buckets"].items():
+            lines.append(f'scraper_stage_seconds_bucket{{stage="{name}",le="{bound}"}} {n}')
+        lines.append(f'scraper_stage_seconds_sum{{stage="{name}"}} {h["sum"]:.6f}')
+        lines.append(f'scraper_stage_seconds_count{{stage="{name}"}} {h["count"]}')
+    for name, value in sorted(data["counters"].items()):
+        metric = _metric_name(name) + "_total"
+        lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric} {value}")
+    lines.append("# TYPE scraper_run_seconds gauge")
+    lines.append(f"scraper_run_seconds {data['duration']:.3f}")
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(path):
+    data = snapshot()
+    with open(path, "w", encoding="utf-8") as f:
+        if path.endswith(".prom"):
+            f.write(to_prometheus(data))
+        else:
+            json.dump(data, f, indent=2)
+
+
+# ----- Résumé -----
+def print_summary():
+    data = snapshot()
+    duration = data["duration"] or 1e-9
+    print(f"\nTélémétrie ({duration:.1f}s) :")
+    print(f"  {'étape':<16} {'appels':>8} {'cumul (s)':>10} {'moy. (ms)':>10} "
+          f"{'p50 (ms)':>9} {'p95 (ms)':>9} {'max (ms)':>9} {'cumul/run':>10}")
+    with _lock:
+        histograms = sorted(_histograms.items(), key=lambda item: -item[1].sum)
+        rows = [(name, h.count, h.sum, h.quantile(0.5), h.quantile(0.95), h.max) for name, h in histograms]
+    for name, n, total, p50, p95, high in rows:
+        print(f"  {name:<16} {n:>8} {total:>10.2f} {1000 * total / n:>10.2f} "
+              f"{1000 * p50:>9.2f} {1000 * p95:>9.2f} {1000 * high:>9.1f} {total / duration:>9.0%}")
+    counters = ", ".join(f"{name}={value}" for name, value in data["counters"].items() if value)
+    if counters:
+        print(f"  compteurs : {counters}")
+
+
+def _at_exit():
+    if not enabled:
+        return
+    print_summary()
+    if _output:
+        write_metrics(_output)
+        print(f"  métriques écrites dans {_output}")
+    for path in write_profiles():
+        print(f"  profil : {path}")
+
+
+_configure_from_env()
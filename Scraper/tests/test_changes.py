@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from Scraper.changes import Snapshot, content_hash, write_change_log
+
+FIELDS = ('title', 'price', 'stock')
+
+
+@pytest.fixture(autouse=True)
+def in_tmp(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # l'instantané est écrit dans le répertoire courant
+
+
+def listing(**prices):
+    return {f"/{key}": {"title": key, "price": price, "stock": 5} for key, price in prices.items()}
+
+
+def test_diff_and_commit():
+    first = listing(a=10.0, b=20.0, c=30.0)
+    snapshot = Snapshot("catalog", FIELDS)
+    changes = snapshot.diff(first)
+    assert sorted(changes.inserted) == ["/a", "/b", "/c"] and not changes.unchanged
+    snapshot.commit(first, {key: {"description": key.upper()} for key in first})
+
+    second = listing(a=10.0, b=25.0, d=40.0)
+    snapshot = Snapshot("catalog", FIELDS)  # relu depuis le disque
+    changes = snapshot.diff(second)
+    assert (changes.inserted, changes.updated, changes.deleted, changes.unchanged) == (["/d"], ["/b"], ["/c"], ["/a"])
+    assert sorted(changes.to_fetch()) == ["/b", "/d"]
+    assert snapshot.details("/a") == {"description": "/A"}
+
+    details = {"/a": snapshot.details("/a"), "/b": {"description": "/B"}, "/d": {"description": "/D"}}
+    log = snapshot.commit(second, details)
+    ops = {(entry["op"], entry["key"]) for entry in log}
+    assert ops == {("update", "/b"), ("insert", "/d"), ("delete", "/c")}
+    update = next(entry for entry in log if entry["op"] == "update")
+    assert update["changes"] == {"price": [20.0, 25.0]}
+
+    write_change_log("changes.jsonl", log)
+    with open("changes.jsonl", encoding="utf-8") as f:
+        assert len([json.loads(line) for line in f]) == 3
+
+
+def test_failed_details_fetched_again():
+    current = listing(a=10.0)
+    snapshot = Snapshot("catalog", FIELDS)
+    snapshot.commit(current, {})  # page détail illisible
+    assert Snapshot("catalog", FIELDS).diff(current).updated == ["/a"]
+
+
+def test_other_fields_ignore_snapshot():
+    Snapshot("catalog", FIELDS).commit(listing(a=10.0), {"/a": {"description": "x"}})
+    assert len(Snapshot("catalog", ('title', 'price'))) == 0
+
+
+def test_stock_text_change_refetches_detail():
+    fields = ('title', 'price', 'stock_text', 'content_hash')
+    before = {"/a": {"title": "a", "price": 10.0, "stock_text": "In stock", "content_hash": content_hash("a In stock")}}
+    after = {"/a": {"title": "a", "price": 10.0, "stock_text": "Out of stock",
+                    "content_hash": content_hash("a Out of stock")}}
+    snapshot = Snapshot("catalog", fields)
+    snapshot.commit(before, {"/a": {"stock": 3}})
+    assert snapshot.diff(after).to_fetch() == ["/a"]
+    assert content_hash("a In stock") == content_hash("a In stock") != content_hash("a Out of stock")
@@ -0,0 +1,35 @@
+import pytest
+
+from Scraper.checkpoint import CrawlState
+
+
+@pytest.fixture(autouse=True)
+def in_tmp(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # les fichiers d'état sont écrits dans le répertoire courant
+
+
+def test_resume_keeps_committed_records_only():
+    state = CrawlState("crawl", every=2)
+    state.page_done("p1", [1, 2], "p2")
+    state.page_done("p2", [3], "p3")       # checkpoint : 3 enregistrements validés
+    state.page_done("p3", [4], "p4")       # en attente, perdu à l'arrêt
+    with open("crawl.records.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"k": "default", "r": 99}\n')  # ligne écrite après le dernier .json
+
+    resumed = CrawlState("crawl", resume=True, every=2)
+    assert resumed.next_url() == "p3"
+    assert list(resumed.iter_records()) == [1, 2, 3]
+    resumed.page_done("p3", [4], None)
+    resumed.finish()
+    assert list(CrawlState("crawl", resume=True).iter_records()) == [1, 2, 3, 4]
+
+
+def test_resume_without_state_file_drops_stale_records():
+    with open("crawl.records.jsonl", "w", encoding="utf-8") as f:
+        f.write('{"k": "default", "r": "stale"}\n')  # arrêt avant le premier checkpoint
+
+    state = CrawlState("crawl", resume=True, every=1)
+    assert state.next_url(default="p1") == "p1"
+    state.page_done("p1", ["fresh"], None)
+    state.finish()
+    assert list(state.iter_records()) == ["fresh"]
@@ -0,0 +1,57 @@
+import csv
+
+import pytest
+
+from Scraper.graph import QuoteGraph
+
+QUOTES = [
+    ("Albert Einstein", "Imagination is everything.", ["life", "imagination"]),
+    ("Mark Twain", "Never put off till tomorrow.", ["life"]),
+    # même citation reprise : second auteur et nouveau tag, tag déjà vu ignoré
+    ("Mark Twain", "Imagination is everything.", ["imagination", "humor"]),
+    ("Albert Einstein", "Imagination is everything.", ["life"]),
+]
+
+
+def edges(graph):
+    return {(graph.labels[s], graph.labels[t]) for s, t in zip(graph.sources, graph.targets)}
+
+
+def test_repeated_quote_gets_missing_edges_once():
+    graph = QuoteGraph()
+    for author, text, tags in QUOTES:
+        graph.add_quote(author, text, tags)
+    assert edges(graph) == {
+        ("Albert Einstein", "Imagination is everything."),
+        ("Mark Twain", "Imagination is everything."),
+        ("Mark Twain", "Never put off till tomorrow."),
+        ("Imagination is everything.", "life"),
+        ("Imagination is everything.", "imagination"),
+        ("Imagination is everything.", "humor"),
+        ("Never put off till tomorrow.", "life"),
+    }
+    assert graph.edge_count == 7
+    assert len(graph) == 7  # 2 auteurs, 2 citations, 3 tags
+
+
+def test_same_counts_as_networkx():
+    nx = pytest.importorskip("networkx")
+    G = nx.DiGraph()
+    graph = QuoteGraph()
+    for i in range(300):
+        author, text, tags = f"Author {i % 17}", f"Quote {i % 120}", [f"tag-{(i * k) % 23}" for k in range(1, 1 + i % 4)]
+        G.add_edges_from([(author, text)] + [(text, tag) for tag in tags])
+        graph.add_quote(author, text, tags)
+    assert graph.edge_count == G.number_of_edges()
+    assert len(graph) == G.number_of_nodes()
+
+
+def test_edgelist_export(tmp_path):
+    graph = QuoteGraph()
+    for author, text, tags in QUOTES:
+        graph.add_quote(author, text, tags)
+    graph.write(str(tmp_path / "graph.csv"))
+    with open(tmp_path / "graph.csv", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == graph.edge_count
+    assert {row["relation"] for row in rows} == {"wrote", "has_tag"}
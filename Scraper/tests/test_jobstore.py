@@ -0,0 +1,57 @@
+import pytest
+
+from Scraper.jobstore import JobStore
+
+JOBS = [
+    {"title": "Python Developer", "location": "Paris, FR", "contract_type": "Full-time",
+     "description": "Django and APIs"},
+    {"title": "Data Engineer", "location": "Boston, MA", "contract_type": "Part-time",
+     "description": "Spark, python"},
+    {"title": "Web Designer", "location": "Lyon, FR", "contract_type": "CDI",
+     "description": "CSS 100% remote"},
+    {"title": "Senior Python Engineer", "location": "Comparis_Town", "contract_type": "Full-time",
+     "description": "djangorest"},
+]
+
+
+def expected(city=None, contract=None):
+    """Référence : sous-chaîne sans casse, comme str.contains(case=False, regex=False)"""
+    return [job["title"] for job in JOBS
+            if (not city or city.lower() in job["location"].lower())
+            and (not contract or contract.lower() in job["contract_type"].lower())]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite"))
+    with store.replace() as writer:
+        writer.write_many(JOBS)
+    yield store
+    store.close()
+
+
+@pytest.mark.parametrize("city, contract", [
+    ("paris", None), ("FR", None), ("aris", None), ("ari", "full"), (None, "TIME"),
+    ("%", None), ("_", None), ("s_T", None), ("nowhere", None),
+])
+def test_city_contract_substring(store, city, contract):
+    assert [job["title"] for job in store.query(city=city, contract=contract)] == expected(city, contract)
+    assert store.count(city=city, contract=contract) == len(expected(city, contract))
+
+
+@pytest.mark.parametrize("fts", [True, False])
+def test_text_search(store, fts):
+    store.has_fts = store.has_fts and fts  # False : repli sur LIKE
+    assert {job["title"] for job in store.query(text="python")} == {
+        "Python Developer", "Data Engineer", "Senior Python Engineer"}
+    assert {job["title"] for job in store.query(text="djan*")} == {"Python Developer", "Senior Python Engineer"}
+    assert store.count(text="python", city="fr") == 1
+
+
+def test_replace_keeps_previous_crawl_on_error(store):
+    with pytest.raises(RuntimeError):
+        with store.replace() as writer:
+            writer.write({"title": "Partial"})
+            raise RuntimeError("crawl interrompu")
+    assert store.count() == len(JOBS)
+    assert store.info()["count"] == str(len(JOBS))
@@ -0,0 +1,87 @@
+import os
+
+import pytest
+
+from Scraper.quoteindex import QuoteIndex, QuoteIndexWriter, decode_postings, encode_varint
+
+
+def encode_postings(ids):
+    out, previous = bytearray(), 0
+    for quote_id in ids:
+        encode_varint(quote_id - previous, out)
+        previous = quote_id
+    return bytes(out)
+
+
+def test_varint_sizes():
+    for value, size in ((0, 1), (127, 1), (128, 2), (16383, 2), (16384, 3), (2 ** 32, 5)):
+        out = bytearray()
+        encode_varint(value, out)
+        assert len(out) == size
+        assert decode_postings(out) == [value]
+
+
+def test_postings_round_trip():
+    ids = [0, 1, 2, 130, 131, 20000, 20001, 5000000]
+    assert decode_postings(encode_postings(ids)) == ids
+    assert decode_postings(b"") == []
+
+
+def test_index_search_and_top(tmp_path):
+    quotes = [
+        {"text": "Life is love.", "author_name": "Albert Einstein", "tags": ["life", "Love"]},
+        {"text": "Love is life.", "author_name": "Mark Twain", "tags": ["love"]},
+        {"text": "Imagination.", "author_name": "Albert Einstein", "tags": []},
+    ] * 100  # numéros > 127 : écarts sur plusieurs octets
+    with QuoteIndexWriter(str(tmp_path)) as writer:
+        for quote in quotes:
+            writer.add(quote)
+
+    index = QuoteIndex(str(tmp_path))
+    try:
+        assert index.search(words="life") == [i for i in range(300) if i % 3 != 2]
+        assert index.search(words="life", tags=["love"], author="mark twain") == list(range(1, 300, 3))
+        assert index.search(words="absent") == []
+        assert index.get(299) == {"text": "Imagination.", "author": "Albert Einstein", "tags": []}
+        assert index.top("author", 2) == [("Albert Einstein", 200), ("Mark Twain", 100)]
+        assert index.top("tag", 2, words="life") == [("love", 200), ("life", 100)]
+    finally:
+        index.close()
+
+
+def build(directory, texts):
+    with QuoteIndexWriter(directory) as writer:
+        for text in texts:
+            writer.add({"text": text, "author_name": "A", "tags": []})
+
+
+def test_rebuild_swaps_whole_index(tmp_path):
+    directory = str(tmp_path)
+    build(directory, ["old quote"])
+    before = QuoteIndex(directory)
+    build(directory, ["new quote", "new again"])
+    after = QuoteIndex(directory)
+    try:
+        # l'index ouvert avant la reconstruction lit toujours sa génération
+        assert before.count == 1 and before.get(0)["text"] == "old quote"
+        assert after.count == 2 and after.search(words="old") == []
+    finally:
+        before.close()
+        after.close()
+    build(directory, ["third"])
+    assert sorted(name for name in os.listdir(directory) if name.startswith("gen-")) == ["gen-000002", "gen-000003"]
+
+
+def test_interrupted_build_keeps_previous_index(tmp_path):
+    directory = str(tmp_path)
+    build(directory, ["old quote"])
+    with pytest.raises(RuntimeError):
+        with QuoteIndexWriter(directory) as writer:
+            writer.add({"text": "partial", "author_name": "A", "tags": []})
+            raise RuntimeError("crawl interrompu")
+    index = QuoteIndex(directory)
+    try:
+        assert index.count == 1 and index.search(words="old") == [0]
+    finally:
+        index.close()
+    assert sorted(os.listdir(directory)) == ["CURRENT", "gen-000001"]
@@ -0,0 +1,64 @@
+import socket
+import threading
+
+import pytest
+
+from benchmarks import fake_sites
+from Scraper import fetch, serp
+
+API_KEY = "SECRETKEY123"
+
+
+@pytest.fixture(scope="module")
+def endpoint():
+    server = fake_sites.make_server(fake_sites.SyntheticSites(200, 5), "127.0.0.1")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/serp/search.json"
+    server.shutdown()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = serp.SerpCache(str(tmp_path / "serp.sqlite"))
+    yield cache
+    cache.close()
+
+
+def test_pages_cache_and_dedup(endpoint, cache):
+    queries = [serp.parse_query_line("amazon iphone"), serp.parse_query_line("amazon ipad"),
+               serp.parse_query_line("amazon iphone")]
+    client = serp.SerpClient(API_KEY, endpoint=endpoint, cache=cache, pages=2)
+    pages = list(client.run(queries, workers=2))
+    assert [(params["k"], page) for params, page, _ in pages] == [("iphone", 1), ("iphone", 2), ("ipad", 1), ("ipad", 2)]
+    assert client.stats["api_calls"] == 4 and client.stats["errors"] == 0
+
+    seen = set()
+    rows = [row for params, page, response in pages for row in serp.unique_rows(serp.normalize(params, page, response), seen)]
+    assert rows and len({row["id"] for row in rows}) == len(rows)
+    assert set(rows[0]) == set(serp.ROW_COLUMNS)
+
+    again = serp.SerpClient(API_KEY, endpoint=endpoint, cache=cache, pages=2)
+    assert [response for _, _, response in again.run(queries)] == [response for _, _, response in pages]
+    assert again.stats["api_calls"] == 0 and again.stats["cached"] == 4
+
+
+def test_api_error_not_cached(endpoint, cache):
+    client = serp.SerpClient(None, endpoint=endpoint, cache=cache)
+    (_, _, response), = client.run([serp.parse_query_line("amazon iphone")])
+    assert "Invalid API key" in response["error"]
+    assert cache.info()[0] == 0
+
+
+def test_network_error_hides_api_key(cache):
+    with socket.socket() as sock:  # port libre, fermé ensuite : connexion refusée
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    retries = fetch.RETRIES
+    fetch.configure(retries=0)
+    try:
+        client = serp.SerpClient(API_KEY, endpoint=f"http://127.0.0.1:{port}/search.json", cache=cache)
+        response = client.fetch_page(serp.parse_query_line("amazon iphone"))
+    finally:
+        fetch.configure(retries=retries)
+    assert response["error"].startswith("ConnectionError")
+    assert API_KEY not in response["error"] and "api_key" not in response["error"]
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from Scraper.sinks import ArrowSink, open_sink
+
+pa = pytest.importorskip("pyarrow")
+
+
+def quotes(n):
+    # catégories et tags arrivent dans un ordre différent d'un lot à l'autre
+    return [{"author_name": f"author-{(i * 7) % 5}", "tags": [f"tag-{(i + k) % 6}" for k in range(i % 3)],
+             "text": f"quote {i}"} for i in range(n)]
+
+
+def test_arrow_dictionaries_unified_across_batches(tmp_path):
+    from Scraper.schemas import QUOTE_FIELDS, read_arrow, schema_for
+    path = str(tmp_path / "quotes.arrow")
+    records = quotes(50)
+    with ArrowSink(path, schema=schema_for(QUOTE_FIELDS, ["author_name", "tags", "text"]), batch_size=7) as sink:
+        sink.write_many(records)
+
+    reader = pa.ipc.open_file(path)
+    assert reader.num_record_batches == 8
+    table = read_arrow(path)
+    assert table.to_pylist() == records
+    assert pa.types.is_dictionary(table.schema.field("author_name").type)
+    # un seul dictionnaire par colonne : chaque valeur n'y figure qu'une fois
+    authors = table.column("author_name").chunk(table.column("author_name").num_chunks - 1).dictionary
+    assert sorted(authors.to_pylist()) == [f"author-{i}" for i in range(5)]
+
+
+def test_arrow_null_tags(tmp_path):
+    from Scraper.schemas import QUOTE_FIELDS, schema_for
+    path = str(tmp_path / "quotes.arrow")
+    with open_sink(path, schema=schema_for(QUOTE_FIELDS, ["text", "tags"]), batch_size=2) as sink:
+        sink.write({"text": "a", "tags": ["x"]})
+        sink.write({"text": "b", "tags": None})
+        sink.write({"text": "c", "tags": ["y", "x"]})
+    assert isinstance(sink, ArrowSink)
+    table = pa.ipc.open_file(path).read_all()
+    assert table.column("tags").to_pylist() == [["x"], None, ["y", "x"]]
+
+
+def test_book_records_written_as_dicts(tmp_path):
+    from Scraper.records import Book
+    path = str(tmp_path / "books.jsonl")
+    with open_sink(path) as sink:
+        sink.write(Book(title="A", price=10.5))
+    with open(path, encoding="utf-8") as f:
+        row = json.loads(f.read())
+    assert row["title"] == "A" and row["price"] == 10.5 and row["stock"] is None
@@ -0,0 +1,82 @@
+"""Rechargement + groupby : CSV (types inférés) contre Parquet / Arrow IPC typés.
+
+Génère un catalogue synthétique de livres au format de Navigation/scrap.py,
+l'écrit dans chaque format puis mesure la relecture et les agrégations par
+catégorie / note utilisées dans les analyses :
+
+    python benchmarks/bench_formats.py --rows 1000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Scraper import analytics, schemas
+
+
+def synthetic_books(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    categories = np.array([f"Category {i}" for i in range(50)])
+    return pd.DataFrame({
+        'category': categories[rng.integers(0, len(categories), rows)],
+        'title': [f"Book {i}" for i in range(rows)],
+        'price': rng.uniform(10, 60, rows).round(2),
+        'rating': rng.integers(1, 6, rows),
+    })
+
+
+def analyse(df):
+    return analytics.catalog_stats(df)
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare CSV / Parquet / Arrow pour recharger et agréger")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = synthetic_books(args.rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {
+            "csv": os.path.join(tmp, "books.csv"),
+            "parquet": os.path.join(tmp, "books.parquet"),
+            "arrow (lz4)": os.path.join(tmp, "books_lz4.arrow"),
+            "arrow (brut)": os.path.join(tmp, "books_raw.arrow"),
+        }
+        df.to_csv(paths["csv"], index=False)
+        schemas.write_table(df, paths["parquet"], schemas.BOOK_FIELDS)
+        schemas.write_table(df, paths["arrow (lz4)"], schemas.BOOK_FIELDS)
+        schemas.write_table(df, paths["arrow (brut)"], schemas.BOOK_FIELDS, compression="uncompressed")
+
+        readers = {
+            "csv": lambda: pd.read_csv(paths["csv"]),
+            "parquet": lambda: schemas.read_table(paths["parquet"]),
+            "arrow (lz4)": lambda: schemas.read_table(paths["arrow (lz4)"]),
+            "arrow (brut)": lambda: schemas.read_table(paths["arrow (brut)"]),
+        }
+        print(f"{args.rows} livres")
+        print(f"{'format':<14} {'taille (Mo)':>11} {'lecture (s)':>12} {'groupby (s)':>12} {'mémoire (Mo)':>13}")
+        for name, reader in readers.items():
+            read_time, loaded = timed(reader, args.repeat)
+            group_time, _ = timed(lambda: analyse(loaded), args.repeat)
+            size = os.path.getsize(paths[name]) / 2**20
+            memory = loaded.memory_usage(deep=True).sum() / 2**20
+            print(f"{name:<14} {size:11.1f} {read_time:12.3f} {group_time:12.3f} {memory:13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Graphe auteurs/citations/tags : networkx (scra-challange.py historique) contre
+Scraper.graph.QuoteGraph, construction + export, pour des tailles croissantes :
+
+    python benchmarks/bench_graph.py --quotes 10000 --quotes 100000 --quotes 1000000
+    python benchmarks/bench_graph.py --quotes 1000000 --engine fast --format parquet
+
+Chaque mesure tourne dans son propre processus (pic de RSS isolé).
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_sites
+
+TAGS = [f"tag-{i}" for i in range(200)]
+
+
+def synthetic_quotes(n):
+    authors = max(1, n // 10)
+    for i in range(n):
+        yield (
+            f"Author {fake_sites._mix(i, 1) % authors}",
+            f"“{fake_sites._words(i, 12, salt=11)} {i}”",
+            [TAGS[fake_sites._mix(i, 2 + k) % len(TAGS)] for k in range(1 + i % 4)],
+        )
+
+
+def build_networkx(quotes):
+    import networkx as nx
+    G = nx.DiGraph()
+    for author, text, tags in quotes:
+        G.add_node(author, type='author')
+        G.add_node(text, type='quote')
+        G.add_edge(author, text, relation='wrote')
+        for tag in tags:
+            G.add_node(tag, type='tag')
+            G.add_edge(text, tag, relation='has_tag')
+    return G
+
+
+def write_networkx(G, path):
+    import networkx as nx
+    if path.endswith('.graphml'):
+        nx.write_graphml(G, path)
+    elif path.endswith('.gexf'):
+        nx.write_gexf(G, path)
+    else:
+        nx.write_edgelist(G, path, delimiter=',', data=['relation'])
+
+
+def build_fast(quotes):
+    from Scraper.graph import QuoteGraph
+    graph = QuoteGraph()
+    for author, text, tags in quotes:
+        graph.add_quote(author, text, tags)
+    return graph
+
+
+def run(engine, n, fmt, directory, results):
+    quotes = synthetic_quotes(n)
+    start = time.perf_counter()
+    graph = build_networkx(quotes) if engine == 'networkx' else build_fast(quotes)
+    built = time.perf_counter()
+    path = os.path.join(directory, f"{engine}_{n}.{fmt}")
+    if engine == 'networkx':
+        write_networkx(graph, path)
+    else:
+        graph.write(path)
+    done = time.perf_counter()
+    size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)
+               if name.startswith(f"{engine}_{n}."))
+    results.put({
+        'build': built - start,
+        'export': done - built,
+        'mb': size / 1e6,
+        'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Construction + export du graphe de citations")
+    parser.add_argument('--quotes', type=int, action='append', help="nombre de citations (répétable)")
+    parser.add_argument('--engine', action='append', choices=['networkx', 'fast'])
+    parser.add_argument('--format', default='graphml', choices=['graphml', 'gexf', 'csv', 'parquet'])
+    args = parser.parse_args()
+    sizes = args.quotes or [10000, 100000]
+    engines = args.engine or ['networkx', 'fast']
+    if args.format == 'parquet' and 'networkx' in engines:
+        engines.remove('networkx')  # networkx n'exporte pas en Parquet
+
+    print(f"{'moteur':<9} {'citations':>10} {'constr. (s)':>12} {'export (s)':>11} {'fichier (Mo)':>13} {'RSS (Mo)':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for n in sizes:
+            for engine in engines:
+                results = multiprocessing.Queue()
+                worker = multiprocessing.Process(target=run, args=(engine, n, args.format, directory, results))
+                worker.start()
+                r = results.get()
+                worker.join()
+                print(f"{engine:<9} {n:>10} {r['build']:>12.2f} {r['export']:>11.2f} {r['mb']:>13.1f} {r['rss_mb']:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
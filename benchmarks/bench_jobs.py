@@ -0,0 +1,140 @@
+"""Normalisation des offres de Fake_Job : ancien traitement (filtre Python puis
+cinq étapes séparées, regex non compilées, urlparse) contre normalize_job +
+unique_jobs (une passe par offre, motifs compilés, minuscules calculées une
+seule fois) :
+
+    python benchmarks/bench_jobs.py --cards 1000000
+
+Les cartes sont générées à la volée (mêmes dicts que parse_job_card, textes
+tirés d'un jeu de descriptions préparé) ; le coût de génération est mesuré seul
+et retiré. Les deux traitements doivent produire exactement les mêmes offres.
+Le parsing des pages est mesuré par bench_offline.py --scenario jobs.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from urllib.parse import urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_sites
+from bench_offline import load_script
+
+DUPLICATE_EVERY = 10  # une carte sur 10 republie une offre déjà vue
+POOL = 4096           # descriptions distinctes (comme sur fake_sites : contrat + 25 mots)
+
+TITLES = fake_sites.JOB_TITLES
+LOCATIONS = [f"\n        {city}, FR\n      " for city in fake_sites.CITIES]
+DESCRIPTIONS = [f"{fake_sites.CONTRACTS[fake_sites._mix(j, 13) % len(fake_sites.CONTRACTS)]} position. "
+                f"{fake_sites._words(j, 25, salt=17)}." for j in range(POOL)]
+# une description sur deux sans "python" : seul le titre décide alors du filtre
+DESCRIPTIONS[1::2] = [d.replace("python", "java") for d in DESCRIPTIONS[1::2]]
+
+
+def synthetic_cards(n):
+    for i in range(n):
+        j = i - 1 if i % DUPLICATE_EVERY == DUPLICATE_EVERY - 1 else i
+        yield {
+            'title': TITLES[j % 7],
+            'company': f"Company {j}",
+            'location': LOCATIONS[j % 8].strip(),
+            'date_posted': f"2021-{1 + j % 12:02d}-{1 + j % 28:02d}",
+            'apply_url': f"https://realpython.github.io/fake-jobs/jobs/job-{j}.html",
+            'description': DESCRIPTIONS[j % POOL],
+        }
+
+
+# ----- Ancien traitement (Fake_Job/scrap.py avant la fusion) -----
+def old_standardize_date(date_str):
+    if not date_str:
+        return None
+    match = re.search(r'\d{4}-\d{2}-\d{2}', date_str)
+    return match.group(0) if match else None
+
+
+def old_detect_contract_type(description):
+    desc = description.lower()
+    if 'full-time' in desc:
+        return 'Full-Time'
+    elif 'part-time' in desc:
+        return 'Part-Time'
+    elif 'contract' in desc:
+        return 'Contract'
+    else:
+        return 'Unknown'
+
+
+def old_validate_url(url):
+    try:
+        result = urlparse(url)
+        return all([result.scheme, result.netloc])
+    except:
+        return False
+
+
+def old_pipeline(cards):
+    seen = set()
+    for job in cards:
+        if not ("python" in job['title'].lower() or "python" in job['description'].lower()):
+            continue
+        job = dict(job)  # copie gardée par l'état
+        job['date_posted'] = old_standardize_date(job['date_posted'])
+        job['contract_type'] = old_detect_contract_type(job['description'])
+        job['location'] = job.get('location', 'Unknown')
+        job['apply_url'] = job.get('apply_url', '')
+        if not old_validate_url(job['apply_url']):
+            job['apply_url'] = None
+        key = (job['title'], job['company'], job['location'])
+        if key in seen:
+            continue
+        seen.add(key)
+        yield job
+
+
+def new_pipeline(cards, jobs_module):
+    normalize_job = jobs_module.normalize_job
+    return jobs_module.unique_jobs(job for job in map(normalize_job, cards) if job is not None)
+
+
+def generation_time(cards):
+    start = time.perf_counter()
+    for _ in cards:
+        pass
+    return time.perf_counter() - start
+
+
+def run(jobs):
+    """(secondes, offres gardées, empreinte du résultat)"""
+    start = time.perf_counter()
+    kept, digest = 0, 0
+    for job in jobs:
+        kept += 1
+        digest ^= hash((job['date_posted'], job['contract_type'], job['apply_url'], job['company']))
+    return time.perf_counter() - start, kept, digest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Normalisation des offres : ancien traitement contre passe unique")
+    parser.add_argument("--cards", type=int, default=1000000)
+    args = parser.parse_args()
+    jobs_module = load_script("Fake_Job/scrap.py", "jobs_scrap")
+    n = args.cards
+
+    base = generation_time(synthetic_cards(n))
+    old, old_kept, old_digest = run(old_pipeline(synthetic_cards(n)))
+    new, new_kept, new_digest = run(new_pipeline(synthetic_cards(n), jobs_module))
+    if (old_kept, old_digest) != (new_kept, new_digest):
+        raise SystemExit(f"Résultats différents : {old_kept} offres contre {new_kept}")
+
+    print(f"{n} cartes, {new_kept} offres Python uniques ; génération seule {base:.2f}s")
+    print(f"{'traitement':<12} {'total (s)':>10} {'cartes/s':>12} {'ns/carte (hors génération)':>28}")
+    for name, seconds in (("avant", old), ("une passe", new)):
+        print(f"{name:<12} {seconds:>10.2f} {n / seconds:>12,.0f} {(seconds - base) / n * 1e9:>28.0f}")
+    print(f"gain sur la normalisation : {(old - base) / (new - base):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
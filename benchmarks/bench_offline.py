@@ -0,0 +1,231 @@
+"""Benchmark hors-ligne des scrapers contre les sites synthétiques de fake_sites.py.
+
+Le serveur tourne dans un processus séparé (il ne partage pas le GIL avec le
+client) et chaque scénario dans son propre processus, pour que le pic de
+mémoire mesuré soit le sien :
+
+    python benchmarks/bench_offline.py --items 10000
+    python benchmarks/bench_offline.py --items 100000 --latency 20 --jitter 10 --error-rate 0.01 --workers 16
+    python benchmarks/bench_offline.py --scenario jobs --scenario quotes
+    python benchmarks/bench_offline.py --scenario book_details --pipeline --parse-workers 4
+
+Scénarios (fonctions d'extraction des scripts du dépôt) :
+    books_category  Navigation/scrap.py       get_categories + get_books_from_category
+    book_details    Books_to_Scrape/scrap.py  get_all_book_details -> get_book_details
+    jobs            Fake_Job/scrap.py         get_job_cards + parse_job_card
+    quotes          Quotes_to_Scrape/scra.py  get_quote_data
+
+Avec --pipeline, book_details et jobs téléchargent dans des threads et parsent
+dans un pool de processus (Scraper.pipeline) ; les métriques du pipeline
+(attente réseau / parsing, profondeur de file) sont affichées en plus.
+
+Rapport : pages/s, éléments/s, latence des requêtes (p50 / p99, côté client,
+jusqu'à la réception des en-têtes) et pic de RSS du processus.
+"""
+import argparse
+import importlib.util
+import multiprocessing
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_sites
+
+os.environ.setdefault("MPLBACKEND", "Agg")  # les scripts importent matplotlib
+
+
+def load_script(relative_path, name):
+    """Importe un script du dépôt (dossiers sans __init__, noms non importables)"""
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, relative_path))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module  # fonctions picklables pour les processus du pipeline
+    spec.loader.exec_module(module)
+    return module
+
+
+def crawl_pages(urls, parse_page, workers):
+    """Télécharge et extrait des pages en parallèle -> (pages, éléments)"""
+    from Scraper import fetch, parsing
+
+    def one(page_url):
+        resp = fetch.get(page_url)
+        if resp.status_code != 200:
+            return 0, 0
+        return 1, len(parse_page(parsing.parse(resp.text), page_url))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(one, urls))
+    return sum(p for p, _ in results), sum(n for _, n in results)
+
+
+def pipeline_pages(urls, parse_page, workers, options):
+    """Même mesure via Scraper.pipeline : parse_page(url, html) dans des processus"""
+    from Scraper.pipeline import ParsePipeline
+    pipeline = ParsePipeline(parse_page, fetch_workers=workers, parse_workers=options.parse_workers,
+                             queue_size=options.queue_size, batch_size=options.batch_size)
+    items = sum(len(records) for _, records in pipeline.run(urls))
+    pipeline.print_metrics()
+    return pipeline.metrics.snapshot()["pages"], items
+
+
+# ----- Scénarios : (base_url, sites, workers, options) -> run() -> (pages, éléments) -----
+# L'import du script (pandas, matplotlib...) se fait avant le chronomètre.
+def scenario_books_category(base, sites, workers, options):
+    navigation = load_script("Navigation/scrap.py", "navigation_scrap")
+    navigation.BASE_URL = base + "books/"
+
+    def run():
+        categories = navigation.get_categories()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            books = sum(len(b) for b in executor.map(lambda item: navigation.get_books_from_category(*item),
+                                                     categories.items()))
+        pages = 1 + sum(fake_sites._pages(sites.category_size(c), fake_sites.BOOKS_PER_PAGE)
+                        for c in range(sites.categories))
+        return pages, books
+    return run
+
+
+def scenario_book_details(base, sites, workers, options):
+    books_module = load_script("Books_to_Scrape/scrap.py", "books_scrap")
+    count = min(sites.items, options.details) if options.details else sites.items
+    books = [{'title': sites.book_title(i), 'url': f"{base}books/catalogue/book-{i}/index.html"}
+             for i in range(count)]
+
+    def run():
+        pipeline = None
+        if options.pipeline:
+            from Scraper.pipeline import ParsePipeline
+            pipeline = ParsePipeline(books_module.parse_book_page, fetch_workers=workers,
+                                     parse_workers=options.parse_workers, queue_size=options.queue_size, batch_size=options.batch_size)
+        books_module.get_all_book_details(books, max_workers=workers, pipeline=pipeline)
+        if pipeline is not None:
+            pipeline.print_metrics()
+        return count, sum(1 for b in books if b.get('main_category'))
+    return run
+
+
+def scenario_jobs(base, sites, workers, options):
+    jobs_module = load_script("Fake_Job/scrap.py", "fake_job_scrap")
+    urls = [f"{base}jobs/page-{p}.html" for p in range(1, fake_sites._pages(sites.items, fake_sites.JOBS_PER_PAGE) + 1)]
+    if options.pipeline:
+        return lambda: pipeline_pages(urls, jobs_module.parse_jobs_page, workers, options)
+
+    def parse_page(doc, page_url):
+        return [jobs_module.parse_job_card(card) for card in jobs_module.get_job_cards(doc)]
+
+    return lambda: crawl_pages(urls, parse_page, workers)
+
+
+def scenario_quotes(base, sites, workers, options):
+    quotes_module = load_script("Quotes_to_Scrape/scra.py", "quotes_scrap")
+    from Scraper import parsing, sites as site_schemas
+    urls = [f"{base}quotes/page/{p}/" for p in range(1, fake_sites._pages(sites.items, fake_sites.QUOTES_PER_PAGE) + 1)]
+
+    def parse_page(doc, page_url):
+        return [quotes_module.get_quote_data(tag, page_url) for tag in parsing.select(doc, site_schemas.QUOTE_CSS)]
+
+    return lambda: crawl_pages(urls, parse_page, workers)
+
+
+SCENARIOS = {
+    "books_category": scenario_books_category,
+    "book_details": scenario_book_details,
+    "jobs": scenario_jobs,
+    "quotes": scenario_quotes,
+}
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def run_scenario(name, base, args, results):
+    """Exécuté dans un processus dédié ; renvoie les mesures via la queue `results`"""
+    from Scraper import fetch
+    fetch.configure(pool_maxsize=max(args.workers, fetch.POOL_MAXSIZE))
+    if args.scheduler:
+        fetch.enable_scheduler(rate=args.rate, max_concurrency=args.workers)
+    latencies = []
+    fetch.get_session().hooks["response"].append(lambda resp, *a, **kw: latencies.append(resp.elapsed.total_seconds()))
+
+    sites = fake_sites.SyntheticSites(args.items, args.categories)
+    run = SCENARIOS[name](base, sites, args.workers, args)
+    start = time.perf_counter()
+    pages, items = run()
+    elapsed = time.perf_counter() - start
+    stats = fetch.get_stats()
+    results.put({
+        "scenario": name,
+        "seconds": elapsed,
+        "pages": pages,
+        "items": items,
+        "requests": stats["requests"],
+        "errors": stats["errors"],
+        "retries": stats["retries"],
+        "p50": percentile(latencies, 50),
+        "p99": percentile(latencies, 99),
+        "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,  # ko sous Linux
+        "hosts": fetch._scheduler.snapshot() if fetch._scheduler is not None else [],
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hors-ligne des scrapers (sites synthétiques locaux)")
+    fake_sites.add_server_arguments(parser)
+    parser.add_argument("--workers", type=int, default=8, help="threads client par scénario")
+    parser.add_argument("--details", type=int, default=2000, help="pages détail max pour book_details (0 = toutes)")
+    parser.add_argument("--scheduler", action="store_true", help="passe par l'ordonnanceur AIMD (fetch.enable_scheduler)")
+    parser.add_argument("--rate", type=float, default=None, help="débit max par hôte avec --scheduler (req/s)")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="book_details et jobs : parsing dans un pool de processus (Scraper.pipeline)")
+    parser.add_argument("--parse-workers", type=int, default=None, help="processus de parsing (défaut : nb de cœurs)")
+    parser.add_argument("--queue-size", type=int, default=64, help="pages HTML en attente de parsing, au plus")
+    parser.add_argument("--batch-size", type=int, default=16, help="pages max envoyées ensemble à un processus")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                        help="scénario à lancer (répétable, tous par défaut)")
+    args = parser.parse_args()
+
+    ready = multiprocessing.Queue()
+    server = multiprocessing.Process(
+        target=fake_sites.serve,
+        args=(args.items, args.categories, 0, ready),
+        kwargs=fake_sites.server_options(args),
+        daemon=True,
+    )
+    server.start()
+    base = f"http://127.0.0.1:{ready.get(timeout=30)}/"
+
+    print(f"{args.items} éléments par site, latence {args.latency} ms ± {args.jitter}, "
+          f"erreurs {args.error_rate:.1%}, {args.workers} threads")
+    print(f"{'scénario':<16} {'pages':>7} {'éléments':>9} {'pages/s':>9} {'élém./s':>9} "
+          f"{'p50 (ms)':>9} {'p99 (ms)':>9} {'retries':>8} {'erreurs':>8} {'RSS (Mo)':>9}")
+    try:
+        for name in args.scenario or list(SCENARIOS):
+            results = multiprocessing.Queue()
+            worker = multiprocessing.Process(target=run_scenario, args=(name, base, args, results))
+            worker.start()
+            worker.join()
+            if worker.exitcode != 0:
+                print(f"{name:<16} échec (code {worker.exitcode})")
+                continue
+            r = results.get()
+            print(f"{name:<16} {r['pages']:>7} {r['items']:>9} {r['pages'] / r['seconds']:>9.1f} "
+                  f"{r['items'] / r['seconds']:>9.1f} {r['p50'] * 1000:>9.1f} {r['p99'] * 1000:>9.1f} "
+                  f"{r['retries']:>8} {r['errors']:>8} {r['rss_mb']:>9.1f}")
+            for h in r['hosts']:
+                print(f"{'':<16} ordonnanceur : concurrence {h['limit']:.1f} (pic {h['peak']}), "
+                      f"{h['throttled']} ralentissements")
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
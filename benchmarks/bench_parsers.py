@@ -0,0 +1,78 @@
+"""Micro-benchmark des backends HTML (selectolax / lxml / html.parser).
+
+Chaque page sauvegardée est parsée puis extraite avec le schéma du site,
+pour chaque backend disponible :
+
+    python benchmarks/bench_parsers.py --download   # sauvegarde les pages de référence
+    python benchmarks/bench_parsers.py -n 50
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Scraper import fetch, parsing, sites
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pages")
+
+# nom du fichier -> (URL d'origine, schéma, sélecteur des blocs ou None pour la page entière)
+SAMPLES = {
+    "books_listing.html": ("http://books.toscrape.com/", sites.BOOK_POD, sites.BOOK_POD_CSS),
+    "books_detail.html": ("http://books.toscrape.com/catalogue/a-light-in-the-attic_1000/index.html", sites.BOOK_DETAIL, None),
+    "fake_jobs.html": ("https://realpython.github.io/fake-jobs/", sites.JOB_CARD, sites.JOB_CARD_CSS),
+    "quotes.html": ("http://quotes.toscrape.com/", sites.QUOTE, sites.QUOTE_CSS),
+    "author.html": ("http://quotes.toscrape.com/author/Albert-Einstein/", sites.AUTHOR, None),
+}
+
+
+def download():
+    os.makedirs(PAGES_DIR, exist_ok=True)
+    for name, (url, _, _) in SAMPLES.items():
+        resp = fetch.get(url)
+        resp.raise_for_status()
+        with open(os.path.join(PAGES_DIR, name), "w", encoding="utf-8") as f:
+            f.write(resp.text)
+        print(f"{name} <- {url}")
+
+
+def run(html, backend, schema, block_css):
+    doc = parsing.parse(html, backend)
+    if block_css is None:
+        return [schema.extract(doc)]
+    return schema.extract_all(doc, block_css)
+
+
+def bench(repeat):
+    print(f"{'page':<20} {'backend':<12} {'ms/page':>9} {'blocs':>6}  speedup")
+    for name, (_, schema, block_css) in SAMPLES.items():
+        path = os.path.join(PAGES_DIR, name)
+        if not os.path.exists(path):
+            print(f"{name:<20} absent (lancer avec --download)")
+            continue
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        timings = {}
+        for backend in parsing.available_backends():
+            records = run(html, backend, schema, block_css)  # échauffement
+            start = time.perf_counter()
+            for _ in range(repeat):
+                run(html, backend, schema, block_css)
+            timings[backend] = ((time.perf_counter() - start) / repeat, len(records))
+        slowest = timings["html.parser"][0]
+        for backend, (seconds, count) in timings.items():
+            print(f"{name:<20} {backend:<12} {1000 * seconds:9.2f} {count:>6}  x{slowest / seconds:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare les backends de parsing HTML")
+    parser.add_argument("--download", action="store_true", help="Télécharge les pages de référence dans benchmarks/pages")
+    parser.add_argument("-n", "--repeat", type=int, default=20, help="Nombre de répétitions par page")
+    args = parser.parse_args()
+    if args.download:
+        download()
+    bench(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
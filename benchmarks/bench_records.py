@@ -0,0 +1,85 @@
+"""Mémoire par livre : dicts (ancien format de Books_to_Scrape) contre
+records.Book (__slots__), et coût de la conversion en DataFrame :
+
+    python benchmarks/bench_records.py --items 100000
+
+Les chaînes sont recréées pour chaque élément, comme après un parsing HTML.
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_sites
+from Scraper.records import Book, to_frame
+
+
+def fresh(text):
+    """Copie d'une chaîne (nouvel objet, comme une valeur extraite d'une page)"""
+    return (text + " ")[:-1]
+
+
+# ----- Éléments au format des scripts -----
+def book_dicts(sites, n):
+    return [{
+        'title': fresh(sites.book_title(i)),
+        'url': f"https://books.toscrape.com/catalogue/book-{i}/index.html",
+        'price': 10 + (i % 5000) / 100,
+        'rating': 1 + i % 5,
+        'main_category': fresh(sites.category_name(sites.book_category(i))),
+        'sub_category': "",
+        'description': fresh(fake_sites._words(i, 40, salt=3)),
+        'stock': i % 23,
+        'img_url': f"https://books.toscrape.com/media/cache/{i}.jpg",
+    } for i in range(n)]
+
+
+def measure(build):
+    """(objet construit, octets alloués et toujours vivants)"""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, size
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def compare(name, make_dicts, to_records, frame_dicts, frame_records, n):
+    dicts, dict_bytes = measure(make_dicts)
+    # les dicts intermédiaires sont libérés : seuls les records et leurs chaînes restent comptés
+    records, record_bytes = measure(lambda: to_records(make_dicts()))
+    dict_time = timed(lambda: frame_dicts(dicts))
+    record_time = timed(lambda: frame_records(records))
+    print(f"{name:<9} {dict_bytes / n:>12.0f} {record_bytes / n:>12.0f} {dict_bytes / record_bytes:>7.1f}x "
+          f"{dict_time * 1000:>12.0f} {record_time * 1000:>12.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mémoire par livre : dicts contre records à __slots__")
+    parser.add_argument("--items", type=int, default=100000)
+    args = parser.parse_args()
+    n = args.items
+    sites = fake_sites.SyntheticSites(n, 50)
+
+    print(f"{n} éléments ; octets par élément (chaînes comprises) et conversion en DataFrame")
+    print(f"{'type':<9} {'dicts (o)':>12} {'records (o)':>12} {'gain':>8} {'df dicts ms':>12} {'df rec. ms':>12}")
+    compare("livres", lambda: book_dicts(sites, n), lambda ds: [Book.from_dict(d) for d in ds],
+            pd.DataFrame, lambda rs: to_frame(rs, list(rs[0].__slots__)), n)
+
+
+if __name__ == "__main__":
+    main()
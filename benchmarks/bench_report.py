@@ -0,0 +1,122 @@
+"""Rapport PDF de march_livresque : ancien tracé pyplot sur toutes les lignes
+contre Scraper.report (agrégats, rendu Agg en parallèle, cache) :
+
+    python benchmarks/bench_report.py --rows 10000,100000,1000000
+
+Pour chaque taille de catalogue synthétique : ancien rapport, nouveau rapport
+cache vide (tous les graphiques redessinés), puis relancé sur les mêmes
+données (tout repris du cache) et après modification d'un prix (seuls les
+graphiques touchés sont redessinés). Le calcul des statistiques (analytics)
+est commun aux deux versions et mesuré à part.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("MPLBACKEND", "Agg")
+from bench_offline import load_script
+
+
+def synthetic_catalog(n, categories=50, seed=0):
+    import numpy as np
+    import pandas as pd
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'title': [f"Book {i}" for i in range(n)],
+        'price': np.round(rng.uniform(10, 60, n), 2),
+        'rating': rng.integers(1, 6, n),
+        'stock': rng.integers(0, 30, n),
+        'category': pd.Categorical.from_codes(rng.integers(0, categories, n),
+                                              [f"Category {c}" for c in range(categories)]),
+    })
+
+
+def aggregates(df):
+    from Scraper import analytics
+    stats = analytics.catalog_stats(df, median=True)
+    by_rating = analytics.stats_for(stats, 'rating')
+    by_category = analytics.stats_for(stats, 'category')
+    correlation = df['rating'].corr(df['price'])
+    return by_rating['prix_moyen'], by_category['prix_moyen'], by_rating['nb_livres'], correlation
+
+
+# ----- Ancien rapport (march_livresque/scrap.py avant Scraper.report) -----
+def old_report(path, df, avg_price_by_rating, avg_price_by_category, rating_counts, correlation):
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+    with PdfPages(path) as pdf:
+        plt.figure(figsize=(6, 4))
+        plt.hist(df['price'], bins=20)
+        plt.title("Distribution des prix")
+        pdf.savefig()
+        plt.close()
+        for series, color, size in ((avg_price_by_rating, 'lightblue', (6, 4)),
+                                    (avg_price_by_category, 'lightgreen', (8, 4)),
+                                    (rating_counts, 'skyblue', (6, 4))):
+            series.plot(kind='bar', color=color, figsize=size)
+            pdf.savefig()
+            plt.close()
+        plt.figure(figsize=(6, 4))
+        plt.scatter(df['rating'], df['price'], alpha=0.6)
+        plt.title(f"Corrélation note/prix (r={correlation:.2f})")
+        pdf.savefig()
+        plt.close()
+
+
+def new_report(module, report, path, df, cache_dir, workers):
+    start = time.perf_counter()
+    avg_by_rating, avg_by_category, rating_counts, correlation = aggregates(df)
+    stats_time = time.perf_counter() - start
+    charts = module.report_charts(df, avg_by_rating, avg_by_category, rating_counts, correlation)
+    result = report.build_pdf(path, charts, cache_dir=cache_dir, workers=workers)
+    return time.perf_counter() - start - stats_time, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rapport PDF : pyplot sur toutes les lignes contre Scraper.report")
+    parser.add_argument("--rows", default="10000,100000,1000000", help="Tailles de catalogue, séparées par des virgules")
+    parser.add_argument("--workers", type=int, default=None, help="Processus de rendu (défaut : nombre de cœurs)")
+    parser.add_argument("--skip-old", action="store_true", help="Ne mesure pas l'ancien rapport (lent au-delà de 1M)")
+    args = parser.parse_args()
+    module = load_script("march_livresque/scrap.py", "report_scrap")
+    from Scraper import report
+    import matplotlib.pyplot  # import hors chronomètre pour les deux versions
+
+    work = tempfile.mkdtemp(prefix="bench_report_")
+    print(f"{'lignes':>9} {'stats (s)':>10} {'ancien (s)':>11} {'cache vide (s)':>15} "
+          f"{'inchangé (s)':>13} {'1 prix modifié (s)':>19}")
+    try:
+        for n in [int(value) for value in args.rows.split(",")]:
+            df = synthetic_catalog(n)
+            cache_dir = os.path.join(work, f"cache_{n}")
+            pdf = os.path.join(work, f"report_{n}.pdf")
+
+            start = time.perf_counter()
+            stats = aggregates(df)
+            stats_time = time.perf_counter() - start
+            old = float("nan")
+            if not args.skip_old:
+                start = time.perf_counter()
+                old_report(os.path.join(work, f"old_{n}.pdf"), df, *stats)
+                old = time.perf_counter() - start
+
+            cold, result = new_report(module, report, pdf, df, cache_dir, args.workers)
+            assert result["rendered"] == result["pages"]
+            warm, result = new_report(module, report, pdf, df, cache_dir, args.workers)
+            assert result["rendered"] == 0 and not result["written"]
+            df.loc[0, 'price'] = 59.99  # change l'histogramme, les moyennes et la corrélation
+            changed, result = new_report(module, report, pdf, df, cache_dir, args.workers)
+            print(f"{n:>9} {stats_time:>10.2f} {old:>11.2f} {cold:>15.2f} {warm:>13.3f} "
+                  f"{changed:>12.2f} ({result['rendered']}/{result['pages']})")
+    finally:
+        shutil.rmtree(work)
+
+
+if __name__ == "__main__":
+    main()
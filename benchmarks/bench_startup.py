@@ -0,0 +1,70 @@
+"""Temps de démarrage de chaque commande de `python -m Scraper` (import du
+script + lecture des options, mesuré avec --help) et bibliothèques lourdes
+chargées avant la première requête :
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 20 --command jobs
+
+Le démarrage de l'interpréteur seul (python -c pass) est mesuré à part ; le
+budget s'applique aux commandes qui ne font que télécharger avant le crawl.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from Scraper.cli import COMMANDS
+
+HEAVY = ("pandas", "numpy", "matplotlib", "plotly", "networkx", "pyarrow", "bs4")
+BUDGET_MS = 100
+ANALYSIS_COMMANDS = {"report"}  # pandas au crawl : hors budget
+
+LOADED = """
+import sys
+from Scraper.cli import load_command
+load_command(sys.argv[1])
+print(" ".join(name for name in sys.argv[2:] if name in sys.modules) or "-")
+"""
+
+
+def wall_times(cmd, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times), statistics.median(times)
+
+
+def loaded_modules(command):
+    result = subprocess.run([sys.executable, "-c", LOADED, command, *HEAVY],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Temps de démarrage des commandes de python -m Scraper")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--command", action="append", choices=COMMANDS)
+    args = parser.parse_args()
+    # MPLBACKEND : même conditions qu'en mode headless si une commande importe matplotlib
+    os.environ.setdefault("MPLBACKEND", "Agg")
+
+    python = [sys.executable, "-c", "pass"]
+    print(f"{'commande':<22} {'min (ms)':>9} {'médiane':>9}  bibliothèques lourdes chargées")
+    low, median = wall_times(python, args.runs)
+    print(f"{'python -c pass':<22} {low:>9.0f} {median:>9.0f}")
+    low, median = wall_times([sys.executable, "-m", "Scraper", "--help"], args.runs)
+    print(f"{'--help':<22} {low:>9.0f} {median:>9.0f}  -")
+    for command in args.command or COMMANDS:
+        low, median = wall_times([sys.executable, "-m", "Scraper", command, "--help"], args.runs)
+        verdict = "" if command in ANALYSIS_COMMANDS or low <= BUDGET_MS else f"  > {BUDGET_MS} ms"
+        print(f"{command + ' --help':<22} {low:>9.0f} {median:>9.0f}  {loaded_modules(command)}{verdict}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+"""Serveur HTTP local imitant books.toscrape.com, quotes.toscrape.com et
+realpython.github.io/fake-jobs, pour mesurer les scrapers sans réseau.
+
+Les pages sont générées à la volée et de façon déterministe à partir de
+l'indice des éléments (rien n'est stocké) : N livres, N citations, N offres.
+Latence et taux d'erreur sont injectables :
+
+    python benchmarks/fake_sites.py --items 100000 --latency 20 --error-rate 0.01
+
+    http://127.0.0.1:8000/books/index.html   catalogue + menu des catégories
+    http://127.0.0.1:8000/quotes/            citations (10 par page)
+    http://127.0.0.1:8000/jobs/              offres (100 par page)
+    http://127.0.0.1:8000/serp/search.json?engine=amazon&k=iphone&page=1
+                                             API SerpAPI simulée (JSON, 20 résultats par page)
+"""
+import argparse
+import html
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode
+
+BOOKS_PER_PAGE = 20
+QUOTES_PER_PAGE = 10
+JOBS_PER_PAGE = 100
+SERP_PER_PAGE = 20
+SERP_PAGES = 5
+
+RATING_WORDS = ['One', 'Two', 'Three', 'Four', 'Five']
+WORDS = ("python data web crawler page book quote author life world love time "
+         "truth mind dream light night river stone garden story voice").split()
+CITIES = ['Paris', 'Lyon', 'Marseille', 'Toulouse', 'Nantes', 'Lille', 'Bordeaux', 'Nice']
+CONTRACTS = ['CDI', 'CDD', 'Internship', 'Freelance', 'Full-time', 'Part-time']
+JOB_TITLES = ['Python Developer', 'Data Engineer', 'Senior Python Engineer', 'Web Designer',
+              'Backend Developer (Python)', 'Product Manager', 'QA Analyst', 'Machine Learning Engineer']
+
+
+def _mix(i, salt=0):
+    """Entier pseudo-aléatoire stable dérivé de l'indice"""
+    return ((i + 1) * 2654435761 + salt * 40503) & 0xFFFFFFFF
+
+
+def _words(i, count, salt=0):
+    return " ".join(WORDS[_mix(i, salt + k) % len(WORDS)] for k in range(count))
+
+
+def _pages(total, per_page):
+    return max(1, -(-total // per_page))
+
+
+def _pager(page, pages, href):
+    nav = f'<li class="current">Page {page} of {pages}</li>'
+    if page > 1:
+        nav = f'<li class="previous"><a href="{href(page - 1)}">previous</a></li>' + nav
+    if page < pages:
+        nav += f'<li class="next"><a href="{href(page + 1)}">next</a></li>'
+    return f'<ul class="pager">{nav}</ul>'
+
+
+def _document(title, body):
+    return (f'<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>{title}</title>'
+            f'</head><body>{body}</body></html>')
+
+
+class SyntheticSites:
+    """Génère les pages des trois sites pour `items` éléments chacun"""
+
+    def __init__(self, items=10000, categories=50):
+        self.items = items
+        self.categories = min(categories, items) or 1
+
+    # ----- books -----
+    def book_title(self, i):
+        return f"{_words(i, 3).title()} {i}"
+
+    def book_category(self, i):
+        return i % self.categories
+
+    def category_name(self, c):
+        return f"Category {c}"
+
+    def category_size(self, c):
+        return len(range(c, self.items, self.categories))
+
+    def _book_pod(self, i, prefix):
+        title = html.escape(self.book_title(i), quote=True)
+        price = 10 + _mix(i, 1) % 5000 / 100
+        rating = RATING_WORDS[_mix(i, 2) % 5]
+        href = f"{prefix}book-{i}/index.html"
+        return (f'<li><article class="product_pod"><div class="image_container"><a href="{href}">'
+                f'<img src="/books/media/{i}.jpg" alt="{title}" class="thumbnail"></a></div>'
+                f'<p class="star-rating {rating}"><i class="icon-star"></i></p>'
+                f'<h3><a href="{href}" title="{title}">{title[:20]}...</a></h3>'
+                f'<div class="product_price"><p class="price_color">£{price:.2f}</p>'
+                f'<p class="instock availability"><i class="icon-ok"></i> In stock</p></div>'
+                f'</article></li>')
+
+    def _category_menu(self, prefix):
+        links = "".join(f'<li><a href="{prefix}category/books/cat-{c}_{c + 2}/index.html">'
+                        f'\n    {self.category_name(c)}\n</a></li>' for c in range(self.categories))
+        return (f'<div class="side_categories"><ul class="nav nav-list"><li>'
+                f'<a href="{prefix}category/books_1/index.html">Books</a><ul>{links}</ul></li></ul></div>')
+
+    def books_index(self, page=1):
+        pages = _pages(self.items, BOOKS_PER_PAGE)
+        if page > pages:
+            return None
+        start = (page - 1) * BOOKS_PER_PAGE
+        pods = "".join(self._book_pod(i, "" if page > 1 else "catalogue/")
+                       for i in range(start, min(start + BOOKS_PER_PAGE, self.items)))
+        menu = self._category_menu("catalogue/" if page == 1 else "")
+        if page == 1:
+            pager = _pager(page, pages, lambda p: f"catalogue/page-{p}.html")
+        else:
+            pager = _pager(page, pages, lambda p: f"page-{p}.html")
+        return _document("All products", f'{menu}<section><ol class="row">{pods}</ol>{pager}</section>')
+
+    def books_category(self, c, page=1):
+        if c >= self.categories:
+            return None
+        size = self.category_size(c)
+        pages = _pages(size, BOOKS_PER_PAGE)
+        if page > pages:
+            return None
+        ids = range(c + (page - 1) * BOOKS_PER_PAGE * self.categories, self.items, self.categories)
+        pods = "".join(self._book_pod(i, "../../../") for i in ids[:BOOKS_PER_PAGE])
+        pager = _pager(page, pages, lambda p: "index.html" if p == 1 else f"page-{p}.html")
+        return _document(self.category_name(c), f'<section><ol class="row">{pods}</ol>{pager}</section>')
+
+    def book_detail(self, i):
+        if i >= self.items:
+            return None
+        title = html.escape(self.book_title(i))
+        category = self.category_name(self.book_category(i))
+        stock = _mix(i, 3) % 30
+        description = html.escape(_words(i, 60, salt=4), quote=True)
+        body = (f'<ul class="breadcrumb"><li><a href="../../index.html">Home</a></li>'
+                f'<li><a href="../category/books_1/index.html">Books</a></li>'
+                f'<li><a href="../category/books/cat-{self.book_category(i)}/index.html">{category}</a></li>'
+                f'<li class="active">{title}</li></ul>'
+                f'<div id="product_gallery"><div class="item active"><img src="../../media/{i}.jpg" alt="{title}"></div></div>'
+                f'<div class="product_main"><h1>{title}</h1>'
+                f'<p class="instock availability"><i class="icon-ok"></i> In stock ({stock} available)</p></div>'
+                f'<div id="product_description"><h2>Product Description</h2></div><p>{description}</p>')
+        head_meta = f'<meta name="description" content="\n    {description}\n">'
+        return _document(title, head_meta + body)
+
+    # ----- quotes -----
+    def author_count(self):
+        return max(1, self.items // 10)
+
+    def author_name(self, a):
+        return f"{_words(a, 2, salt=5).title()} {a}"
+
+    def quotes_page(self, page=1):
+        pages = _pages(self.items, QUOTES_PER_PAGE)
+        if page > pages:
+            return None
+        start = (page - 1) * QUOTES_PER_PAGE
+        blocks = []
+        for i in range(start, min(start + QUOTES_PER_PAGE, self.items)):
+            a = _mix(i, 6) % self.author_count()
+            tags = sorted({WORDS[_mix(i, 7 + k) % len(WORDS)] for k in range(1 + _mix(i, 8) % 4)})
+            tag_links = "".join(f'<a class="tag" href="/quotes/tag/{t}/page/1/">{t}</a>' for t in tags)
+            blocks.append(
+                f'<div class="quote" itemscope itemtype="http://schema.org/CreativeWork">'
+                f'<span class="text" itemprop="text">“{_words(i, 12, salt=9).capitalize()}.”</span>'
+                f'<span>by <small class="author" itemprop="author">{self.author_name(a)}</small>'
+                f'<a href="/quotes/author/author-{a}">(about)</a></span>'
+                f'<div class="tags">Tags: <meta class="keywords" itemprop="keywords" content="{",".join(tags)}">'
+                f'{tag_links}</div></div>')
+        pager = _pager(page, pages, lambda p: f"/quotes/page/{p}/")
+        return _document("Quotes to Scrape", f'<div class="col-md-8">{"".join(blocks)}<nav>{pager}</nav></div>')
+
+    def author_page(self, a):
+        if a >= self.author_count():
+            return None
+        body = (f'<div class="author-details"><h3 class="author-title">{self.author_name(a)}</h3>'
+                f'<p><strong>Born:</strong> <span class="author-born-date">March {1 + a % 28}, {1800 + a % 200}</span>'
+                f' <span class="author-born-location">in {CITIES[a % len(CITIES)]}, France</span></p>'
+                f'<div class="author-description">\n        {_words(a, 80, salt=10).capitalize()}.\n    </div></div>')
+        return _document(self.author_name(a), body)
+
+    # ----- fake jobs -----
+    def jobs_page(self, page=1):
+        pages = _pages(self.items, JOBS_PER_PAGE)
+        if page > pages:
+            return None
+        start = (page - 1) * JOBS_PER_PAGE
+        cards = []
+        for i in range(start, min(start + JOBS_PER_PAGE, self.items)):
+            title = JOB_TITLES[_mix(i, 11) % len(JOB_TITLES)]
+            city = CITIES[_mix(i, 12) % len(CITIES)]
+            contract = CONTRACTS[_mix(i, 13) % len(CONTRACTS)]
+            day = f"2021-{1 + _mix(i, 14) % 12:02d}-{1 + _mix(i, 15) % 28:02d}"
+            cards.append(
+                f'<div class="column is-half"><div class="card"><div class="card-content">'
+                f'<div class="media"><div class="media-content"><h2 class="title is-5">{title}</h2>'
+                f'<h3 class="subtitle is-6 company">{_words(i, 2, salt=16).title()} Ltd</h3></div></div>'
+                f'<div class="content"><p class="location">\n        {city}, FR\n      </p>'
+                f'<p class="description">{contract} position. {_words(i, 25, salt=17)}.</p>'
+                f'<p class="is-small has-text-grey"><time datetime="{day}">{day}</time></p></div>'
+                f'<footer class="card-footer"><a href="https://www.realpython.com" class="card-footer-item">Learn</a>'
+                f'<a href="jobs/job-{i}.html" class="card-footer-item">Apply</a></footer></div></div></div>')
+        pager = _pager(page, pages, lambda p: f"/jobs/page-{p}.html")
+        return _document("Fake Python", f'<div class="columns is-multiline">{"".join(cards)}</div><nav>{pager}</nav>')
+
+    # ----- API SerpAPI -----
+    def serp_search(self, params):
+        """Réponse JSON façon SerpAPI ; les produits sont tirés parmi `items`, donc se
+        répètent d'une page et d'une requête à l'autre (doublons à éliminer)"""
+        if not params.get("api_key"):
+            return json.dumps({"error": "Invalid API key. Your API key should be here: https://serpapi.com/manage-api-key"})
+        engine = params.get("engine", "google")
+        text = params.get("k") or params.get("q") or params.get("_nkw") or params.get("query") or ""
+        page = int(params.get("page", 1))
+        seed = zlib.crc32(f"{engine}:{text}".encode("utf-8"))
+        results = []
+        for j in range(SERP_PER_PAGE):
+            i = _mix(seed + (page - 1) * SERP_PER_PAGE + j, 21) % self.items
+            results.append({
+                "position": j + 1,
+                "asin": f"B{i:09d}",
+                "title": f"{_words(i, 4, salt=22).title()} {i}",
+                "link": f"https://www.amazon.com/sspa/click?url=%2Fdp%2FB{i:09d}&qid={seed}",
+                "link_clean": f"https://www.amazon.com/dp/B{i:09d}/",
+                "rating": 1 + _mix(i, 23) % 41 / 10,
+                "reviews": _mix(i, 24) % 5000,
+                "price": f"${10 + _mix(i, 25) % 9000 / 100:.2f}",
+                "extracted_price": 10 + _mix(i, 25) % 9000 / 100,
+            })
+        public = {k: v for k, v in params.items() if k != "api_key"}
+        response = {
+            "search_metadata": {"status": "Success"},
+            "search_parameters": public,
+            "search_information": {"total_results": SERP_PAGES * SERP_PER_PAGE, "page": page},
+            "organic_results": results,
+        }
+        if page < SERP_PAGES:
+            next_url = "https://serpapi.com/search.json?" + urlencode({**public, "page": page + 1})
+            response["serpapi_pagination"] = {"current": page, "next": next_url}
+        return json.dumps(response)
+
+    # ----- routage -----
+    ROUTES = [
+        (re.compile(r'/books/(?:index\.html)?$'), lambda s, m: s.books_index()),
+        (re.compile(r'/books/catalogue/page-(\d+)\.html$'), lambda s, m: s.books_index(int(m[1]))),
+        (re.compile(r'/books/catalogue/category/books/cat-(\d+)_\d+/index\.html$'),
+         lambda s, m: s.books_category(int(m[1]))),
+        (re.compile(r'/books/catalogue/category/books/cat-(\d+)_\d+/page-(\d+)\.html$'),
+         lambda s, m: s.books_category(int(m[1]), int(m[2]))),
+        (re.compile(r'/books/catalogue/book-(\d+)/index\.html$'), lambda s, m: s.book_detail(int(m[1]))),
+        (re.compile(r'/quotes/$'), lambda s, m: s.quotes_page()),
+        (re.compile(r'/quotes/page/(\d+)/$'), lambda s, m: s.quotes_page(int(m[1]))),
+        (re.compile(r'/quotes/author/author-(\d+)/?$'), lambda s, m: s.author_page(int(m[1]))),
+        (re.compile(r'/jobs/(?:index\.html)?$'), lambda s, m: s.jobs_page()),
+        (re.compile(r'/jobs/page-(\d+)\.html$'), lambda s, m: s.jobs_page(int(m[1]))),
+    ]
+
+    def render(self, path):
+        path, _, query = path.partition("?")
+        if path == "/serp/search.json":
+            return self.serp_search(dict(parse_qsl(query)))
+        for pattern, view in self.ROUTES:
+            match = pattern.match(path)
+            if match:
+                return view(self, match)
+        return None
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, comme les vrais sites
+    disable_nagle_algorithm = True  # sinon en-têtes et corps partent en deux segments (+40 ms d'ACK retardé)
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            overloaded = server.capacity and server.in_flight > server.capacity
+            failed = server.rng.random() < server.error_rate
+        try:
+            if self.path == "/robots.txt":
+                self._send(200, server.robots.encode("utf-8"), "text/plain")
+                return
+            if overloaded:
+                self._send(429, b"too many requests", retry_after=True)
+                return
+            if server.latency or server.jitter:
+                time.sleep(max(0.0, server.latency + random.uniform(-server.jitter, server.jitter)))
+            if failed:
+                self._send(server.error_status, b"injected error", retry_after=True)
+                return
+            page = server.sites.render(self.path)
+            if page is None:
+                self._send(404, b"not found")
+            else:
+                content_type = "application/json" if self.path.split("?", 1)[0].endswith(".json") else "text/html"
+                self._send(200, page.encode("utf-8"), content_type)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def _send(self, status, body, content_type="text/html", retry_after=False):
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if retry_after and self.server.retry_after is not None:
+            self.send_header("Retry-After", str(self.server.retry_after))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(sites, host="127.0.0.1", port=0, latency=0, jitter=0, error_rate=0.0,
+                error_status=503, retry_after=None, capacity=0, crawl_delay=None, seed=0):
+    """Serveur prêt à servir (port=0 : port libre choisi par le système)
+
+    latency / jitter en millisecondes ; au-delà de `capacity` requêtes
+    simultanées (0 = illimité) le serveur répond 429 ; `retry_after` (s) est
+    envoyé avec les 429 et les erreurs injectées ; `crawl_delay` (s) est
+    annoncé dans /robots.txt.
+    """
+    server = ThreadingHTTPServer((host, port), SiteHandler)
+    server.daemon_threads = True
+    server.sites = sites
+    server.latency = latency / 1000
+    server.jitter = jitter / 1000
+    server.error_rate = error_rate
+    server.error_status = error_status
+    server.retry_after = retry_after
+    server.capacity = capacity
+    server.robots = "User-agent: *\nDisallow:\n" + (f"Crawl-delay: {crawl_delay:g}\n" if crawl_delay else "")
+    server.in_flight = 0
+    server.rng = random.Random(seed)
+    server.lock = threading.Lock()
+    return server
+
+
+def serve(items, categories, port=0, ready=None, **options):
+    """Point d'entrée (aussi utilisé comme cible de multiprocessing.Process)"""
+    server = make_server(SyntheticSites(items, categories), port=port, **options)
+    if ready is not None:
+        ready.put(server.server_address[1])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def add_server_arguments(parser):
+    parser.add_argument("--items", type=int, default=10000, help="livres / citations / offres générés")
+    parser.add_argument("--categories", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0, help="latence injectée (ms)")
+    parser.add_argument("--jitter", type=float, default=0, help="variation uniforme de la latence (ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="proportion de réponses en erreur")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--retry-after", type=int, default=None, help="Retry-After (s, entier) des 429 / erreurs")
+    parser.add_argument("--capacity", type=int, default=0, help="requêtes simultanées avant 429 (0 = illimité)")
+    parser.add_argument("--crawl-delay", type=float, default=None, help="Crawl-delay annoncé dans robots.txt")
+
+
+def server_options(args):
+    return {"latency": args.latency, "jitter": args.jitter, "error_rate": args.error_rate,
+            "error_status": args.error_status, "retry_after": args.retry_after,
+            "capacity": args.capacity, "crawl_delay": args.crawl_delay}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sites books / quotes / fake-jobs / SerpAPI synthétiques en local")
+    add_server_arguments(parser)
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    print(f"http://127.0.0.1:{args.port}/ ({args.items} éléments, Ctrl+C pour arrêter)")
+    serve(args.items, args.categories, args.port, **server_options(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,173 +1,242 @@
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_pdf import PdfPages
-import plotly.express as px  # pour visualisations interactives
-import numpy as np
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Scraper import fetch  # session HTTP partagée (keep-alive, retry)
+from Scraper import parsing, sites  # parsing HTML + schémas d'extraction
+from Scraper import telemetry  # mesures par étape (SCRAPER_TELEMETRY=1)
+from Scraper.checkpoint import CrawlState  # reprise après interruption (--resume)
+from Scraper import schemas  # exports typés Parquet / Arrow
+from Scraper import analytics  # agrégats vectorisés
+from Scraper.changes import Snapshot, content_hash, write_change_log  # mode --delta
+from Scraper import report  # graphiques headless, rendus en parallèle et mis en cache
 
 BASE_URL = "http://books.toscrape.com/"
-
-# Fonction pour extraire les livres sur une page
-def get_books_from_page(url):
-    resp = requests.get(url)
-    if resp.status_code != 200:
-        return []
-    doc = BeautifulSoup(resp.text, 'html.parser')
+STATE_NAME = "books_catalog_crawl_state"
+SNAPSHOT_NAME = "books_catalog_snapshot"
+CHANGE_LOG = "books_changes.jsonl"
+# Champs de la page liste surveillés : un changement déclenche le retéléchargement de la page détail.
+# La page liste n'affiche que « In stock » / « Out of stock » : c'est ce texte brut qui est surveillé.
+WATCHED_FIELDS = ('title', 'price', 'rating', 'stock_text', 'content_hash')
+DETAIL_WORKERS = 8
+PDF_REPORT = "books_report.pdf"
+HTML_REPORT = "books_report.html"
+
+# Extraction des livres d'une page déjà parsée
+def parse_books(doc, page_url):
     books = []
-    for article in doc.find_all('article', class_='product_pod'):
-        title = article.h3.a['title']
-        detail_url = urljoin(BASE_URL, article.h3.a['href'])
-        price = float(article.find('p', class_='price_color').text.replace('£','').replace('Â',''))
-        rating_class = article.p['class'][1]  
-        rating_map = {'One':1,'Two':2,'Three':3,'Four':4,'Five':5}
-        rating = rating_map.get(rating_class, 0)
-        stock_text = article.find('p', class_='instock availability').text.strip()
+    for block in parsing.select(doc, sites.BOOK_POD_CSS):
+        pod = sites.BOOK_POD.extract(block)
+        stock_text = pod['stock_text']
         stock = int(''.join(filter(str.isdigit, stock_text))) if any(c.isdigit() for c in stock_text) else 0
         category = None  # On peut remplir avec page détail si nécessaire
         books.append({
-            'title': title,
-            'price': price,
-            'rating': rating,
+            'title': pod['title'],
+            'price': pod['price'],
+            'rating': pod['rating'],
             'stock': stock,
+            'stock_text': stock_text,
+            'content_hash': content_hash(parsing.text(block)),
             'category': category,
-            'detail_url': detail_url
+            # les liens sont relatifs à la page courante (catalogue/page-N.html)
+            'detail_url': urljoin(page_url, pod['href'])
         })
+    telemetry.count("items", len(books))
     return books
 
-# Pagination automatique 
-all_books = []
-next_page = BASE_URL
-while next_page:
-    books = get_books_from_page(next_page)
-    all_books.extend(books)
-    # Cherche le lien de la page suivante
-    resp = requests.get(next_page)
-    doc = BeautifulSoup(resp.text, 'html.parser')
-    next_tag = doc.find('li', class_='next')
-    next_page = urljoin(BASE_URL, next_tag.a['href']) if next_tag else None
-
-# Créer le DataFrame 
-df = pd.DataFrame(all_books)
-
-# Analyses
-avg_price_by_rating = df.groupby('rating')['price'].mean()
-print("Prix moyen par note :")
-print(avg_price_by_rating)
-
-avg_price_by_category = df.groupby('category')['price'].mean()
-print("\nPrix moyen par catégorie :")
-print(avg_price_by_category)
-# Vérifier si la variable n’est pas vide avant de tracer
-if not avg_price_by_category.empty:
-    avg_price_by_category.plot(kind='bar', color='lightgreen', figsize=(8, 4))
-    plt.title("Prix moyen par catégorie")
-    plt.xlabel("Catégorie")
-    plt.ylabel("Prix moyen (£)")
-    pdf.savefig()
-    plt.close()
-else:
-    print("Aucune donnée de catégorie disponible pour afficher le graphique.")
-
-
-
-price_stats_by_category = df.groupby('category')['price'].agg(['min','max','mean','median'])
-print("\nTendances de prix par catégorie :")
-print(price_stats_by_category)
-
-out_of_stock = df[df['stock'] == 0]
-print(f"\nNombre de livres en rupture de stock : {len(out_of_stock)}")
-
-rating_counts = df['rating'].value_counts().sort_index()
-print("\nDistribution des ratings :")
-print(rating_counts)
-
-plt.figure(figsize=(6,4))
-rating_counts.plot(kind='bar', color='skyblue')
-plt.title("Distribution des ratings")
-plt.xlabel("Rating")
-plt.ylabel("Nombre de livres")
-plt.show()
-
-# Sauvegarde CSV
-# Nom fixe sans timestamp
-"""df.to_csv('books_full_info.csv', index=False, encoding='utf-8')
-avg_price_by_rating.to_csv('avg_price_by_rating.csv')
-avg_price_by_category.to_csv('avg_price_by_category.csv')
-price_stats_by_category.to_csv('price_stats_by_category.csv')
-out_of_stock.to_csv('out_of_stock_books.csv', index=False)
-"""
-
-
-# challange
-# Corrélation entre note et prix
-correlation = df['rating'].corr(df['price'])
-print(f"\nCorrélation entre la note et le prix : {correlation:.2f}")
-
-# Alertes prix
-PRICE_ALERT_THRESHOLD = 50.0 
-alerts = df[df['price'] > PRICE_ALERT_THRESHOLD]
-
-if not alerts.empty:
-    print(f"\n {len(alerts)} livres dépassent {PRICE_ALERT_THRESHOLD} £ !")
-    print(alerts[['title', 'price', 'rating']].head(10))
-else:
-    print(f"\n Aucun livre ne dépasse {PRICE_ALERT_THRESHOLD} £")
-
-
-# Génération d’un rapport PDF avec matplotlib
-
-pdf_filename = "books_report.pdf"
-with PdfPages(pdf_filename) as pdf:
-    # Graphique 1 : distribution des prix
-    plt.figure(figsize=(6, 4))
-    plt.hist(df['price'], bins=20)
-    plt.title("Distribution des prix")
-    plt.xlabel("Prix (£)")
-    plt.ylabel("Nombre de livres")
-    pdf.savefig()
-    plt.close()
-
-    # Graphique 2 : prix moyen par note
-    avg_price_by_rating.plot(kind='bar', color='lightblue', figsize=(6, 4))
-    plt.title("Prix moyen par note")
-    plt.xlabel("Note")
-    plt.ylabel("Prix moyen (£)")
-    pdf.savefig()
-    plt.close()
-
+# Fonction pour extraire les livres sur une page (un seul téléchargement + un seul parsing)
+def get_books_from_page(url):
+    """Renvoie (livres de la page, URL de la page suivante ou None)"""
+    resp = fetch.get(url)
+    if resp.status_code != 200:
+        return [], None
+    doc = parsing.parse(resp.text)
+    books = parse_books(doc, url)
+    next_href = sites.NEXT_PAGE.extract(doc)
+    next_page = urljoin(url, next_href) if next_href else None
+    return books, next_page
+
+# Pagination automatique, page par page
+def iter_book_pages(start_url=BASE_URL, state=None):
+    """Générateur : produit la liste des livres de chaque page au fil du crawl
+
+    Avec un CrawlState, les livres déjà extraits sont produits d'abord puis le
+    crawl reprend à la dernière page enregistrée.
+    """
+    next_page = start_url
+    if state:
+        resumed = state.all_records()
+        if resumed:
+            yield resumed
+        next_page = state.next_url(default=start_url)
+    while next_page:
+        books, next_url = get_books_from_page(next_page)
+        if state:
+            state.page_done(next_page, books, next_url)
+        next_page = next_url
+        yield books
+    if state:
+        state.finish()
+
+def crawl_books(start_url=BASE_URL, state=None):
+    """DataFrame construit au fil des pages (un bloc par page, une seule concaténation)"""
+    frames = [pd.DataFrame(books) for books in iter_book_pages(start_url, state) if books]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+# Catégorie, stock exact et description depuis la page détail ({} si indisponible)
+def get_book_details(book):
+    resp = fetch.get(book['detail_url'])
+    if resp.status_code != 200:
+        print(f"Erreur {resp.status_code} pour {book['detail_url']}")
+        return {}
+    detail = sites.BOOK_DETAIL.extract(parsing.parse(resp.text))
+    breadcrumb = detail['breadcrumb']
+    return {
+        'category': breadcrumb[2] if len(breadcrumb) > 2 else None,
+        'stock': sites.parse_stock(detail['stock_text']),
+        'description': detail['description'],
+    }
+
+def crawl_books_with_details(start_url=BASE_URL, state=None, snapshot=None, workers=DETAIL_WORKERS):
+    """Catalogue complété par les pages détail
+
+    Avec un Snapshot (mode --delta), seules les pages détail des livres nouveaux
+    ou modifiés sur la page liste sont téléchargées ; les changements depuis le
+    run précédent sont ajoutés au journal CHANGE_LOG.
+    """
+    listing = {book['detail_url']: book for books in iter_book_pages(start_url, state) for book in books}
+    if snapshot is None:
+        to_fetch, details = list(listing), {}
+    else:
+        changes = snapshot.diff(listing)
+        to_fetch = changes.to_fetch()
+        details = {key: snapshot.details(key) for key in changes.unchanged}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        details.update(zip(to_fetch, executor.map(lambda key: get_book_details(listing[key]), to_fetch)))
+    if snapshot is not None:
+        log = snapshot.commit(listing, details)
+        write_change_log(CHANGE_LOG, log)
+        print(f"Changements depuis le dernier run : {changes.summary()} "
+              f"({len(to_fetch)} pages détail téléchargées) -> {CHANGE_LOG}")
+        for entry in log[:10]:
+            print(f"  {entry['op']:<6} {entry['key']} {entry.get('changes', '')}")
+    books = [{**book, **details.get(key, {})} for key, book in listing.items()]
+    return pd.DataFrame(books)
+
+# Graphiques du rapport (agrégats seulement : le tracé ne dépend pas de la taille du catalogue)
+def report_charts(df, avg_price_by_rating, avg_price_by_category, rating_counts, correlation):
+    charts = [
+        # Graphique 1 : distribution des prix
+        report.histogram_chart("distribution_prix", df['price'], bins=20, title="Distribution des prix",
+                               xlabel="Prix (£)", ylabel="Nombre de livres"),
+        # Graphique 2 : prix moyen par note
+        report.bar_chart("prix_par_note", avg_price_by_rating, title="Prix moyen par note",
+                         xlabel="Note", ylabel="Prix moyen (£)", color='lightblue'),
+    ]
     # Graphique 3 : prix moyen par catégorie
-   if not avg_price_by_category.empty:
-    avg_price_by_category.plot(kind='bar', color='lightgreen', figsize=(8, 4))
-    plt.title("Prix moyen par catégorie")
-    plt.xlabel("Catégorie")
-    plt.ylabel("Prix moyen (£)")
-    pdf.savefig()
-    plt.close()
-else:
-    print(" Aucune donnée de catégorie disponible pour ce graphique.")
-
-    # Graphique 4 : relation note/prix
-    plt.figure(figsize=(6, 4))
-    plt.scatter(df['rating'], df['price'], alpha=0.6)
-    plt.title(f"Corrélation note/prix (r={correlation:.2f})")
-    plt.xlabel("Note")
-    plt.ylabel("Prix (£)")
-    pdf.savefig()
-    plt.close()
-
-print(f"Rapport PDF généré : {pdf_filename}")
-
-
-# Visualisations interactives (Plotly)
-# Graphique interactif : prix en fonction des notes
-fig = px.scatter(df, x='rating', y='price', color='main_category',
-                 title='Relation entre note et prix par catégorie',
-                 hover_data=['title'])
-fig.show()
-
-# Graphique interactif : prix moyen par catégorie
-fig2 = px.bar(avg_price_by_category, title="Prix moyen par catégorie",
-              labels={'value': 'Prix moyen (£)', 'index': 'Catégorie'})
-fig2.show()
+    if not avg_price_by_category.empty:
+        charts.append(report.bar_chart("prix_par_categorie", avg_price_by_category,
+                                       title="Prix moyen par catégorie", xlabel="Catégorie",
+                                       ylabel="Prix moyen (£)", color='lightgreen', figsize=(8, 4)))
+    else:
+        print(" Aucune donnée de catégorie disponible pour ce graphique.")
+    # Graphique 4 : relation note/prix (échantillon au-delà de report.MAX_POINTS livres)
+    charts.append(report.scatter_chart("note_prix", df['rating'], df['price'], groups=df['category'],
+                                       hover=df['title'], title=f"Corrélation note/prix (r={correlation:.2f})",
+                                       xlabel="Note", ylabel="Prix (£)"))
+    # Graphique 5 : distribution des ratings
+    charts.append(report.bar_chart("distribution_ratings", rating_counts, title="Distribution des ratings",
+                                   xlabel="Rating", ylabel="Nombre de livres", color='skyblue'))
+    return charts
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyse du catalogue books.toscrape.com + rapport PDF")
+    parser.add_argument('--resume', action='store_true', help="Reprendre le crawl au dernier checkpoint")
+    parser.add_argument('--checkpoint-every', type=int, default=5, help="Sauvegarder l'état toutes les N pages")
+    parser.add_argument('--format', choices=['none', 'parquet', 'arrow'], default='none',
+                        help="Sauvegarde typée du catalogue, relue en memory-map pour les analyses")
+    parser.add_argument('--details', action='store_true',
+                        help="Complète chaque livre avec sa page détail (catégorie, stock exact, description)")
+    parser.add_argument('--delta', action='store_true',
+                        help="Comme --details, mais seules les pages détail des livres nouveaux ou modifiés "
+                             "depuis le dernier run sont téléchargées ; journal des changements dans " + CHANGE_LOG)
+    parser.add_argument('--workers', type=int, default=DETAIL_WORKERS, help="Pages détail téléchargées en parallèle")
+    parser.add_argument('--report-workers', type=int, default=None,
+                        help="Processus de rendu des graphiques modifiés (défaut : nombre de cœurs)")
+    args = parser.parse_args(argv)
+
+    # Créer le DataFrame 
+    state = CrawlState(STATE_NAME, resume=args.resume, every=args.checkpoint_every)
+    if args.delta or args.details:
+        snapshot = Snapshot(SNAPSHOT_NAME, WATCHED_FIELDS) if args.delta else None
+        df = crawl_books_with_details(state=state, snapshot=snapshot, workers=args.workers)
+    else:
+        df = crawl_books(state=state)
+    if args.format != 'none':
+        typed_file = f"books_full_info.{args.format}"
+        schemas.write_table(df, typed_file, schemas.BOOK_FIELDS)
+        df = schemas.read_table(typed_file)
+
+    # Analyses : toutes les stats par note et par catégorie en une passe
+    with telemetry.stage("analyse"):
+        stats = analytics.catalog_stats(df, median=True)
+    stats_by_rating = analytics.stats_for(stats, 'rating')
+    stats_by_category = analytics.stats_for(stats, 'category')
+
+    avg_price_by_rating = stats_by_rating['prix_moyen']
+    print("Prix moyen par note :")
+    print(avg_price_by_rating)
+
+    avg_price_by_category = stats_by_category['prix_moyen']
+    print("\nPrix moyen par catégorie :")
+    print(avg_price_by_category)
+
+    price_stats_by_category = stats_by_category[['prix_min', 'prix_max', 'prix_moyen', 'prix_median']]
+    print("\nTendances de prix par catégorie :")
+    print(price_stats_by_category)
+
+    out_of_stock = df[df['stock'] == 0]
+    print(f"\nNombre de livres en rupture de stock : {len(out_of_stock)}")
+
+    rating_counts = stats_by_rating['nb_livres']
+    print("\nDistribution des ratings :")
+    print(rating_counts)
+
+    # challange
+    # Corrélation entre note et prix
+    correlation = df['rating'].corr(df['price'])
+    print(f"\nCorrélation entre la note et le prix : {correlation:.2f}")
+
+    # Alertes prix
+    PRICE_ALERT_THRESHOLD = 50.0 
+    alerts = df[df['price'] > PRICE_ALERT_THRESHOLD]
+
+    if not alerts.empty:
+        print(f"\n {len(alerts)} livres dépassent {PRICE_ALERT_THRESHOLD} £ !")
+        print(alerts[['title', 'price', 'rating']].head(10))
+    else:
+        print(f"\n Aucun livre ne dépasse {PRICE_ALERT_THRESHOLD} £")
+
+
+    # Génération d'un rapport PDF : graphiques tracés à partir des agrégats,
+    # redessinés seulement si leurs données ont changé depuis le dernier run
+    with telemetry.stage("rapport_pdf"):
+        charts = report_charts(df, avg_price_by_rating, avg_price_by_category, rating_counts, correlation)
+        result = report.build_pdf(PDF_REPORT, charts, workers=args.report_workers)
+    print(f"Rapport PDF {'généré' if result['written'] else 'inchangé'} : {PDF_REPORT} "
+          f"({result['rendered']} graphiques redessinés, {result['reused']} repris du cache, "
+          f"{result['seconds']:.2f}s)")
+
+    # Visualisations interactives (Plotly), écrites dans un fichier HTML
+    if report.write_html(HTML_REPORT, charts):
+        print(f"Rapport interactif : {HTML_REPORT}")
+    else:
+        print("plotly non installé : pas de rapport interactif.")
+
+    fetch.print_stats()
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,73 @@
-from serpapi import GoogleSearch
-import pandas as pd
-import json
-
-params = {
-  "engine": "amazon",
-  "k": "iphone",
-  "amazon_domain": "amazon.com",
-  "api_key": "0f611661c340886b7a704bcbe84a3d21d17c31c020e3f8780268780dc9a5b54f"
-}
-
-search = GoogleSearch(params)
-results = search.get_dict()
-
-
-if "apps" in results:
-    df = pd.DataFrame(results["apps"])
-    df.to_csv("google_play_data.csv", index=False, encoding="utf-8")
-    df.to_json("google_play_data.json", orient="records", force_ascii=False, indent=4)
-    print("Données enregistrées en CSV et JSON")
-else:
-    # Si la clé "apps" est absente, on sauvegarde le JSON brut pour inspection
-    with open("google_play_data_raw.json", "w", encoding="utf-8") as f:
-        json.dump(results, f, ensure_ascii=False, indent=4)
-    
-    print("JSON brut enregistré dans 'google_play_data_raw.json'")
-
-
-#Nettoyage de dataFrame
-  # Supprimer les doublons basés sur le nom de l'application
-df = df.drop_duplicates(subset="title")  
-
-
-    
-  
-    
+import argparse
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Scraper import fetch  # session HTTP partagée (keep-alive, retry) + débit par API
+from Scraper import serp  # client SerpAPI : lots, pagination, cache compressé
+from Scraper.sinks import open_sink  # écriture en flux
+
+CACHE_FILE = "serp_cache.sqlite"
+OUTPUT_FILE = "serp_results.csv"
+DEFAULT_RATE = 5.0  # requêtes/s vers l'API
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Résultats SerpAPI (Amazon, Google Play, ...) par lots, en une table")
+    parser.add_argument('--queries', help="Fichier de requêtes : une par ligne ('amazon iphone 15') "
+                                          "ou un objet JSON de paramètres SerpAPI")
+    parser.add_argument('--engine', default="amazon", help="Moteur de la requête unique (sans --queries)")
+    parser.add_argument('--query', default="iphone", help="Texte de la requête unique (sans --queries)")
+    parser.add_argument('--pages', type=int, default=1, help="Pages de résultats par requête")
+    parser.add_argument('--workers', type=int, default=4, help="Requêtes envoyées en parallèle")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help="Requêtes/s maximum vers l'API")
+    parser.add_argument('--api-key', default=os.environ.get("SERPAPI_KEY"),
+                        help="Clé SerpAPI (défaut : variable d'environnement SERPAPI_KEY)")
+    parser.add_argument('--endpoint', default=serp.ENDPOINT, help="URL de l'API (serveur local pour les tests)")
+    parser.add_argument('--cache', default=CACHE_FILE, help="Cache des réponses (SQLite, JSON compressé)")
+    parser.add_argument('--ttl', type=float, default=serp.DEFAULT_TTL / 3600,
+                        help="Durée de validité du cache en heures")
+    parser.add_argument('--refresh', action='store_true', help="Ignore le cache (les réponses sont remplacées)")
+    parser.add_argument('--output', default=OUTPUT_FILE, help="Table des résultats (.csv, .jsonl, .json, .parquet)")
+    args = parser.parse_args(argv)
+
+    if args.queries:
+        queries = serp.read_queries(args.queries)
+    else:
+        queries = [serp.parse_query_line(f"{args.engine} {args.query}")]
+        if args.engine == "amazon":
+            queries[0]["amazon_domain"] = "amazon.com"
+    cache = serp.SerpCache(args.cache, ttl=args.ttl * 3600)
+    client = serp.SerpClient(args.api_key, endpoint=args.endpoint, cache=cache, pages=args.pages,
+                             refresh=args.refresh)
+    if not args.api_key and args.endpoint == serp.ENDPOINT:
+        print("Pas de clé SerpAPI (--api-key ou SERPAPI_KEY) : seules les réponses en cache sont utilisables.")
+    # un seul hôte = une API : le débit et la concurrence sont bornés pour tout le lot
+    fetch.enable_scheduler(rate=args.rate, max_concurrency=args.workers, robots=False)
+
+    seen = set()
+    rows = 0
+    errors = []
+    with open_sink(args.output) as sink:
+        for params, page, response in client.run(queries, workers=args.workers):
+            if "error" in response:
+                errors.append((params, page, response["error"]))
+                continue
+            #Nettoyage : suppression des doublons (même produit / appli) au fil de l'eau
+            for row in serp.unique_rows(serp.normalize(params, page, response), seen):
+                sink.write(row)
+                rows += 1
+
+    stats = client.stats
+    entries, size = cache.info()
+    cache.close()
+    print(f"{stats['queries']} requêtes distinctes, {stats['pages']} pages : {stats['cached']} depuis le cache, "
+          f"{stats['api_calls']} appels à l'API, {stats['errors']} erreurs")
+    print(f"{rows} résultats uniques enregistrés dans {args.output}")
+    print(f"Cache : {entries} réponses, {size / 1024:.1f} Ko compressés ({args.cache})")
+    for params, page, error in errors[:10]:
+        print(f"  erreur {params.get('engine')} '{serp.query_text(params)}' page {page} : {error}")
+    fetch.print_stats()
+
+
+if __name__ == "__main__":
+    main()